@@ -0,0 +1,86 @@
+"""
+Wakeup benchmark for the power-aware runtime.
+
+    python benchmarks/power_wakeups.py [hours_in_background] [frame_seconds]
+
+Timer wakeups: builds the app against a temporary store, plans reminded
+sessions and a focus session whose countdown is on screen, then sends it to
+the background for a few hours under SimulationHarness twice - once left
+running as it did before on_pause existed, once through on_pause/on_resume -
+and counts the Clock events fired per minute while backgrounded.
+
+Frame wakeups: runs the real Kivy Clock loop for `frame_seconds` under the
+active, idle and battery-saver frame caps and counts loop iterations per
+minute. This part needs a working Kivy install (a display or xvfb).
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+START = datetime(2026, 1, 5, 7)
+
+
+def make_app():
+    folder = tempfile.mkdtemp()
+    main.APP_DIR = folder
+    main.PROFILES_DIR = os.path.join(folder, "profiles")
+    main.PROFILE_INDEX_FILE = os.path.join(folder, "profiles.json")
+    main.set_active_profile(main.DEFAULT_PROFILE)
+    return main.StudyPlannerApp()
+
+
+def background_wakeups(hours, pause):
+    app = make_app()
+    app.power.saver = False
+    with main.SimulationHarness(app, START) as sim:
+        app.add_schedules([{
+            "name": f"Session {n}", "subject": "Math", "description": "", "time": f"{8 + n:02d}:30",
+            "duration": 45, "notification": True, "date": START.strftime("%d-%m-%Y"),
+        } for n in range(hours)])
+        app.arm_daily_motivation()
+        # Stand-ins for the open focus dialog, so its countdown ticks as it would on screen
+        app.focus_dialog = SimpleNamespace(parent=True, dismiss=lambda: None)
+        app.focus_label = SimpleNamespace(text="")
+        app.focus_timer = main.FocusTimer(subject="Math", minutes=60 * hours + 60)
+        app.focus_timer.start()
+        app.arm_focus_events()
+        if pause:
+            app.on_pause()
+        fired = sim.run(hours=hours)
+        if pause:
+            app.on_resume()
+        app.focus_timer = app.focus_dialog = None
+    return fired / (hours * 60)
+
+
+def frame_wakeups(fps, seconds):
+    main.set_frame_cap(fps)
+    clock = main.Clock
+    start_frames, deadline = clock.frames, time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        clock.tick()
+    return (clock.frames - start_frames) * 60 / seconds
+
+
+def main_benchmark(hours=4, frame_seconds=5):
+    print(f"Timer wakeups while backgrounded for {hours} h (per minute)")
+    print(f"  kept running (before on_pause)  {background_wakeups(hours, pause=False):8.2f}")
+    print(f"  paused with on_pause            {background_wakeups(hours, pause=True):8.2f}")
+
+    if not hasattr(main.Clock, "_max_fps"):
+        print("Frame wakeups skipped: Kivy's Clock is not available")
+        return
+    print(f"Frame wakeups over {frame_seconds} s of Clock loop (per minute)")
+    for label, fps in (("active", main.ACTIVE_FPS), ("idle", main.IDLE_FPS), ("battery saver idle", main.SAVER_IDLE_FPS)):
+        print(f"  {label:<30}  {frame_wakeups(fps, frame_seconds):8.0f}")
+    main.set_frame_cap(main.ACTIVE_FPS)
+
+
+if __name__ == "__main__":
+    main_benchmark(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,50 @@
+"""
+Simulation benchmark: how long the virtual-time harness takes per simulated day.
+
+    python benchmarks/simulation_days.py [days] [sessions_per_day]
+
+Builds the app against a temporary store, plans `sessions_per_day` reminded
+sessions for every day, then runs the whole span through SimulationHarness
+and reports wall time, events fired and notifications recorded.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+START = datetime(2026, 1, 5, 7)  # a Monday
+
+
+def main_benchmark(days=60, sessions_per_day=3):
+    folder = tempfile.mkdtemp()
+    main.APP_DIR = folder
+    main.PROFILES_DIR = os.path.join(folder, "profiles")
+    main.PROFILE_INDEX_FILE = os.path.join(folder, "profiles.json")
+    main.set_active_profile(main.DEFAULT_PROFILE)
+    app = main.StudyPlannerApp()
+
+    with main.SimulationHarness(app, START) as sim:
+        app.add_schedules([{
+            "name": f"Session {day}-{n}", "subject": ("Math", "Physics", "History")[n % 3], "description": "",
+            "time": f"{9 + 2 * n:02d}:00", "duration": 60, "notification": True,
+            "date": (START + timedelta(days=day)).strftime("%d-%m-%Y"),
+        } for day in range(days) for n in range(sessions_per_day)])
+
+        start = time.perf_counter()
+        fired = sim.run(days=days)
+        elapsed = time.perf_counter() - start
+        sent = len(sim.sent)
+
+    print(f"{days} days, {sessions_per_day} sessions per day")
+    print(f"  wall time          {elapsed * 1000:9.1f} ms")
+    print(f"  per simulated day  {elapsed * 1000 / days:9.2f} ms")
+    print(f"  events fired       {fired:9d}")
+    print(f"  notifications      {sent:9d}")
+
+
+if __name__ == "__main__":
+    main_benchmark(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,83 @@
+"""
+Cold start benchmark: pretty-printed JSON against the binary snapshot.
+
+    python benchmarks/snapshot_cold_start.py [tasks] [schedules]
+
+Writes both formats for a synthetic store into a temporary folder, then
+times what startup reads: the whole JSON file against the sections the
+app decodes before its first frame (plus a full snapshot decode).
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+# What StudyPlannerApp.__init__ reads; schedules stay encoded until a screen asks
+STARTUP_SECTIONS = ("profile", "settings", "motivation", "focus_totals", "tasks")
+SUBJECTS = ["Math", "Physics", "Chemistry", "Biology", "History", "English"]
+
+
+def synthetic_store(tasks, schedules):
+    return {
+        "schema_version": main.SCHEMA_VERSION,
+        "tasks": [{
+            "name": f"Task {i}", "description": "Read chapter and take notes",
+            "due_date": f"{i % 28 + 1:02d}-{i % 12 + 1:02d}-2026", "task_type": ("Daily", "Weekly", "Monthly")[i % 3],
+            "status": ("Pending", "In Progress", "Done")[i % 3], "effort": 1.0, "priority": "Medium",
+            "subject": SUBJECTS[i % len(SUBJECTS)], "created_at": "01-01-2026",
+        } for i in range(tasks)],
+        "schedules": [{
+            "name": f"Session {i}", "subject": SUBJECTS[i % len(SUBJECTS)], "description": "",
+            "time": f"{8 + i % 12:02d}:00", "duration": 60, "notification": True,
+            "date": f"{i % 28 + 1:02d}-{i % 12 + 1:02d}-2026", "created_at": "01-01-2026",
+        } for i in range(schedules)],
+        "profile": {"name": "Ada", "title": "Student", "avatar_path": ""},
+        "settings": {"notifications_enabled": True, "theme": "Light", "primary_color": "Indigo"},
+        "motivation": {"last_studied": "", "current_streak": 0, "last_sent_date": "", "time": "09:00"},
+    }
+
+
+def best_of(runs, fn):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main_benchmark(tasks=5000, schedules=5000, runs=7):
+    data = synthetic_store(tasks, schedules)
+    folder = tempfile.mkdtemp()
+    json_path, snap_path = os.path.join(folder, "data.json"), os.path.join(folder, "data.snap")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    main.write_snapshot(data, snap_path)
+
+    def json_cold():
+        with open(json_path, "r", encoding="utf-8") as f:
+            json.load(f)
+
+    def snapshot_cold():
+        with main.SnapshotReader(snap_path) as reader:
+            for name in STARTUP_SECTIONS:
+                reader.section(name)
+
+    def snapshot_full():
+        with main.SnapshotReader(snap_path) as reader:
+            reader.read_all()
+
+    print(f"{tasks} tasks, {schedules} schedules (best of {runs})")
+    print(f"  json file size            {os.path.getsize(json_path) / 1024:9.1f} KiB")
+    print(f"  snapshot file size        {os.path.getsize(snap_path) / 1024:9.1f} KiB")
+    print(f"  json full load            {best_of(runs, json_cold):9.2f} ms")
+    print(f"  snapshot startup sections {best_of(runs, snapshot_cold):9.2f} ms")
+    print(f"  snapshot full decode      {best_of(runs, snapshot_full):9.2f} ms")
+
+
+if __name__ == "__main__":
+    main_benchmark(*(int(arg) for arg in sys.argv[1:3]))
@@ -37,7 +37,7 @@ version = 0.1
 
 # (list) Application requirements
 # comma separated e.g. requirements = sqlite3,kivy
-requirements = python3,kivy==2.3.0,kivymd,pillow,plyer
+requirements = python3,kivy==2.3.0,kivymd,pillow,plyer,numpy
 
 # (str) Custom source folders for requirements
 # Sets custom source for any requirements with recipes
@@ -9,6 +9,7 @@ from kivymd.app import MDApp
 from kivy.lang import Builder
 from kivy.core.window import Window
 from kivy.clock import Clock
+from kivy.base import ExceptionHandler, ExceptionManager
 from kivy.uix.screenmanager import ScreenManager, Screen
 
 # ✅ UI Components
@@ -27,16 +28,23 @@ from kivymd.uix.card import MDCard
 from kivymd.uix.floatlayout import MDFloatLayout
 from kivymd.uix.list import (
     OneLineAvatarIconListItem, TwoLineAvatarIconListItem,
-    OneLineListItem, TwoLineListItem, ThreeLineListItem
+    OneLineListItem, TwoLineListItem, ThreeLineListItem, MDList
 )
+from kivy.uix.scrollview import ScrollView
 from kivymd.uix.floatlayout import MDFloatLayout
 from kivymd.uix.spinner import MDSpinner
+try:
+    from kivymd.uix.snackbar import MDSnackbar, MDSnackbarActionButton  # KivyMD 1.2+
+    Snackbar = None
+except ImportError:
+    from kivymd.uix.snackbar import Snackbar
+    MDSnackbar = MDSnackbarActionButton = None
 from kivy.uix.modalview import ModalView
 
 # ✅ PROPERTIES
 from kivy.properties import (
     StringProperty, BooleanProperty, ObjectProperty,
-    NumericProperty
+    NumericProperty, ListProperty
 )
 
 # ✅ TOOLS & UTILS
@@ -45,111 +53,3043 @@ from kivy.utils import get_color_from_hex, platform
 from kivy.core.image import Image as CoreImage
 from kivy.uix.image import Image
 from kivy.animation import Animation
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Mesh, Line
 
 # ✅ SYSTEM / EXTERNAL
 import os
+import re
 import json
+import mmap
+import struct
+import bisect
+import time
+import queue
+import functools
+import copy
+import gc
+import tracemalloc
+from collections import Counter
+import heapq
+import hashlib
+import zlib
+from collections import OrderedDict, namedtuple, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import random
 import warnings
 import sqlite3
+import shutil
+import tempfile
 from datetime import datetime, timedelta
 from plyer import notification, filechooser
 from PIL import Image as PILImage
+import numpy as np
 
 # ✅ WARNINGS
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 # ✅ CONSTANTS
-DATA_FILE = os.path.join(os.path.dirname(__file__), "study_buddy.json")
+APP_DIR = os.path.dirname(__file__)
+PROFILE_FILES = {
+    "data": "study_buddy.json",
+    "snapshot": "study_buddy.snap",
+    "export": "study_buddy_export.json",
+    "focus_log": "focus_log.jsonl",
+    "backups": "backups",
+}
+PROFILES_DIR = os.path.join(APP_DIR, "profiles")
+PROFILE_INDEX_FILE = os.path.join(APP_DIR, "profiles.json")
+DEFAULT_PROFILE = "default"  # keeps the original files in the app folder
+DIAGNOSTICS_FILE = os.path.join(APP_DIR, "diagnostics_report.jsonl")
+DIAGNOSTICS_ENV = "STUDY_BUDDY_DIAGNOSTICS"  # set to 1 to record diagnostics without the setting
+USE_BINARY_SNAPSHOT = True  # Set to False to keep using the plain JSON file (the snapshot is still read until then)
+API_HOST = "127.0.0.1"  # The local API never listens beyond loopback
+API_PORT = 8765
 Window.size = (360, 640)  # Mobile screen emulation (remove if not needed)
 
 import threading
 
 _data_cache = {}
 _data_lock = threading.Lock()
+_data_version = 0  # bumped on every save, used to invalidate derived caches
+_save_hooks = []  # callables run after every successful save
+_memory_store = None  # profile id -> data while a SimulationHarness keeps the store in memory
+_active_profile = DEFAULT_PROFILE
+
+
+def profile_path(kind, profile_id=None):
+    """Path of one of the PROFILE_FILES for a profile (the active one by default)."""
+    profile_id = profile_id or _active_profile
+    folder = APP_DIR if profile_id == DEFAULT_PROFILE else os.path.join(PROFILES_DIR, profile_id)
+    return os.path.join(folder, PROFILE_FILES[kind])
+
+
+def active_profile():
+    return _active_profile
+
+
+def set_active_profile(profile_id):
+    """Points the store at another profile's shard and drops the cached data."""
+    global _active_profile, _data_cache, _data_version
+    with _data_lock:
+        _active_profile = profile_id
+        _data_cache = {}
+        _data_version += 1
+    os.makedirs(os.path.dirname(profile_path("data")), exist_ok=True)
+
+
+def data_version():
+    return _data_version
+
+
+# ✅ TIME SOURCE
+class SystemTimeSource:
+    """
+    Wall clock and timer scheduling used by the app. Everything that reads
+    "now" or waits for a moment in time goes through `time_source`, so a
+    VirtualTimeSource can stand in for it.
+    """
+
+    def now(self):
+        return datetime.now()
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def schedule_once(self, callback, timeout=0):
+        return Clock.schedule_once(callback, timeout)
+
+    def schedule_interval(self, callback, interval):
+        return Clock.schedule_interval(callback, interval)
+
+
+class VirtualEvent:
+    """Stand-in for a Kivy ClockEvent on the virtual timeline."""
+
+    def __init__(self, source, callback, due, interval=None):
+        self.source = source
+        self.callback = callback
+        self.due = due
+        self.interval = interval
+        self.is_triggered = True
+
+    def cancel(self):
+        self.is_triggered = False
+
+
+class VirtualTimeSource(SystemTimeSource):
+    """
+    Deterministic clock for simulations. Time only moves in advance(), which
+    fires due events in order with the clock set to each event's due time.
+    """
+
+    def __init__(self, start=None):
+        self._now = (start or time_source.now()).timestamp()
+        self._elapsed = 0.0
+        self._events = []
+        self._seq = 0
+
+    def now(self):
+        return datetime.fromtimestamp(self._now)
+
+    def time(self):
+        return self._now
+
+    def monotonic(self):
+        return self._elapsed
+
+    def _push(self, event):
+        self._seq += 1
+        heapq.heappush(self._events, (event.due, self._seq, event))
+        return event
+
+    def schedule_once(self, callback, timeout=0):
+        return self._push(VirtualEvent(self, callback, self._now + max(0, timeout)))
+
+    def schedule_interval(self, callback, interval):
+        return self._push(VirtualEvent(self, callback, self._now + interval, interval))
+
+    def pending(self):
+        return sum(1 for _, _, event in self._events if event.is_triggered)
+
+    def _jump(self, when):
+        self._elapsed += when - self._now
+        self._now = when
+
+    def advance(self, seconds):
+        """Moves time forward, firing every event that falls due on the way."""
+        end = self._now + seconds
+        fired = 0
+        while self._events and self._events[0][0] <= end:
+            due, _, event = heapq.heappop(self._events)
+            if not event.is_triggered:
+                continue
+            previous = self._now
+            self._jump(max(due, self._now))
+            if event.interval is None:
+                event.is_triggered = False
+            else:
+                event.due = self._now + event.interval
+                self._push(event)
+            if event.callback(self._now - previous) is False and event.interval is not None:
+                event.cancel()
+            fired += 1
+        self._jump(max(end, self._now))
+        return fired
+
+
+time_source = SystemTimeSource()
+
+
+def use_time_source(source):
+    """Swaps the app-wide time source and returns the previous one."""
+    global time_source
+    previous, time_source = time_source, source
+    return previous
+
+
+class RecordingNotifier:
+    """Notifier for simulations: keeps (virtual time, title, message) instead of notifying."""
+
+    def __init__(self):
+        self.enabled = True
+        self.sent = []
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def post(self, title, message, kind="info"):
+        self.sent.append((time_source.now(), title, message))
+
+    def remind(self, name):
+        self.post("Study Reminder", name, kind="reminder")
+
+
+class SimulationHarness:
+    """
+    Headless driver for the app's time-based behaviour. Installs a
+    VirtualTimeSource and a recording notifier, keeps the store in memory,
+    points the profile index, focus log and backups at a scratch folder,
+    arms the app's timers and advances virtual time, so weeks of reminders,
+    rollovers, cleanups and daily motivation run deterministically without
+    touching real data (see benchmarks/simulation_days.py for timings).
+
+        with SimulationHarness(app, datetime(2025, 1, 6, 8)) as sim:
+            app.add_schedule({...})
+            sim.run(days=30)
+            reminders = [m for _, title, m in sim.sent if title == "Study Reminder"]
+    """
+    # App state that belongs to the real store and is swapped out for the run
+    APP_STATE = ("profiles", "backups", "focus_log", "focus_timer", "schedule_index", "due_index",
+                 "subjects", "subject_stats", "reminders", "reviews", "rollover_checked")
+
+    def __init__(self, app, start=None, root=None):
+        self.app = app
+        self.source = VirtualTimeSource(start)
+        self.notifier = RecordingNotifier()
+        self._owns_root = root is None
+        self.root = root
+
+    @property
+    def sent(self):
+        return self.notifier.sent
+
+    def _isolate_store(self):
+        global APP_DIR, PROFILES_DIR, PROFILE_INDEX_FILE, _memory_store
+        app = self.app
+        app.backups.flush()  # a debounced backup of the real store must not land in the scratch one
+        self._previous_paths = (APP_DIR, PROFILES_DIR, PROFILE_INDEX_FILE, active_profile())
+        self._previous_hooks = _save_hooks[:]
+        self._previous_state = {name: getattr(app, name) for name in self.APP_STATE}
+
+        self.root = self.root or tempfile.mkdtemp(prefix="study-sim-")
+        APP_DIR = self.root
+        PROFILES_DIR = os.path.join(self.root, "profiles")
+        PROFILE_INDEX_FILE = os.path.join(self.root, "profiles.json")
+        _memory_store = {}  # saves skip the snapshot encode, the bulk of a simulated day
+        del _save_hooks[:]
+        set_active_profile(DEFAULT_PROFILE)
+
+        for name in self.APP_STATE:
+            setattr(app, name, None)
+        app.profiles = ProfileIndex()
+        app.backups = BackupStore()
+        app.focus_log = FocusLog()
+        app.week_cache.invalidate()
+        app.history.clear()
+
+    def _restore_store(self):
+        global APP_DIR, PROFILES_DIR, PROFILE_INDEX_FILE, _memory_store
+        app = self.app
+        APP_DIR, PROFILES_DIR, PROFILE_INDEX_FILE, profile_id = self._previous_paths
+        _memory_store = None
+        _save_hooks[:] = self._previous_hooks
+        set_active_profile(profile_id)
+        for name, value in self._previous_state.items():
+            setattr(app, name, value)
+        app.week_cache.invalidate()
+        app.history.clear()
+        if self._owns_root:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self.root = None
+
+    def __enter__(self):
+        self._isolate_store()
+        self._previous_source = use_time_source(self.source)
+        self._previous_notifier, self.app.notifier = self.app.notifier, self.notifier
+        self.app.arm_reminders()
+        self.app.arm_day_change()
+        return self
+
+    def __exit__(self, *exc):
+        self.app.cancel_all_notifications()
+        if self.app.day_change_event:
+            self.app.day_change_event.cancel()
+            self.app.day_change_event = None
+        if self.app.watermark_event:
+            self.app.watermark_event.cancel()
+            self.app.watermark_event = None
+        self.app.notifier = self._previous_notifier
+        use_time_source(self._previous_source)
+        self._restore_store()
+        self.app.arm_reminders()
+        self.app.arm_day_change()
+        store_events.publish(DATA_REPLACED)
+        return False
+
+    def run(self, days=0, hours=0, minutes=0, seconds=0):
+        """Advances virtual time; returns how many events fired."""
+        return self.source.advance(((days * 24 + hours) * 60 + minutes) * 60 + seconds)
+
+
+# ✅ BINARY SNAPSHOT
+# Layout: header | section table | sections.
+# Record sections (lists of dicts such as tasks/schedules) are stored as
+# length-prefixed runs of fixed-width records that share the same fields.
+# Strings are interned in one shared string table and "dd-mm-YYYY" dates are
+# stored as integer ordinals. Every other top-level key is a small JSON blob.
+SNAPSHOT_MAGIC = b"SBSN"
+SNAPSHOT_VERSION = 1
+_STRINGS_SECTION = "__strings__"
+_DATE_RE = re.compile(r"^\d{2}-\d{2}-\d{4}$")
+# field tag -> struct code ("s" string id, "d" date ordinal, "j" JSON text id, "n" None)
+_FIELD_CODES = {"s": "I", "d": "I", "j": "I", "i": "q", "f": "d", "b": "?", "n": "B"}
+
+
+def _date_to_ordinal(value):
+    if not _DATE_RE.match(value):
+        return None
+    try:
+        date_obj = datetime.strptime(value, "%d-%m-%Y").date()
+    except ValueError:
+        return None
+    # Only store as a date if it round-trips exactly
+    return date_obj.toordinal() if date_obj.strftime("%d-%m-%Y") == value else None
+
+
+def _encode_field(value, intern):
+    if isinstance(value, bool):
+        return "b", value
+    if isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+        return "i", value
+    if isinstance(value, float):
+        return "f", value
+    if value is None:
+        return "n", 0
+    if isinstance(value, str):
+        ordinal = _date_to_ordinal(value)
+        if ordinal is not None:
+            return "d", ordinal
+        return "s", intern(value)
+    return "j", intern(json.dumps(value, ensure_ascii=False))
+
+
+def _encode_records(records, intern):
+    runs, schema, rows = [], None, []
+    for record in records:
+        fields = [(key, _encode_field(value, intern)) for key, value in record.items()]
+        record_schema = tuple((intern(key), tag) for key, (tag, _) in fields)
+        if record_schema != schema:
+            if rows:
+                runs.append((schema, rows))
+            schema, rows = record_schema, []
+        rows.append([value for _, (_, value) in fields])
+    if rows:
+        runs.append((schema, rows))
+
+    parts = [struct.pack("<I", len(runs))]
+    for schema, rows in runs:
+        row_struct = struct.Struct("<" + "".join(_FIELD_CODES[tag] for _, tag in schema))
+        parts.append(struct.pack("<H", len(schema)))
+        parts.append(b"".join(struct.pack("<I", key) + tag.encode() for key, tag in schema))
+        parts.append(struct.pack("<I", len(rows)))
+        parts.append(b"".join(row_struct.pack(*row) for row in rows))
+    return b"".join(parts)
+
+
+def write_snapshot(data, path=None):
+    """
+    Writes app data as a compact binary snapshot (atomic replace).
+    """
+    path = path or profile_path("snapshot")
+    strings, string_ids = [], {}
+
+    def intern(text):
+        idx = string_ids.get(text)
+        if idx is None:
+            idx = string_ids[text] = len(strings)
+            strings.append(text)
+        return idx
+
+    sections = []
+    for name, value in data.items():
+        if isinstance(value, list) and all(isinstance(v, dict) for v in value):
+            sections.append((name, b"R", _encode_records(value, intern)))
+        else:
+            sections.append((name, b"J", json.dumps(value, ensure_ascii=False).encode("utf-8")))
+
+    # The string table is a JSON array so it decodes in a single C call
+    string_payload = json.dumps(strings, ensure_ascii=False).encode("utf-8")
+    sections.insert(0, (_STRINGS_SECTION, b"S", string_payload))
+
+    names = [name.encode("utf-8") for name, _, _ in sections]
+    offset = 8 + sum(1 + len(n) + 1 + 4 + 4 for n in names)
+    table = []
+    for raw_name, (_, kind, payload) in zip(names, sections):
+        table.append(struct.pack("<B", len(raw_name)) + raw_name + kind + struct.pack("<II", offset, len(payload)))
+        offset += len(payload)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC + struct.pack("<HH", SNAPSHOT_VERSION, len(sections)))
+        f.write(b"".join(table))
+        for _, _, payload in sections:
+            f.write(payload)
+    os.replace(tmp_path, path)
+
+
+class SnapshotReader:
+    """
+    Memory-maps a snapshot and decodes sections only when asked for.
+    """
+
+    def __init__(self, path=None):
+        self._file = open(path or profile_path("snapshot"), "rb")
+        try:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file cannot be mapped
+            self._file.close()
+            raise ValueError("Empty snapshot")
+        self._strings = None
+        self._dates = {}
+        self.sections = {}
+
+        if self._buf[:4] != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError("Not a study buddy snapshot")
+        version, count = struct.unpack_from("<HH", self._buf, 4)
+        if version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version}")
+
+        pos = 8
+        for _ in range(count):
+            name_len = self._buf[pos]
+            name = self._buf[pos + 1:pos + 1 + name_len].decode("utf-8")
+            pos += 1 + name_len
+            kind = self._buf[pos:pos + 1]
+            offset, length = struct.unpack_from("<II", self._buf, pos + 1)
+            pos += 9
+            self.sections[name] = (kind, offset, length)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._buf.close()
+        self._file.close()
+
+    def names(self):
+        return [n for n in self.sections if n != _STRINGS_SECTION]
+
+    def _load_strings(self):
+        _, offset, length = self.sections[_STRINGS_SECTION]
+        self._strings = json.loads(self._buf[offset:offset + length].decode("utf-8"))
+
+    def _column(self, tag, column):
+        strings = self._strings
+        if tag == "s":
+            return list(map(strings.__getitem__, column))
+        if tag == "d":
+            dates = self._dates
+            for ordinal in set(column).difference(dates):
+                dates[ordinal] = datetime.fromordinal(ordinal).strftime("%d-%m-%Y")
+            return list(map(dates.__getitem__, column))
+        if tag == "j":
+            return list(map(json.loads, map(strings.__getitem__, column)))
+        if tag == "n":
+            return [None] * len(column)
+        return column
+
+    def section(self, name, default=None):
+        if name not in self.sections or name == _STRINGS_SECTION:
+            return default
+        kind, offset, length = self.sections[name]
+        if kind == b"J":
+            return json.loads(self._buf[offset:offset + length].decode("utf-8"))
+
+        if self._strings is None:
+            self._load_strings()
+        strings, buf = self._strings, self._buf
+
+        (run_count,) = struct.unpack_from("<I", buf, offset)
+        pos = offset + 4
+        records = []
+        for _ in range(run_count):
+            (field_count,) = struct.unpack_from("<H", buf, pos)
+            pos += 2
+            keys, tags = [], []
+            for _ in range(field_count):
+                (key,) = struct.unpack_from("<I", buf, pos)
+                keys.append(strings[key])
+                tags.append(buf[pos + 4:pos + 5].decode())
+                pos += 5
+            (row_count,) = struct.unpack_from("<I", buf, pos)
+            pos += 4
+            row_struct = struct.Struct("<" + "".join(_FIELD_CODES[tag] for tag in tags))
+            end = pos + row_struct.size * row_count
+            rows = list(row_struct.iter_unpack(buf[pos:end])) if row_count else []
+            pos = end
+            if not field_count:
+                records.extend({} for _ in rows)
+                continue
+
+            # Decode column by column so the per-value work stays in C loops
+            columns = [self._column(tag, list(col)) for tag, col in zip(tags, zip(*rows))]
+            records.extend(dict(zip(keys, row)) for row in zip(*columns))
+        return records
+
+    def read_all(self):
+        return {name: self.section(name) for name in self.names()}
+
+
+def load_section(name, default=None, profile_id=None):
+    """
+    Loads a single top-level section, decoding only that part of the snapshot.
+    An explicit `profile_id` reads that shard directly: no cache, and no
+    recovery or rewrite when it is missing or damaged.
+    """
+    if _data_cache and profile_id is None:
+        return _data_cache.get(name, default)
+    if _memory_store is not None and (profile_id or _active_profile) in _memory_store:
+        return _memory_store[profile_id or _active_profile].get(name, default)
+    snapshot_file = profile_path("snapshot", profile_id)
+    if USE_BINARY_SNAPSHOT and os.path.exists(snapshot_file):
+        try:
+            with SnapshotReader(snapshot_file) as reader:
+                version = reader.section("schema_version", 1)
+                return upgrade_section(name, reader.section(name, default), version)
+        except Exception as e:
+            print(f"Error reading snapshot: {e}")
+    if profile_id is None:
+        return load_data().get(name, default)
+    files = _store_files(profile_id)
+    for path, read in files[1:] if USE_BINARY_SNAPSHOT else files:
+        if not os.path.exists(path):
+            continue
+        try:
+            data = read(path)
+            return upgrade_section(name, data.get(name, default), data.get("schema_version", 1))
+        except (OSError, AttributeError) + _DECODE_ERRORS as e:
+            print(f"Error reading {path}: {e}")
+    return default
+
+
+def export_json(path=None):
+    """
+    Writes a portable, human readable JSON copy of the current data.
+    """
+    path = path or profile_path("export")
+    data = load_data(use_cache=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    return path
+
+
+# ✅ SCHEMA
+SCHEMA_VERSION = 3
+SECTION_TYPES = {"tasks": list, "schedules": list, "profile": dict, "settings": dict, "motivation": dict,
+                 "subjects": list}
+_MIGRATIONS = {}  # section -> {version: upgrade(record)}
+_STORE_MIGRATIONS = {}  # version -> upgrade(data), for steps that span sections
+_recovery_note = None  # set when a corrupt file was moved aside, shown once by the app
+# What a truncated or foreign file raises while decoding; OS errors are not among them
+_DECODE_ERRORS = (ValueError, struct.error, IndexError, KeyError, TypeError, OverflowError)
+
+
+class InvalidDataError(ValueError):
+    """Raised by save_data() when the data fails validate_data(); nothing was written."""
+
+
+def migration(section, version):
+    """Registers an in-place upgrade of one record (or a dict section) to `version`."""
+    def register(upgrade):
+        _MIGRATIONS.setdefault(section, {})[version] = upgrade
+        return upgrade
+    return register
+
+
+def store_migration(version):
+    """Registers an in-place upgrade of the whole store to `version`."""
+    def register(upgrade):
+        _STORE_MIGRATIONS[version] = upgrade
+        return upgrade
+    return register
+
+
+@migration("schedules", 2)
+def _schedule_v2(record):
+    record.setdefault("created_at", record.get("date", ""))
+    record.setdefault("duration", DEFAULT_SESSION_MINUTES)
+    record.setdefault("description", "")
+    record.setdefault("notification", True)
+
+
+@migration("tasks", 2)
+def _task_v2(record):
+    record.setdefault("status", "Pending")
+    record.setdefault("effort", 1.0)
+    record.setdefault("priority", "Medium")
+
+
+@store_migration(3)
+def _subjects_v3(data):
+    """Seeds the subject catalog and stores each record's subject id."""
+    catalog = SubjectCatalog(data.get("subjects") or [])
+    for record in (data.get("schedules") or []) + (data.get("tasks") or []):
+        if isinstance(record, dict):
+            catalog.assign(record)
+    data["subjects"] = catalog.to_list()
+
+
+@migration("motivation", 2)
+def _motivation_v2(section):
+    for key, value in (("last_studied", ""), ("current_streak", 0), ("last_sent_date", ""), ("time", "09:00")):
+        section.setdefault(key, value)
+
+
+@migration("settings", 2)
+def _settings_v2(section):
+    for key, value in (("notifications_enabled", True), ("theme", "Light"), ("primary_color", "Indigo")):
+        section.setdefault(key, value)
+
+
+def upgrade_section(name, value, version):
+    """
+    Upgrades one section read from a file written at `version`. Runs per
+    section as it is read, so untouched sections cost nothing; the upgraded
+    records reach disk with the next ordinary save, which also runs any
+    store-wide steps (see upgrade_store).
+    """
+    steps = _MIGRATIONS.get(name)
+    if not steps or version >= SCHEMA_VERSION or value is None:
+        return value
+    records = value if isinstance(value, list) else [value]
+    for step in range(version + 1, SCHEMA_VERSION + 1):
+        upgrade = steps.get(step)
+        if upgrade:
+            for record in records:
+                if isinstance(record, dict):
+                    upgrade(record)
+    return value
+
+
+def upgrade_sections(data):
+    """Per-section upgrades of a whole store, in memory; schema_version is left as read."""
+    version = data.get("schema_version", 1)
+    for name in _MIGRATIONS:
+        upgrade_section(name, data.get(name), version)
+    return data
+
+
+def upgrade_store(data):
+    """Runs the store-wide steps newer than the data; save_data() calls it on the first save."""
+    version = data.get("schema_version", 1)
+    for step in range(version + 1, SCHEMA_VERSION + 1):
+        if step in _STORE_MIGRATIONS:
+            _STORE_MIGRATIONS[step](data)
+    data["schema_version"] = SCHEMA_VERSION
+    return data
+
+
+def upgrade_data(data):
+    """Upgrades a whole store at once, e.g. one restored from a backup."""
+    return upgrade_store(upgrade_sections(data))
+
+
+def needs_store_migration(version):
+    return any(version < step for step in _STORE_MIGRATIONS)
+
+
+def validate_data(data):
+    """Cheap structural check. Returns a problem description, or None when usable."""
+    if not isinstance(data, dict):
+        return "top level is not an object"
+    for name, kind in SECTION_TYPES.items():
+        value = data.get(name)
+        if value is not None and not isinstance(value, kind):
+            return f"'{name}' is not a {kind.__name__}"
+    for name in ("tasks", "schedules"):
+        for record in data.get(name) or ():
+            if type(record) is not dict or type(record.get("name")) is not str:
+                return f"malformed record in '{name}'"
+    return None
+
+
+def quarantine(path, problem):
+    """Moves a file that failed to load aside instead of letting it be overwritten."""
+    target = f"{path}.corrupt-{time_source.now().strftime('%Y%m%d-%H%M%S')}"
+    os.replace(path, target)
+    print(f"[DATA] {os.path.basename(path)} is unreadable ({problem}); moved to {target}")
+    return target
+
+
+def _read_snapshot(path):
+    with SnapshotReader(path) as reader:
+        return reader.read_all()
+
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _store_files(profile_id=None):
+    """(path, reader) pairs of a profile's store, the format USE_BINARY_SNAPSHOT selects first."""
+    snapshot = (profile_path("snapshot", profile_id), _read_snapshot)
+    legacy = (profile_path("data", profile_id), _read_json)
+    return [snapshot, legacy] if USE_BINARY_SNAPSHOT else [legacy, snapshot]
+
+
+def _supersede(path):
+    """Renames the inactive format's file once the active one is written, so it cannot be loaded stale."""
+    if os.path.exists(path):
+        os.replace(path, path + ".superseded")
+
+
+def _read_retrying(read, path, attempts=3, delay=0.05):
+    """Reads a store file, retrying briefly while a sync tool or scanner holds it."""
+    for attempt in range(attempts):
+        try:
+            return read(path)
+        except OSError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(delay)
+
+
+def _default_data():
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "schedules": [],
+        "tasks": [],
+        "subjects": [],
+        "profile": {
+            "name": "",
+            "title": "",
+            "avatar_path": "data/logo/kivy-icon-256.png"
+        },
+        "settings": {
+            "notifications_enabled": True,
+            "theme": "Light",
+            "primary_color": "Indigo"
+        },
+        "motivation": {
+            "last_studied": "",
+            "current_streak": 0,
+            "last_sent_date": "",
+            "time": "09:00"
+        }
+    }
+
 
 def load_data(use_cache=False):
     """
-    Safely loads app data from JSON. Optionally uses cached data for performance.
+    Safely loads app data from the snapshot or JSON. Optionally uses cached data for performance.
+    A file that fails to parse or validate is moved aside and the newest
+    backup is restored in its place; nothing is overwritten with {}. OS
+    errors (permissions, memory) are raised instead, since the file itself
+    may be fine.
+    """
+    global _data_cache, _recovery_note
+
+    if use_cache and _data_cache:
+        return _data_cache
+    if _memory_store is not None and _active_profile in _memory_store:
+        with _data_lock:
+            _data_cache = _memory_store[_active_profile]
+        return _data_cache
+
+    quarantined = []
+    for path, read in _store_files():  # the other format is only there until the first save migrates it
+        if not os.path.exists(path):
+            continue
+        try:
+            data = _read_retrying(read, path)
+            problem = validate_data(data)
+        except _DECODE_ERRORS as e:
+            problem = str(e) or type(e).__name__
+        if problem is None:
+            # Old files are upgraded in memory only: the first real save writes them back
+            data.setdefault("schema_version", 1)
+            upgrade_sections(data)
+            with _data_lock:
+                _data_cache = data  # later use_cache reads must not decode the file again
+            return data
+        quarantined.append(quarantine(path, problem))
+        break  # an older fallback file must not win over the backups
+
+    data = None
+    if quarantined:
+        try:
+            store = BackupStore()
+            for backup_id in store.list():
+                candidate = store.restore(backup_id)
+                if validate_data(candidate) is None:
+                    data = upgrade_data(candidate)
+                    _recovery_note = ("Your data file was damaged and has been restored from the backup of "
+                                      f"{datetime.strptime(backup_id, '%Y%m%d-%H%M%S-%f').strftime('%b %d, %Y %H:%M')}.")
+                    break
+        except Exception as e:
+            print(f"[DATA] Backup recovery failed: {e}")
+        if data is None:
+            _recovery_note = "Your data file was damaged and no backup was available. The damaged copy was kept as " \
+                             f"{os.path.basename(quarantined[0])}."
+
+    data = data or _default_data()
+    save_data(data)
+    return data
+
+
+def _write_store(data):
+    if USE_BINARY_SNAPSHOT:
+        write_snapshot(data)
+    else:
+        path = profile_path("data")
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+    _supersede(profile_path("data" if USE_BINARY_SNAPSHOT else "snapshot"))
+
+
+def save_data(data):
+    """
+    Safely writes app data to the snapshot (or JSON). Updates cache and ensures atomic write.
+    Data that fails validation is refused with InvalidDataError rather than
+    written over good data; the cache is dropped, since callers edit it in place.
+    """
+    global _data_cache, _data_version
+
+    problem = validate_data(data)
+    if problem is not None:
+        with _data_lock:
+            _data_cache = {}
+            _data_version += 1
+        raise InvalidDataError(problem)
+    if needs_store_migration(data.get("schema_version", SCHEMA_VERSION)):
+        upgrade_store(data)
+    data["schema_version"] = SCHEMA_VERSION
+
+    try:
+        with _data_lock:
+            if _memory_store is not None:
+                _memory_store[_active_profile] = data
+            else:
+                _write_store(data)
+            _data_cache = data
+            _data_version += 1
+    except Exception as e:
+        print(f"[ERROR] Failed to save data: {e}")
+        return
+
+    for hook in _save_hooks:
+        hook()
+
+
+
+# Custom Tab class
+class Tab(MDFloatLayout, MDTabsBase):
+    pass
+
+# Motivational quotes and tips
+MOTIVATIONAL_QUOTES = [
+    "The secret of getting ahead is getting started. - Mark Twain",
+    "You don't have to be great to start, but you have to start to be great. - Zig Ziglar",
+    "The expert in anything was once a beginner. - Helen Hayes",
+    "Success is the sum of small efforts, repeated day in and day out. - Robert Collier",
+    "The only way to learn mathematics is to do mathematics. - Paul Halmos"
+]
+
+PRODUCTIVITY_TIPS = [
+    "Use the Pomodoro Technique: 25 minutes of focused work, then 5-minute break.",
+    "Prioritize your tasks using the Eisenhower Matrix (Urgent/Important).",
+    "Break large tasks into smaller, manageable chunks.",
+    "Review your notes within 24 hours to improve retention.",
+    "Get enough sleep - it's essential for memory consolidation."
+]
+
+
+# ✅ AUTO PLANNER
+DEFAULT_SESSION_MINUTES = 60
+DEFAULT_STUDY_WINDOWS = [["16:00", "21:00"]]
+PRIORITY_RANK = {"High": 0, "Medium": 1, "Low": 2}
+MIN_SESSION_MINUTES = 25
+MAX_SESSION_MINUTES = 90
+
+
+def to_minutes(time_str):
+    hours, minutes = time_str.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def from_minutes(total):
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+class FreeSlots:
+    """
+    Free study time per day, kept as sorted (start, end) minute intervals.
+    Days that still have room are kept in a sorted list of ordinals so the
+    next usable day is found with bisect instead of walking the calendar.
+    """
+
+    def __init__(self, first_day, last_day, windows, busy, now_minutes=0):
+        window_minutes = sorted((to_minutes(a), to_minutes(b)) for a, b in windows)
+        self.slots = {}
+        for day in range(first_day, last_day + 1):
+            intervals = list(window_minutes)
+            if day == first_day:
+                intervals = [(max(a, now_minutes), b) for a, b in intervals if b > now_minutes]
+            for start, end in sorted(busy.get(day, [])):
+                intervals = self._subtract(intervals, start, end)
+            if intervals:
+                self.slots[day] = intervals
+        self.open_days = sorted(self.slots)
+
+    @staticmethod
+    def _subtract(intervals, start, end):
+        result = []
+        for a, b in intervals:
+            if end <= a or start >= b:
+                result.append((a, b))
+                continue
+            if a < start:
+                result.append((a, start))
+            if end < b:
+                result.append((end, b))
+        return result
+
+    def take(self, first_day, last_day, minutes):
+        """
+        Books up to `minutes` in the earliest free interval between the two days.
+        Returns (day, start, length) or None when nothing fits.
+        """
+        idx = bisect.bisect_left(self.open_days, first_day)
+        while idx < len(self.open_days) and self.open_days[idx] <= last_day:
+            day = self.open_days[idx]
+            intervals = self.slots[day]
+            for pos, (a, b) in enumerate(intervals):
+                length = min(minutes, b - a)
+                if length < min(minutes, MIN_SESSION_MINUTES):
+                    continue
+                if a + length < b:
+                    intervals[pos] = (a + length, b)
+                else:
+                    del intervals[pos]
+                if not intervals:
+                    del self.slots[day]
+                    del self.open_days[idx]
+                return day, a, length
+            idx += 1
+        return None
+
+
+DAY_MINUTES = 24 * 60
+
+
+class DayIntervals:
+    """
+    Schedules of one day, bucketed by start minute under a fixed segment tree
+    holding the latest end per minute: an overlap query only descends into
+    branches whose latest end reaches the query, so it costs O(log n) per
+    match no matter how long the early sessions are, and adding or removing a
+    session is a point update of one leaf. Sessions spilling over from the
+    previous evening all start at midnight and are kept apart, sorted by end.
+    A running count of overlapping pairs makes has_conflict() O(1).
+    """
+    _LEAVES = 2048  # one leaf per start minute, rounded up to a power of two
+
+    def __init__(self):
+        self._tree = [-1] * (2 * self._LEAVES)
+        self._started = [0] * (self._LEAVES + 1)  # Fenwick tree of sessions per start minute
+        self._buckets = {}  # start minute -> [(end, item)] in insertion order
+        self._starts_of = {}  # name -> start minutes of its sessions
+        self._count = 0
+        self.carry_ends, self.carry_items = [], []
+        self.conflicts = 0
+
+    def __len__(self):
+        return self._count + len(self.carry_ends)
+
+    @property
+    def items(self):
+        return [item for start in sorted(self._buckets) for _, item in self._buckets[start]]
+
+    @property
+    def starts(self):
+        return [start for start in sorted(self._buckets) for _ in self._buckets[start]]
+
+    def _update(self, start, delta):
+        bucket = self._buckets.get(start)
+        tree, node = self._tree, start + self._LEAVES
+        tree[node] = max(end for end, _ in bucket) if bucket else -1
+        node //= 2
+        while node:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+        i = start + 1
+        while i <= self._LEAVES:
+            self._started[i] += delta
+            i += i & -i
+
+    def _matches(self, start, end):
+        """Own intervals overlapping [start, end), by ascending start."""
+        tree, size, found = self._tree, self._LEAVES, []
+        stack = [(1, 0, size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= end or tree[node] <= start:
+                continue
+            if node >= size:
+                found.extend(item for item_end, item in self._buckets[lo] if item_end > start)
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+        return found
+
+    def overlapping(self, start, end):
+        found = self._matches(start, end)
+        if end > 0:
+            found = self.carry_items[bisect.bisect_right(self.carry_ends, start):] + found
+        return found
+
+    def add(self, start, end, item):
+        self.conflicts += len(self.overlapping(start, end))
+        self._buckets.setdefault(start, []).append((end, item))
+        self._starts_of.setdefault(item.get("name"), []).append(start)
+        self._count += 1
+        self._update(start, 1)
+
+    def add_carry(self, end, item):
+        """A session of the previous day that runs past midnight until `end`."""
+        self.conflicts += len(self.overlapping(0, end))
+        pos = bisect.bisect_right(self.carry_ends, end)
+        self.carry_ends.insert(pos, end)
+        self.carry_items.insert(pos, item)
+
+    def remove(self, name):
+        for start in self._starts_of.pop(name, ()):
+            bucket = self._buckets[start]
+            pos = next(i for i, (_, item) in enumerate(bucket) if item.get("name") == name)
+            end = bucket.pop(pos)[0]
+            if not bucket:
+                del self._buckets[start]
+            self._count -= 1
+            self._update(start, -1)
+            self.conflicts -= len(self.overlapping(start, end))
+        while True:
+            pos = next((i for i, item in enumerate(self.carry_items) if item.get("name") == name), None)
+            if pos is None:
+                break
+            end = self.carry_ends[pos]
+            del self.carry_ends[pos], self.carry_items[pos]
+            self.conflicts -= len(self.overlapping(0, end))
+
+    def has_conflict(self):
+        return self.conflicts > 0
+
+    def count_started(self, minutes):
+        """Sessions starting before `minutes`."""
+        i, total = min(max(minutes, 0), self._LEAVES), 0
+        while i > 0:
+            total += self._started[i]
+            i -= i & -i
+        return total
+
+
+class ScheduleIndex:
+    """
+    Per-day interval index of schedules. Keeps the set of double-booked days
+    up to date so the week view never has to compare schedules pairwise.
+    """
+
+    def __init__(self, schedules=()):
+        self.days = {}
+        self.conflict_days = set()
+        self._dates_by_name = {}
+        for schedule in schedules:
+            self.add(schedule)
+
+    @staticmethod
+    def span(schedule):
+        start = to_minutes(schedule["time"])
+        return start, start + int(schedule.get("duration") or DEFAULT_SESSION_MINUTES)
+
+    @classmethod
+    def parts(cls, schedule):
+        """(date, start, end, carried) pieces of a schedule, split at midnight."""
+        start, end = cls.span(schedule)
+        date_str = schedule["date"]
+        pieces = [(date_str, start, min(end, DAY_MINUTES), False)]
+        if end > DAY_MINUTES:
+            next_day = datetime.strptime(date_str, "%d-%m-%Y") + timedelta(days=1)
+            pieces.append((next_day.strftime("%d-%m-%Y"), 0, end - DAY_MINUTES, True))
+        return pieces
+
+    def _refresh_day(self, date_str):
+        day = self.days.get(date_str)
+        if day is not None and not len(day):
+            del self.days[date_str]
+            day = None
+        if day is not None and day.has_conflict():
+            self.conflict_days.add(date_str)
+        else:
+            self.conflict_days.discard(date_str)
+
+    def add(self, schedule):
+        try:
+            pieces = self.parts(schedule)
+        except (KeyError, ValueError):
+            return
+        for date_str, start, end, carried in pieces:
+            day = self.days.setdefault(date_str, DayIntervals())
+            if carried:
+                day.add_carry(end, schedule)
+            else:
+                day.add(start, end, schedule)
+            self._dates_by_name.setdefault(schedule.get("name"), set()).add(date_str)
+            self._refresh_day(date_str)
+
+    def remove(self, name):
+        for date_str in self._dates_by_name.pop(name, ()):
+            if date_str in self.days:
+                self.days[date_str].remove(name)
+                self._refresh_day(date_str)
+
+    def overlaps(self, date_str, time_str, duration):
+        found, seen = [], set()
+        for day_str, start, end, _ in self.parts({"date": date_str, "time": time_str, "duration": duration}):
+            day = self.days.get(day_str)
+            for item in (day.overlapping(start, end) if day else ()):
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    found.append(item)
+        return found
+
+    def day(self, date_str):
+        return self.days.get(date_str)
+
+
+# ✅ WEEK MODELS
+def week_records(index, monday):
+    """
+    Immutable copy of what a week model needs from the schedule index. Taken
+    on the UI thread so workers never touch the live index.
+    """
+    records = []
+    conflicts = index.conflict_days
+    for offset in range(7):
+        date_str = datetime.fromordinal(monday + offset).strftime("%d-%m-%Y")
+        day = index.day(date_str)
+        records.append((
+            date_str,
+            tuple(dict(item) for item in day.items) if day else (),
+            tuple(day.starts) if day else (),
+            date_str in conflicts,
+        ))
+    return tuple(records)
+
+
+def build_week_model(records, monday):
+    """
+    Per-day session lists and start minutes for the week starting at the
+    `monday` ordinal, built from week_records(). Touches no shared state, so
+    it is safe to run on a worker thread.
+    """
+    days = []
+    for offset, (date_str, items, starts, conflict) in enumerate(records):
+        days.append({
+            "date": date_str,
+            "date_obj": datetime.fromordinal(monday + offset),
+            "sessions": list(items),
+            "starts": list(starts),
+            "conflict": conflict,
+        })
+    return days
+
+
+class WeekModelCache:
+    """
+    Small LRU of week models keyed by Monday ordinal. Neighbouring weeks are
+    prefetched on a worker thread from snapshots taken by the caller;
+    invalidate() bumps a generation so models built from older data are
+    discarded.
+    """
+
+    def __init__(self, build, snapshot, size=6):
+        self._build = build
+        self._snapshot = snapshot
+        self._size = size
+        self._models = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def get(self, monday):
+        with self._lock:
+            model = self._models.get(monday)
+            if model is not None:
+                self._models.move_to_end(monday)
+            return model
+
+    def get_or_build(self, monday):
+        model = self.get(monday)
+        if model is None:
+            generation = self.generation
+            model = self._build(self._snapshot(monday), monday)
+            self._put(monday, model, generation)
+        return model
+
+    def _put(self, monday, model, generation):
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._models[monday] = model
+            self._models.move_to_end(monday)
+            while len(self._models) > self._size:
+                self._models.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._models.clear()
+
+    def prefetch(self, mondays):
+        """Call on the UI thread; only the pure model build runs on the worker."""
+        with self._lock:
+            missing = [m for m in mondays if m not in self._models and m not in self._pending]
+            self._pending.update(missing)
+            generation = self.generation
+        if not missing:
+            return
+        jobs = [(monday, self._snapshot(monday)) for monday in missing]
+
+        def work():
+            for monday, records in jobs:
+                try:
+                    self._put(monday, self._build(records, monday), generation)
+                finally:
+                    with self._lock:
+                        self._pending.discard(monday)
+
+        threading.Thread(target=work, name="week-prefetch", daemon=True).start()
+
+
+def effort_hours(task):
+    """Estimated effort in hours. Only a missing estimate counts as one hour; 0 means none."""
+    effort = task.get("effort")
+    if effort is None or effort == "":
+        return 1.0
+    try:
+        return max(0.0, float(effort))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def plan_study_sessions(tasks, schedules, windows=None, now=None):
+    """
+    Proposes study sessions for open tasks, earliest deadline first and then
+    by priority, packed into the free parts of the daily study windows.
+    """
+    now = now or time_source.now()
+    windows = windows or DEFAULT_STUDY_WINDOWS
+    today = now.date().toordinal()
+
+    open_tasks = []
+    for task in tasks:
+        if task.get("status") == "Done":
+            continue
+        try:
+            due = datetime.strptime(task["due_date"], "%d-%m-%Y").date().toordinal()
+        except (KeyError, ValueError):
+            continue
+        if due < today:
+            continue
+        open_tasks.append((due, PRIORITY_RANK.get(task.get("priority"), 1), task))
+    if not open_tasks:
+        return []
+    open_tasks.sort(key=lambda item: item[:2])
+
+    busy, planned = {}, {}
+    for s in schedules:
+        try:
+            day = datetime.strptime(s["date"], "%d-%m-%Y").date().toordinal()
+            start = to_minutes(s["time"])
+        except (KeyError, ValueError):
+            continue
+        if day < today:
+            continue
+        duration = int(s.get("duration") or DEFAULT_SESSION_MINUTES)
+        busy.setdefault(day, []).append((start, start + duration))
+        if s.get("task"):
+            planned[s["task"]] = planned.get(s["task"], 0) + duration
+
+    last_day = max(due for due, _, _ in open_tasks)
+    free = FreeSlots(today, last_day, windows, busy, now.hour * 60 + now.minute)
+
+    sessions = []
+    for due, _, task in open_tasks:
+        part = 0
+        remaining = int(effort_hours(task) * 60) - planned.get(task["name"], 0)
+        while remaining > 0:
+            slot = free.take(today, due, min(remaining, MAX_SESSION_MINUTES))
+            if slot is None:
+                break
+            day, start, length = slot
+            remaining -= length
+            part += 1
+            sessions.append({
+                "name": f"Study: {task['name']} #{part}",
+                "subject": task.get("subject") or "Study",
+                "description": task.get("description", "")[:150],
+                "time": from_minutes(start),
+                "duration": length,
+                "notification": True,
+                "date": datetime.fromordinal(day).strftime("%d-%m-%Y"),
+                "task": task["name"],
+            })
+
+    sessions.sort(key=lambda x: (datetime.strptime(x["date"], "%d-%m-%Y"), x["time"]))
+    return sessions
+
+
+# ✅ FOCUS TIMER
+POMODORO_MINUTES = 25
+
+
+class FocusTimer:
+    """
+    Pomodoro style focus session. Elapsed time is measured with the monotonic
+    clock; suspend()/wake() bridge app pauses where the device may sleep and
+    the monotonic clock stops advancing.
+    """
+
+    def __init__(self, task="", subject="", schedule="", minutes=POMODORO_MINUTES):
+        self.task = task
+        self.subject = subject
+        self.schedule = schedule
+        self.target_seconds = minutes * 60
+        self.started_at = None
+        self.accumulated = 0.0
+        self._mono_start = None
+        self._suspended = None
+
+    @property
+    def running(self):
+        return self._mono_start is not None
+
+    def elapsed(self):
+        if self._mono_start is None:
+            return self.accumulated
+        return self.accumulated + time_source.monotonic() - self._mono_start
+
+    def remaining(self):
+        return max(0.0, self.target_seconds - self.elapsed())
+
+    def start(self):
+        if self.running:
+            return
+        if self.started_at is None:
+            self.started_at = time_source.now()
+        self._mono_start = time_source.monotonic()
+
+    def pause(self):
+        if not self.running:
+            return
+        self.accumulated += time_source.monotonic() - self._mono_start
+        self._mono_start = None
+
+    def suspend(self):
+        self._suspended = (time_source.monotonic(), time_source.time())
+
+    def wake(self):
+        if self._suspended is None:
+            return
+        mono, wall = self._suspended
+        self._suspended = None
+        if self.running:
+            # Credit time the monotonic clock missed while the device slept
+            gap = (time_source.time() - wall) - (time_source.monotonic() - mono)
+            if gap > 0:
+                self.accumulated += gap
+
+    def finish(self):
+        self.pause()
+        started = self.started_at or time_source.now()
+        return {
+            "start": started.strftime("%d-%m-%Y %H:%M"),
+            "date": started.strftime("%d-%m-%Y"),
+            "seconds": int(min(self.accumulated, self.target_seconds)),
+            "task": self.task,
+            "subject": self.subject,
+            "schedule": self.schedule,
+        }
+
+
+class FocusLog:
+    """
+    Append-only log of focus sessions plus pre-aggregated totals per day,
+    subject and task, so screens read study time without replaying the log.
+    """
+
+    def __init__(self, path=None, totals=None):
+        self.path = path or profile_path("focus_log")
+        self.totals = totals or self.rebuild()
+
+    @staticmethod
+    def empty_totals():
+        return {"total": 0, "day": {}, "subject": {}, "task": {}}
+
+    @staticmethod
+    def _add(totals, session):
+        seconds = session.get("seconds", 0)
+        totals["total"] += seconds
+        for key, field in (("day", "date"), ("subject", "subject"), ("task", "task")):
+            name = session.get(field)
+            if name:
+                totals[key][name] = totals[key].get(name, 0) + seconds
+
+    def rebuild(self):
+        totals = self.empty_totals()
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._add(totals, json.loads(line))
+                    except ValueError:
+                        continue
+        return totals
+
+    def append(self, session):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(session, ensure_ascii=False) + "\n")
+        self._add(self.totals, session)
+
+    def hours(self, key=None, name=None):
+        if key is None:
+            return self.totals["total"] / 3600
+        return self.totals[key].get(name, 0) / 3600
+
+
+# ✅ NOTIFICATION DISPATCH
+class NotificationDispatcher:
+    """
+    Delivers notifications from a worker thread through a bounded queue.
+    Reminders that arrive within `digest_window` seconds of each other are
+    merged into one digest, and deliveries are spaced `min_interval` apart.
+    """
+
+    def __init__(self, notify=None, maxsize=32, min_interval=3.0, digest_window=2.0):
+        self.enabled = True
+        self.dropped = 0
+        self._notify = notify or notification.notify
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._min_interval = min_interval
+        self._digest_window = digest_window
+        self._last_sent = 0.0
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="notifications", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._thread = None
+
+    def post(self, title, message, kind="info"):
+        if not self.enabled:
+            return
+        try:
+            self._queue.put_nowait((kind, title, message))
+        except queue.Full:
+            self.dropped += 1
+
+    def remind(self, name):
+        self.post("Study Reminder", name, kind="reminder")
+
+    def _collect(self, first):
+        """
+        Gathers reminders arriving within the digest window after `first`.
+        """
+        batch, other = [first], []
+        deadline = time.monotonic() + self._digest_window
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                other.append(None)
+                break
+            (batch if item[0] == "reminder" else other).append(item)
+        return batch, other
+
+    def _deliver(self, title, message):
+        wait = self._last_sent + self._min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        if not self.enabled:
+            return
+        try:
+            self._notify(title=title, message=message, app_name="Study Planner")
+        except Exception as e:
+            print(f"[ERROR] Notification failed: {e}")
+        self._last_sent = time.monotonic()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if item[0] != "reminder":
+                self._deliver(item[1], item[2])
+                continue
+
+            batch, other = self._collect(item)
+            names = ", ".join(name for _, _, name in batch)
+            title = "Study Reminder" if len(batch) == 1 else f"{len(batch)} Study Reminders"
+            self._deliver(title, f"It's time for: {names}")
+            for extra in other:
+                if extra is None:
+                    return
+                self._deliver(extra[1], extra[2])
+
+
+# ✅ REMINDER QUEUE
+REMINDER_HORIZON = 24 * 60 * 60  # Only arm Clock events this far ahead (seconds)
+REMINDER_WATERMARK_DELAY = 5  # seconds; reminders firing together share one save of the watermark
+
+
+def schedule_fire_time(schedule):
+    try:
+        when = datetime.strptime(f"{schedule['date']} {schedule['time']}", "%d-%m-%Y %H:%M")
+    except (KeyError, ValueError):
+        return None
+    return int(when.timestamp())
+
+
+class ReminderQueue:
+    """
+    Persisted reminders ordered by fire time (epoch seconds). Keeps a parallel
+    list of times so both the catch-up range and the next reminders to arm
+    are bisect slices.
+    """
+
+    def __init__(self, entries=(), last_run=0):
+        self.entries = sorted([int(ts), name] for ts, name in entries)
+        self.times = [ts for ts, _ in self.entries]
+        self.last_run = last_run
+
+    @classmethod
+    def from_schedules(cls, schedules, last_run=0):
+        entries = []
+        for s in schedules:
+            ts = schedule_fire_time(s) if s.get("notification") else None
+            if ts is not None:
+                entries.append((ts, s["name"]))
+        return cls(entries, last_run)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("queue", []), data.get("last_run", 0))
+
+    def to_dict(self):
+        return {"queue": self.entries, "last_run": self.last_run}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, ts, name):
+        pos = bisect.bisect_right(self.times, ts)
+        self.times.insert(pos, ts)
+        self.entries.insert(pos, [ts, name])
+
+    def remove(self, name):
+        keep = [e for e in self.entries if e[1] != name]
+        if len(keep) != len(self.entries):
+            self.entries = keep
+            self.times = [ts for ts, _ in keep]
+
+    def missed(self, now):
+        lo = bisect.bisect_right(self.times, self.last_run)
+        hi = bisect.bisect_right(self.times, now)
+        return self.entries[lo:hi]
+
+    def upcoming(self, now, horizon=REMINDER_HORIZON):
+        lo = bisect.bisect_right(self.times, now)
+        hi = bisect.bisect_right(self.times, now + horizon)
+        return self.entries[lo:hi]
+
+    def prune(self, before):
+        idx = bisect.bisect_left(self.times, before)
+        if idx:
+            del self.entries[:idx]
+            del self.times[:idx]
+
+
+# ✅ PROFILES
+class MergedReminderQueue:
+    """
+    Upcoming reminders of every inactive profile in one list sorted by fire
+    time, stored as [ts, profile_id, name] triples, so a single bisect slice
+    arms them without opening any other shard.
+    """
+
+    def __init__(self, entries=()):
+        self.entries = sorted([int(ts), profile_id, name] for ts, profile_id, name in entries)
+        self.times = [ts for ts, _, _ in self.entries]
+
+    def replace(self, profile_id, entries):
+        """Swaps in a profile's reminders when it becomes inactive."""
+        self.entries = sorted([e for e in self.entries if e[1] != profile_id] +
+                              [[int(ts), profile_id, name] for ts, name in entries])
+        self.times = [ts for ts, _, _ in self.entries]
+
+    def drop(self, profile_id):
+        """Removes a profile's reminders when it becomes active again."""
+        self.replace(profile_id, [])
+
+    def missed(self, since, now):
+        lo = bisect.bisect_right(self.times, since)
+        hi = bisect.bisect_right(self.times, now)
+        return self.entries[lo:hi]
+
+    def upcoming(self, now, horizon=REMINDER_HORIZON):
+        lo = bisect.bisect_right(self.times, now)
+        hi = bisect.bisect_right(self.times, now + horizon)
+        return self.entries[lo:hi]
+
+    def prune(self, before):
+        idx = bisect.bisect_left(self.times, before)
+        if idx:
+            del self.entries[:idx]
+            del self.times[:idx]
+
+
+class ProfileIndex:
+    """
+    Small file listing every profile (name, title, avatar) plus the active
+    one and the merged reminders of the others. Profile pickers read only
+    this file; a shard is opened only when its profile becomes active.
+    """
+
+    def __init__(self, path=None):
+        self.path = path = path or PROFILE_INDEX_FILE
+        self.active = DEFAULT_PROFILE
+        self.profiles = {}
+        self.reminders = MergedReminderQueue()
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+                self.active = stored.get("active", DEFAULT_PROFILE)
+                self.profiles = stored.get("profiles", {})
+                self.reminders = MergedReminderQueue(stored.get("reminders", []))
+            except (OSError, ValueError) as e:
+                print(f"Error reading profile index: {e}")
+        if DEFAULT_PROFILE not in self.profiles:
+            # ✅ Existing single-profile data becomes the default profile
+            profile = load_section("profile", {}, profile_id=DEFAULT_PROFILE) or {}
+            self.profiles[DEFAULT_PROFILE] = {"name": profile.get("name") or "Me", "title": profile.get("title", "")}
+        if self.active not in self.profiles:
+            self.active = DEFAULT_PROFILE
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"active": self.active, "profiles": self.profiles,
+                       "reminders": self.reminders.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def add(self, name, title=""):
+        base = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "profile"
+        profile_id, n = base, 1
+        while profile_id in self.profiles or profile_id == DEFAULT_PROFILE:
+            n += 1
+            profile_id = f"{base}-{n}"
+        self.profiles[profile_id] = {"name": name, "title": title}
+        self.save()
+        return profile_id
+
+    def update(self, profile_id, **fields):
+        self.profiles.setdefault(profile_id, {}).update(fields)
+        self.save()
+
+    def name(self, profile_id):
+        return self.profiles.get(profile_id, {}).get("name", profile_id)
+
+
+# ✅ SPACED REPETITION
+DAY_SECONDS = 24 * 60 * 60
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+REVIEW_GRADES = [("Again", 1), ("Hard", 3), ("Good", 4), ("Easy", 5)]
+REVIEW_RETIRE_DAYS = 180  # a card this well known is dropped instead of rescheduled
+REVIEW_REMINDER_PREFIX = "review:"
+
+
+class ReviewQueue:
+    """
+    SM-2 review scheduler. Every completed session becomes a card whose next
+    review sits in a min-heap keyed by due time, so collecting the reviews
+    due by some moment pops only those k entries. Popped cards wait in `due`
+    until graded; each subject remembers its latest ease and interval so new
+    cards of a well-known subject start from it. Cards whose next interval
+    reaches REVIEW_RETIRE_DAYS are retired, so the store stays bounded.
+    """
+
+    def __init__(self, heap=(), cards=None, subjects=None, due=(), seq=0, last_scan=0):
+        self.heap = [list(entry) for entry in heap]
+        heapq.heapify(self.heap)
+        self.cards = cards or {}
+        self.subjects = subjects or {}
+        self.due = list(due)
+        self.seq = seq
+        self.last_scan = last_scan
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("heap", []), data.get("cards"), data.get("subjects"),
+                   data.get("due", []), data.get("seq", 0), data.get("last_scan", 0))
+
+    def to_dict(self):
+        return {"heap": self.heap, "cards": self.cards, "subjects": self.subjects,
+                "due": self.due, "seq": self.seq, "last_scan": self.last_scan}
+
+    def _push(self, card):
+        self.seq += 1
+        heapq.heappush(self.heap, [card["due"], self.seq, card["id"]])
+
+    def enqueue(self, card_id, subject, source, now):
+        """Adds a card for a finished session; the first review is a day later."""
+        if card_id in self.cards:
+            return None
+        learned = self.subjects.get(subject, {})
+        card = {
+            "id": card_id,
+            "subject": subject,
+            "source": source,
+            "ease": learned.get("ease", DEFAULT_EASE),
+            "interval": 1,
+            "reps": 0,
+            "due": int(now + DAY_SECONDS),
+        }
+        self.cards[card_id] = card
+        self._push(card)
+        return card
+
+    def pop_due(self, until):
+        """Moves reviews due by `until` off the heap and returns all pending ones."""
+        while self.heap and self.heap[0][0] <= until:
+            due, _, card_id = heapq.heappop(self.heap)
+            card = self.cards.get(card_id)
+            # Entries left behind by a re-grade no longer match the card's due time
+            if card and card["due"] == due and card_id not in self.due:
+                self.due.append(card_id)
+        return [self.cards[card_id] for card_id in self.due if card_id in self.cards]
+
+    def grade(self, card_id, quality, now):
+        """
+        Applies an SM-2 grade (0-5) and schedules the next review. Returns the
+        card, or None when it was retired.
+        """
+        card = self.cards[card_id]
+        if quality < 3:
+            card["reps"] = 0
+            card["interval"] = 1
+        else:
+            card["reps"] += 1
+            if card["reps"] == 1:
+                card["interval"] = 1
+            elif card["reps"] == 2:
+                card["interval"] = 6
+            else:
+                card["interval"] = round(card["interval"] * card["ease"])
+        card["ease"] = max(MIN_EASE, card["ease"] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        card["due"] = int(now + card["interval"] * DAY_SECONDS)
+
+        if card_id in self.due:
+            self.due.remove(card_id)
+        self.subjects[card["subject"]] = {"ease": round(card["ease"], 2), "interval": card["interval"]}
+        if card["interval"] >= REVIEW_RETIRE_DAYS:
+            del self.cards[card_id]
+            return None
+        self._push(card)
+        return card
+
+
+# ✅ AGENDA INDEX
+def due_ordinal(task):
+    try:
+        return datetime.strptime(task["due_date"], "%d-%m-%Y").date().toordinal()
+    except (KeyError, ValueError):
+        return None
+
+
+class DueDateIndex:
+    """
+    Open tasks ordered by due date as integer ordinals. Agenda buckets are
+    range slices found with bisect, so rendering never parses every date.
+    """
+
+    def __init__(self, tasks=()):
+        self.keys, self.tasks = [], []
+        self._key_by_name = {}
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, task):
+        ordinal = due_ordinal(task)
+        if ordinal is None or task.get("status") == "Done":
+            return
+        key = (ordinal, task.get("name", ""))
+        pos = bisect.bisect_right(self.keys, key)
+        self.keys.insert(pos, key)
+        self.tasks.insert(pos, task)
+        self._key_by_name.setdefault(key[1], []).append(key)
+
+    def remove(self, name):
+        for key in self._key_by_name.pop(name, []):
+            pos = bisect.bisect_left(self.keys, key)
+            if pos < len(self.keys) and self.keys[pos] == key:
+                del self.keys[pos]
+                del self.tasks[pos]
+
+    def update(self, name, task):
+        self.remove(name)
+        self.add(task)
+
+    def between(self, first, last):
+        """Open tasks due from `first` to `last` (inclusive ordinals)."""
+        lo = bisect.bisect_left(self.keys, (first,))
+        hi = bisect.bisect_left(self.keys, (last + 1,))
+        return self.tasks[lo:hi]
+
+    def buckets(self, today, upcoming_days=7):
+        return {
+            "overdue": self.tasks[:bisect.bisect_left(self.keys, (today,))],
+            "today": self.between(today, today),
+            "upcoming": self.between(today + 1, today + upcoming_days),
+        }
+
+
+# ✅ SUBJECTS
+SUBJECT_COLORS = ["#3F51B5", "#009688", "#E91E63", "#FF9800", "#4CAF50", "#9C27B0", "#03A9F4", "#795548"]
+
+
+def normalize_subject(name):
+    """Display form of a subject: trimmed, inner whitespace collapsed."""
+    return " ".join(str(name or "").split())
+
+
+def subject_key(name):
+    return normalize_subject(name).casefold()
+
+
+class SubjectCatalog:
+    """
+    Subjects interned to small integer ids with a stable color each. Names
+    that differ only in case or spacing share one id. A sorted key list
+    serves autocomplete by prefix with bisect.
+    """
+
+    def __init__(self, records=()):
+        self.records = {}  # id -> {"id", "name", "color"}
+        self._ids = {}     # key -> id
+        self._keys = []    # sorted (key, id)
+        for record in records:
+            self._insert(dict(record))
+
+    def __len__(self):
+        return len(self.records)
+
+    def _insert(self, record):
+        key = subject_key(record["name"])
+        self.records[record["id"]] = record
+        self._ids[key] = record["id"]
+        bisect.insort(self._keys, (key, record["id"]))
+
+    def lookup(self, name):
+        """Id of a known subject, or None."""
+        return self._ids.get(subject_key(name))
+
+    def assign(self, record):
+        """Interns a record's subject, storing the catalog spelling and its id on the record."""
+        subject_id = self.intern(record.get("subject"))
+        if subject_id is None:
+            record["subject"] = ""
+            record.pop("subject_id", None)
+        else:
+            record["subject"] = self.name(subject_id)
+            record["subject_id"] = subject_id
+        return subject_id
+
+    def intern(self, name):
+        """Id of `name`, adding it to the catalog on first sight. Empty names have no id."""
+        key = subject_key(name)
+        if not key:
+            return None
+        if key not in self._ids:
+            subject_id = max(self.records, default=0) + 1
+            self._insert({"id": subject_id, "name": normalize_subject(name),
+                          "color": SUBJECT_COLORS[(subject_id - 1) % len(SUBJECT_COLORS)]})
+        return self._ids[key]
+
+    def name(self, subject_id):
+        return self.records[subject_id]["name"]
+
+    def color(self, subject_id):
+        return self.records[subject_id]["color"]
+
+    def complete(self, prefix, limit=5):
+        """Names starting with `prefix` (ignoring case), alphabetically."""
+        key = subject_key(prefix)
+        found = []
+        for entry_key, subject_id in self._keys[bisect.bisect_left(self._keys, (key,)):]:
+            if not entry_key.startswith(key) or len(found) >= limit:
+                break
+            found.append(self.records[subject_id]["name"])
+        return found
+
+    def to_list(self):
+        return [dict(self.records[i]) for i in sorted(self.records)]
+
+
+class SubjectStats:
+    """
+    Sessions, planned minutes, tasks and finished tasks per subject id, plus
+    the records of each subject. Built once from the store, then kept
+    current by add/remove calls as records change, so filters and progress
+    bars are dict lookups.
+    """
+
+    def __init__(self, catalog, schedules=(), tasks=()):
+        self.catalog = catalog
+        self.totals = {}     # id -> [sessions, minutes, tasks, done]
+        self.schedules = {}  # id -> {(name, date, time): schedule}
+        self.tasks = {}      # id -> {name: task}
+        for schedule in schedules:
+            self.add_schedule(schedule)
+        for task in tasks:
+            self.add_task(task)
+
+    def subject_id(self, record):
+        # Review cards carry only a subject name
+        return record.get("subject_id") or self.catalog.lookup(record.get("subject"))
+
+    def _bump(self, subject_id, *deltas):
+        row = self.totals.setdefault(subject_id, [0, 0, 0, 0])
+        for i, delta in enumerate(deltas):
+            row[i] += delta
+
+    @staticmethod
+    def _file(index, subject_id, key, record, sign):
+        members = index.setdefault(subject_id, {})
+        if sign > 0:
+            members[key] = record
+        else:
+            members.pop(key, None)
+
+    def add_schedule(self, schedule, sign=1):
+        subject_id = self.subject_id(schedule)
+        if subject_id is None:
+            return
+        start, end = ScheduleIndex.span(schedule)
+        self._bump(subject_id, sign, sign * (end - start))
+        key = (schedule.get("name"), schedule.get("date"), schedule.get("time"))
+        self._file(self.schedules, subject_id, key, schedule, sign)
+
+    def remove_schedule(self, schedule):
+        self.add_schedule(schedule, -1)
+
+    def add_task(self, task, sign=1):
+        subject_id = self.subject_id(task)
+        if subject_id is None:
+            return
+        self._bump(subject_id, 0, 0, sign, sign * (task.get("status") == "Done"))
+        self._file(self.tasks, subject_id, task.get("name"), task, sign)
+
+    def remove_task(self, task):
+        self.add_task(task, -1)
+
+    def tasks_of(self, subject_id):
+        return list(self.tasks.get(subject_id, {}).values())
+
+    def get(self, subject_id):
+        sessions, minutes, tasks, done = self.totals.get(subject_id, (0, 0, 0, 0))
+        return {"sessions": sessions, "minutes": minutes, "tasks": tasks, "done": done,
+                "progress": done / tasks * 100 if tasks else 0}
+
+    def rows(self):
+        """(id, totals) of every subject with any activity, busiest first."""
+        active = [i for i, row in self.totals.items() if any(row)]
+        return [(i, self.get(i)) for i in sorted(active, key=lambda i: -self.totals[i][1])]
+
+
+# ✅ PERIODIC ROLLOVER
+PERIODIC_TYPES = ("Daily", "Weekly", "Monthly")
+TASK_HISTORY_LIMIT = 5000
+
+
+def period_key(task_type, day):
+    """Integer id of the period containing `day` (a date)."""
+    if task_type == "Daily":
+        return day.toordinal()
+    if task_type == "Weekly":
+        return day.toordinal() - day.weekday()
+    if task_type == "Monthly":
+        return day.year * 12 + day.month - 1
+    return None
+
+
+def period_end(task_type, key):
+    if task_type == "Daily":
+        return datetime.fromordinal(key).date()
+    if task_type == "Weekly":
+        return datetime.fromordinal(key + 6).date()
+    year, month = divmod(key + 1, 12)
+    return datetime(year, month + 1, 1).date() - timedelta(days=1)
+
+
+def shift_due_date(task_type, due, periods):
+    if task_type == "Daily":
+        return due + timedelta(days=periods)
+    if task_type == "Weekly":
+        return due + timedelta(weeks=periods)
+    months = due.year * 12 + due.month - 1 + periods
+    year, month = divmod(months, 12)
+    last_day = (datetime(year + (month + 1) // 12, (month + 1) % 12 + 1, 1) - timedelta(days=1)).day
+    return due.replace(year=year, month=month + 1, day=min(due.day, last_day))
+
+
+def roll_over_tasks(data, today):
+    """
+    Resets recurring tasks (those saved with "repeat") whose period has ended
+    since the stored watermark. Each expired task gets a history entry, Done
+    is cleared and the due date moves into the current period; one-off tasks
+    are never touched. Returns True when anything changed.
+    """
+    watermark = data.setdefault("rollover", {})
+    current = {t: period_key(t, today) for t in PERIODIC_TYPES}
+    expired_types = {t for t in PERIODIC_TYPES if watermark.get(t) != current[t]}
+    if not expired_types:
+        return False
+
+    history = data.setdefault("task_history", [])
+    for task in data.get("tasks", []):
+        task_type = task.get("task_type")
+        if not task.get("repeat") or task_type not in expired_types:
+            continue
+        if "period" not in task:
+            created = task.get("created_at")
+            try:
+                created_day = datetime.strptime(created, "%d-%m-%Y").date()
+            except (TypeError, ValueError):
+                created_day = today
+            task["period"] = period_key(task_type, created_day)
+        if task["period"] >= current[task_type]:
+            continue
+
+        history.append({
+            "name": task.get("name", ""),
+            "task_type": task_type,
+            "subject": task.get("subject", ""),
+            "period_end": period_end(task_type, task["period"]).strftime("%d-%m-%Y"),
+            "due_date": task.get("due_date", ""),
+            "status": task.get("status", "Pending"),
+            "completed_at": task.get("completed_at", ""),
+        })
+
+        if task.get("status") == "Done":
+            task["status"] = "Pending"
+        task.pop("completed_at", None)
+        try:
+            due = datetime.strptime(task["due_date"], "%d-%m-%Y").date()
+            periods = current[task_type] - task["period"]
+            if task_type == "Weekly":
+                periods //= 7  # weekly keys are Monday ordinals
+            task["due_date"] = shift_due_date(task_type, due, periods).strftime("%d-%m-%Y")
+        except (KeyError, ValueError):
+            pass
+        task["period"] = current[task_type]
+
+    if len(history) > TASK_HISTORY_LIMIT:
+        del history[:len(history) - TASK_HISTORY_LIMIT]
+    watermark.update(current)
+    return True
+
+
+# ✅ ANALYTICS
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+@functools.lru_cache(maxsize=4096)
+def _ordinal_or_zero(date_str):
+    # History repeats the same few hundred dates, so parsing is memoized
+    try:
+        return datetime.strptime(date_str, "%d-%m-%Y").date().toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+class AnalyticsEngine:
+    """
+    Completion analytics computed with NumPy over columnar arrays built from
+    task history, current tasks, schedules and focus totals. Results are
+    cached per data version so reopening the Stats screen is free.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._result = None
+
+    def get(self, data, today=None):
+        # Keyed on the date too: streaks and "today" figures move at midnight without a save
+        today = today or time_source.now().date()
+        version = (data_version(), today)
+        if self._version != version or self._result is None:
+            self._result = self.compute(data, today)
+            self._version = version
+        return self._result
+
+    @staticmethod
+    def columns(data, today_ord):
+        """Flattens history + current tasks into parallel arrays."""
+        records = list(data.get("task_history", []))
+        records.extend(t for t in data.get("tasks", []) if _ordinal_or_zero(t.get("due_date")) <= today_ord)
+
+        due = np.fromiter((_ordinal_or_zero(r.get("due_date")) for r in records), dtype=np.int64, count=len(records))
+        completed = np.fromiter((_ordinal_or_zero(r.get("completed_at")) for r in records), dtype=np.int64, count=len(records))
+        done = np.fromiter((r.get("status") == "Done" for r in records), dtype=bool, count=len(records))
+        subjects, subject_ids = np.unique(np.array([r.get("subject") or "General" for r in records] or [""]), return_inverse=True)
+        types, type_ids = np.unique(np.array([r.get("task_type") or "Other" for r in records] or [""]), return_inverse=True)
+        if not records:
+            subject_ids = type_ids = np.zeros(0, dtype=np.int64)
+        return {
+            "due": due, "completed": completed, "done": done,
+            "subjects": subjects, "subject_ids": subject_ids.reshape(-1),
+            "types": types, "type_ids": type_ids.reshape(-1),
+        }
+
+    @staticmethod
+    def _rates(groups, done, size):
+        totals = np.bincount(groups, minlength=size)
+        hits = np.bincount(groups, weights=done, minlength=size)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(totals > 0, hits / np.maximum(totals, 1), np.nan), totals
+
+    def compute(self, data, today):
+        today_ord = today.toordinal()
+        cols = self.columns(data, today_ord)
+        due, completed, done = cols["due"], cols["completed"], cols["done"]
+        valid = due > 0
+
+        weekday = (due[valid] - 1) % 7  # ordinal 1 is a Monday
+        weekday_rate, weekday_total = self._rates(weekday, done[valid], 7)
+        subject_rate, subject_total = self._rates(cols["subject_ids"], done, len(cols["subjects"]))
+        type_rate, type_total = self._rates(cols["type_ids"], done, len(cols["types"]))
+
+        dated = done & (completed > 0) & valid
+        on_time = int(np.count_nonzero(completed[dated] <= due[dated]))
+        late = int(np.count_nonzero(dated)) - on_time
+
+        # Daily series over the last 30 days: tasks completed and study minutes
+        window = 30
+        start = today_ord - window + 1
+        recent = completed[done & (completed >= start) & (completed <= today_ord)] - start
+        completions = np.bincount(recent, minlength=window).astype(float)
+
+        minutes = np.zeros(window)
+        for s in data.get("schedules", []):
+            day = _ordinal_or_zero(s.get("date")) - start
+            if 0 <= day < window:
+                minutes[day] += int(s.get("duration") or DEFAULT_SESSION_MINUTES)
+        for date_str, seconds in data.get("focus_totals", {}).get("day", {}).items():
+            day = _ordinal_or_zero(date_str) - start
+            if 0 <= day < window:
+                minutes[day] += seconds / 60
+
+        # Calendar heatmap: completions over the last 16 weeks, starting on a Monday
+        heat_start = today_ord - today.weekday() - 15 * 7
+        heat = completed[done & (completed >= heat_start) & (completed <= today_ord)] - heat_start
+        heatmap = np.bincount(heat, minlength=today_ord - heat_start + 1).astype(float)
+
+        def rolling(series, days):
+            kernel = np.ones(days) / days
+            return np.convolve(series, kernel, mode="full")[:len(series)]
+
+        return {
+            "weekday": {WEEKDAY_NAMES[i]: (None if np.isnan(r) else float(r), int(weekday_total[i])) for i, r in enumerate(weekday_rate)},
+            "subject": {str(n): (float(r), int(t)) for n, r, t in zip(cols["subjects"], subject_rate, subject_total) if t},
+            "type": {str(n): (float(r), int(t)) for n, r, t in zip(cols["types"], type_rate, type_total) if t},
+            "on_time": on_time,
+            "late": late,
+            "completions": completions,
+            "minutes": minutes,
+            "heatmap": heatmap,
+            "avg7": float(rolling(completions, 7)[-1]),
+            "avg30": float(completions.mean()),
+            "minutes_avg7": float(rolling(minutes, 7)[-1]),
+        }
+
+
+# ✅ WORKLOAD
+DEFAULT_DAILY_CAPACITY = 6 * 60  # minutes
+DEFAULT_WEEKLY_CAPACITY = 30 * 60
+
+
+def task_minutes(task):
+    return effort_hours(task) * 60
+
+
+def format_hours(minutes):
+    return f"{minutes / 60:.1f} h"
+
+
+class WorkloadModel:
+    """
+    Planned minutes per day (scheduled sessions plus the effort of open tasks
+    by due date) kept as prefix sums over day ordinals, so the load between
+    any two dates is two lookups.
     """
-    global _data_cache
 
-    if use_cache and _data_cache:
-        return _data_cache
+    def __init__(self, schedules=(), tasks=()):
+        days, minutes, counts = [], [], []
+        for schedule in schedules:
+            ordinal = _ordinal_or_zero(schedule.get("date"))
+            if ordinal:
+                start, end = ScheduleIndex.span(schedule)
+                days.append(ordinal)
+                minutes.append(end - start)
+                counts.append(0)
+        for task in tasks:
+            ordinal = _ordinal_or_zero(task.get("due_date"))
+            if ordinal and task.get("status") != "Done":
+                days.append(ordinal)
+                minutes.append(task_minutes(task))
+                counts.append(1)
+
+        offsets = np.asarray(days, dtype=np.int64)
+        self.first = int(offsets.min()) if len(offsets) else 0
+        offsets -= self.first
+        size = int(offsets.max()) + 1 if len(offsets) else 0
+        self._minutes = np.concatenate([[0.0], np.cumsum(np.bincount(offsets, weights=minutes, minlength=size))])
+        self._tasks = np.concatenate([[0.0], np.cumsum(np.bincount(offsets, weights=counts, minlength=size))])
+
+    def _positions(self, ordinals):
+        return np.clip(np.asarray(ordinals) - self.first, 0, len(self._minutes) - 1)
+
+    def _range(self, prefix, first, last):
+        lo, hi = self._positions([first, last + 1])
+        return float(prefix[hi] - prefix[lo])
+
+    def minutes(self, first, last):
+        """Planned minutes from `first` to `last` (inclusive ordinals)."""
+        return self._range(self._minutes, first, last)
+
+    def task_count(self, first, last):
+        return int(self._range(self._tasks, first, last))
+
+    def daily(self, first, last):
+        """Planned minutes of every day from `first` to `last`."""
+        return np.diff(self._minutes[self._positions(np.arange(first, last + 2))])
+
+    def warnings(self, ordinal, added, daily_capacity, weekly_capacity):
+        """Capacity overruns if `added` more minutes landed on `ordinal`."""
+        day = datetime.fromordinal(ordinal)
+        monday = ordinal - day.weekday()
+        day_load = self.minutes(ordinal, ordinal) + added
+        week_load = self.minutes(monday, monday + 6) + added
+        found = []
+        if day_load > daily_capacity:
+            found.append(f"{day.strftime('%a, %b %d')}: {format_hours(day_load)} planned "
+                         f"(capacity {format_hours(daily_capacity)})")
+        if week_load > weekly_capacity:
+            found.append(f"Week of {datetime.fromordinal(monday).strftime('%b %d')}: {format_hours(week_load)} planned "
+                         f"(capacity {format_hours(weekly_capacity)})")
+        return found
+
+
+# ✅ LOCAL API
+class LocalApiServer:
+    """
+    Read-only JSON API for desktop companions, served from a background
+    thread on loopback only. Each route names the store slices it serves and
+    a provider returning copies of plain data. on_store_change() runs on the
+    UI thread and re-copies only the routes a change touches, bumping their
+    versions, so the server thread never reads the live store and unrelated
+    saves copy nothing. Responses are serialized once per route version and
+    carry an ETag, so unchanged polls get a 304.
+    """
+
+    def __init__(self, routes, port=API_PORT):
+        self.routes = routes  # path -> (slices, provider)
+        self.port = port
+        self._boot = f"{int(time.time()):x}"  # ETags from an older run never match
+        self._versions = dict.fromkeys(routes, 0)
+        self._published = {}  # path -> (version, data)
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._server is not None
+
+    def etag(self, version):
+        return f'"{self._boot}-{version}"'
+
+    def allowed_host(self, host):
+        """Only loopback names are served, which blocks DNS rebinding."""
+        return host in (f"{API_HOST}:{self.port}", f"localhost:{self.port}")
+
+    def slices(self):
+        return {name for slices, _ in self.routes.values() for name in slices}
+
+    def publish(self, paths=None):
+        """Copies the given routes' data (every route by default). Call on the UI thread."""
+        for path in self.routes if paths is None else paths:
+            data = self.routes[path][1]()
+            with self._lock:
+                self._versions[path] += 1
+                self._published[path] = (self._versions[path], data)
+
+    def on_store_change(self, change):
+        if self.running:
+            self.publish([path for path, (slices, _) in self.routes.items()
+                          if change.slice is None or change.slice in slices])
+
+    def published_version(self, path):
+        with self._lock:
+            return self._published.get(path, (None,))[0]
+
+    def body(self, path):
+        """Returns (etag, bytes) for a route, serializing only on a version change."""
+        with self._lock:
+            version, data = self._published[path]
+            cached = self._cache.get(path)
+            if cached and cached[0] == version:
+                return self.etag(version), cached[1]
+        payload = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        with self._lock:
+            self._cache[path] = (version, payload)
+        return self.etag(version), payload
+
+    def start(self):
+        if self._server is not None:
+            return True
+        api = self
+        self.publish()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if not api.allowed_host(self.headers.get("Host", "")):
+                    self.send_error(403)
+                    return
+                path = self.path.split("?", 1)[0].rstrip("/") or "/"
+                if path not in api.routes:
+                    self.send_error(404)
+                    return
+                etag = api.etag(api.published_version(path))
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                try:
+                    etag, payload = api.body(path)
+                except Exception as e:
+                    print(f"[API] {path} failed: {e}")
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((API_HOST, self.port), Handler)
+        except OSError as e:
+            print(f"[API] Could not bind {API_HOST}:{self.port}: {e}")
+            return False
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-api", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+        with self._lock:
+            self._published.clear()
+            self._cache.clear()
+
 
+# ✅ BACKUPS
+BACKUP_DELAY = 30  # seconds of quiet after a save before backing up
+BACKUP_RETENTION = {"last": 10, "daily": 14, "weekly": 12, "monthly": 24}
+
+
+def _backup_group(section, record):
+    """Chunk key of a record: tasks by due month, schedules by ISO week."""
     try:
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        else:
-            default_data = {
-                "schedules": [],
-                "tasks": [],
-                "profile": {
-                    "name": "",
-                    "title": "",
-                    "avatar_path": "data/logo/kivy-icon-256.png"
-                },
-                "settings": {
-                    "notifications_enabled": True,
-                    "theme": "Light",
-                    "primary_color": "Indigo"
-                },
-                "motivation": {
-                    "last_studied": "",
-                    "current_streak": 0,
-                    "last_sent_date": "",
-                    "time": "09:00"
-                }
-            }
-            save_data(default_data)
-            return default_data
-    except Exception as e:
-        print(f"Error loading data: {e}")
-        return {}
-    
-def save_data(data):
+        if section == "tasks":
+            return datetime.strptime(record["due_date"], "%d-%m-%Y").strftime("%Y-%m")
+        if section == "schedules":
+            year, week, _ = datetime.strptime(record["date"], "%d-%m-%Y").isocalendar()
+            return f"{year}-W{week:02d}"
+    except (KeyError, ValueError, TypeError):
+        pass
+    return "undated"
+
+
+class BackupStore:
+    """
+    Incremental backups as content-addressed, zlib-compressed chunks. Each
+    top-level section is a chunk, except tasks and schedules which are split
+    into dated groups, so a backup only writes the groups that changed. A
+    manifest per backup lists its chunk hashes plus record positions, which
+    is all a restore needs to read.
+    """
+
+    def __init__(self, root=None, delay=BACKUP_DELAY, source=None):
+        self.root = root = root or profile_path("backups")
+        self.delay = delay
+        self._source = source or (lambda: load_data(use_cache=True))
+        self._chunks = os.path.join(root, "chunks")
+        self._manifests = os.path.join(root, "manifests")
+        self._lock = threading.Lock()
+        self._timer = None
+
+    # ---- chunks ----
+    def _chunk_path(self, digest):
+        return os.path.join(self._chunks, digest[:2], digest)
+
+    def _put_chunk(self, value):
+        raw = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._chunk_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(raw, 6))
+            os.replace(tmp_path, path)
+        return digest
+
+    def _get_chunk(self, digest):
+        with open(self._chunk_path(digest), "rb") as f:
+            return json.loads(zlib.decompress(f.read()))
+
+    # ---- manifests ----
+    def list(self):
+        """Backup ids, newest first. Ids are sortable timestamps."""
+        if not os.path.isdir(self._manifests):
+            return []
+        return sorted((n[:-5] for n in os.listdir(self._manifests) if n.endswith(".json")), reverse=True)
+
+    def manifest(self, backup_id):
+        with open(os.path.join(self._manifests, backup_id + ".json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def backup(self, data=None, now=None):
+        """Stores a backup and returns its id, or None when nothing changed."""
+        with self._lock:
+            data = self._source() if data is None else data
+            sections = {}
+            for name, value in data.items():
+                if name in ("tasks", "schedules") and isinstance(value, list):
+                    groups = {}
+                    for position, record in enumerate(value):
+                        group = groups.setdefault(_backup_group(name, record), ([], []))
+                        group[0].append(position)
+                        group[1].append(record)
+                    sections[name] = {key: [positions, self._put_chunk(records)]
+                                      for key, (positions, records) in groups.items()}
+                else:
+                    sections[name] = self._put_chunk(value)
+
+            existing = self.list()
+            if existing and self.manifest(existing[0])["sections"] == sections:
+                return None
+
+            now = now or time_source.now()
+            backup_id = now.strftime("%Y%m%d-%H%M%S-%f")
+            os.makedirs(self._manifests, exist_ok=True)
+            path = os.path.join(self._manifests, backup_id + ".json")
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"created": now.strftime("%d-%m-%Y %H:%M:%S"), "sections": sections}, f)
+            os.replace(path + ".tmp", path)
+            return backup_id
+
+    def restore(self, backup_id):
+        """Rebuilds the data dict of a backup, records in their original order."""
+        data = {}
+        for name, entry in self.manifest(backup_id)["sections"].items():
+            if isinstance(entry, dict):
+                ordered = []
+                for positions, digest in entry.values():
+                    ordered.extend(zip(positions, self._get_chunk(digest)))
+                ordered.sort(key=lambda pair: pair[0])
+                data[name] = [record for _, record in ordered]
+            else:
+                data[name] = self._get_chunk(entry)
+        return data
+
+    # ---- retention ----
+    def prune(self, retention=BACKUP_RETENTION):
+        """
+        Keeps the newest `last` backups plus the newest one per day, ISO week
+        and month within those limits, then deletes unreferenced chunks.
+        """
+        ids = self.list()
+        keep = set(ids[:retention["last"]])
+        buckets = {
+            "daily": lambda d: d.date(),
+            "weekly": lambda d: d.isocalendar()[:2],
+            "monthly": lambda d: (d.year, d.month),
+        }
+        for rule, bucket in buckets.items():
+            seen = []
+            for backup_id in ids:
+                key = bucket(datetime.strptime(backup_id, "%Y%m%d-%H%M%S-%f"))
+                if key not in seen:
+                    if len(seen) == retention[rule]:
+                        break
+                    seen.append(key)
+                    keep.add(backup_id)
+
+        with self._lock:
+            for backup_id in ids:
+                if backup_id not in keep:
+                    os.remove(os.path.join(self._manifests, backup_id + ".json"))
+            return self.collect_garbage()
+
+    def collect_garbage(self):
+        live = set()
+        for backup_id in self.list():
+            for entry in self.manifest(backup_id)["sections"].values():
+                if isinstance(entry, dict):
+                    live.update(digest for _, digest in entry.values())
+                else:
+                    live.add(entry)
+        removed = 0
+        if os.path.isdir(self._chunks):
+            for prefix in os.listdir(self._chunks):
+                folder = os.path.join(self._chunks, prefix)
+                for name in os.listdir(folder):
+                    if name not in live:
+                        os.remove(os.path.join(folder, name))
+                        removed += 1
+        return removed
+
+    # ---- automatic trigger ----
+    def request(self):
+        """Debounced: backs up once saves have been quiet for `delay` seconds."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = time_source.schedule_once(lambda dt: self._start(), self.delay)
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self._run(self.snapshot())
+
+    def snapshot(self):
+        """Detached copy of the store; taken on the UI thread, which owns the cache."""
+        return copy.deepcopy(self._source())
+
+    def _start(self):
+        self._timer = None
+        threading.Thread(target=self._run, args=(self.snapshot(),), name="backup", daemon=True).start()
+
+    def _run(self, data):
+        try:
+            if self.backup(data):
+                self.prune()
+        except Exception as e:
+            print(f"[BACKUP] Failed: {e}")
+
+
+# ✅ DIAGNOSTICS
+class Diagnostics:
     """
-    Safely writes app data to JSON. Updates cache and ensures atomic write.
+    Records live widgets by class, pending Clock events, property observer
+    counts and tracemalloc allocations at each screen transition, appending
+    one JSON line per sample to the report. Deltas against the previous
+    sample make leaks show up as steadily growing numbers.
     """
-    global _data_cache
 
+    def __init__(self, path=DIAGNOSTICS_FILE, top=10):
+        self.path = path
+        self.top = top
+        self._previous = None
+        self._widgets = Counter()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"event": "start", "time": time_source.now().strftime("%d-%m-%Y %H:%M:%S")}) + "\n")
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._previous = None
+
+    @staticmethod
+    def widget_counts():
+        widgets = Counter()
+        observers = 0
+        for obj in gc.get_objects():
+            if isinstance(obj, Widget):
+                widgets[type(obj).__name__] += 1
+                for name in obj.properties():
+                    observers += len(obj.get_property_observers(name))
+        return widgets, observers
+
+    @staticmethod
+    def clock_events():
+        get_events = getattr(Clock, "get_events", None)
+        return len(get_events()) if get_events else None
+
+    def note(self, event, **fields):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(dict(fields, event=event, time=time_source.now().strftime("%d-%m-%Y %H:%M:%S"))) + "\n")
+
+    def record(self, label):
+        gc.collect()
+        widgets, observers = self.widget_counts()
+        growth = {name: count - self._widgets.get(name, 0)
+                  for name, count in widgets.items() if count != self._widgets.get(name, 0)}
+        self._widgets = widgets
+
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        current, peak = tracemalloc.get_traced_memory()
+        top = [{"where": str(stat.traceback[0]), "kb": round(stat.size / 1024, 1), "count": stat.count}
+               for stat in snapshot.statistics("lineno")[:self.top]]
+        diff = []
+        if self._previous is not None:
+            diff = [{"where": str(stat.traceback[0]), "kb_diff": round(stat.size_diff / 1024, 1),
+                     "count_diff": stat.count_diff}
+                    for stat in snapshot.compare_to(self._previous, "lineno")[:self.top]]
+        self._previous = snapshot
+
+        sample = {
+            "event": "screen",
+            "screen": label,
+            "time": time_source.now().strftime("%d-%m-%Y %H:%M:%S"),
+            "widgets_total": sum(widgets.values()),
+            "widgets": dict(widgets.most_common()),
+            "widget_growth": growth,
+            "clock_events": self.clock_events(),
+            "property_observers": observers,
+            "traced_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "top_allocations": top,
+            "allocation_diff": diff,
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(sample, ensure_ascii=False) + "\n")
+        return sample
+
+
+# ✅ POWER
+ACTIVE_FPS = 60
+IDLE_FPS = 10           # frame cap once nobody has touched the app for a while
+SAVER_IDLE_FPS = 4      # battery saver / low-end devices
+IDLE_AFTER = 8          # seconds without input before capping
+LOW_END_MEMORY = 2 * 1024 ** 3  # bytes of RAM at or below which a device counts as low-end
+
+
+def set_frame_cap(fps):
+    """
+    Caps the Clock loop at `fps` iterations per second. Kivy only reads
+    graphics/maxfps at startup and offers no public setter, so this is the
+    one place that writes the Clock's private field; a Clock without it is
+    left uncapped rather than failing.
+    """
+    if hasattr(Clock, "_max_fps"):
+        Clock._max_fps = fps
+
+
+def is_low_end_device():
+    """
+    Android's own low-RAM flag, else total memory at or below LOW_END_MEMORY.
+    Core counts say little on phones, where eight slow cores are common.
+    Unknown (e.g. Windows) counts as not low-end; the battery saver setting
+    covers the rest.
+    """
+    if platform == "android":
+        try:
+            from jnius import autoclass
+            activity = autoclass("org.kivy.android.PythonActivity").mActivity
+            manager = activity.getSystemService(autoclass("android.content.Context").ACTIVITY_SERVICE)
+            if manager.isLowRamDevice():
+                return True
+        except Exception as e:
+            print(f"[POWER] Low-RAM check failed: {e}")
     try:
-        with _data_lock:
-            with open(DATA_FILE, "w", encoding="utf-8") as file:
-                json.dump(data, file, indent=4, ensure_ascii=False)
-                _data_cache = data
-    except Exception as e:
-        print(f"[ERROR] Failed to save data: {e}")
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") <= LOW_END_MEMORY
+    except (AttributeError, ValueError, OSError):
+        return False
 
 
+class PowerManager:
+    """
+    Caps the frame rate while the user is idle, lifts the cap on the next
+    input, and decides whether decorative animations run. Wakeups are
+    measured from Clock.frames, the number of times the Clock loop ran.
+    """
 
-# Custom Tab class
-class Tab(MDFloatLayout, MDTabsBase):
-    pass
+    def __init__(self, saver=False):
+        self.saver = saver or is_low_end_device()
+        self.idle = False
+        self.measurements = []
+        self._idle_event = None
 
-# Motivational quotes and tips
-MOTIVATIONAL_QUOTES = [
-    "The secret of getting ahead is getting started. - Mark Twain",
-    "You don't have to be great to start, but you have to start to be great. - Zig Ziglar",
-    "The expert in anything was once a beginner. - Helen Hayes",
-    "Success is the sum of small efforts, repeated day in and day out. - Robert Collier",
-    "The only way to learn mathematics is to do mathematics. - Paul Halmos"
-]
+    @property
+    def animations(self):
+        return not self.saver
+
+    @property
+    def idle_fps(self):
+        return SAVER_IDLE_FPS if self.saver else IDLE_FPS
+
+    def start(self):
+        self.set_idle(False)
+        Window.bind(on_touch_down=self.on_input, on_key_down=self.on_input, on_mouse_pos=self.on_input)
+        self._idle_event = Clock.create_trigger(lambda dt: self.set_idle(True), IDLE_AFTER)
+        self._idle_event()
+
+    def stop(self):
+        """Stops watching input and keeps the frame rate capped; start() lifts it again."""
+        Window.unbind(on_touch_down=self.on_input, on_key_down=self.on_input, on_mouse_pos=self.on_input)
+        if self._idle_event:
+            self._idle_event.cancel()
+        self._idle_event = None
+        self.set_idle(True)
+
+    def on_input(self, *args):
+        if self._idle_event is None:
+            return  # stopped
+        if self.idle:
+            self.set_idle(False)
+        self._idle_event.cancel()
+        self._idle_event()
+
+    def set_idle(self, idle):
+        self.idle = idle
+        set_frame_cap(self.idle_fps if idle else ACTIVE_FPS)
+
+    def measure_wakeups(self, label, seconds=60, done=None):
+        """Counts Clock loop iterations over `seconds` and reports them per minute."""
+        start = Clock.frames
+
+        def finish(dt):
+            result = {"state": label, "per_minute": round((Clock.frames - start) * 60 / seconds), "idle": self.idle}
+            self.measurements.append(result)
+            if done:
+                done(result)
+
+        return Clock.schedule_once(finish, seconds)
+
+
+# ✅ UNDO HISTORY
+UNDO_BUDGET = 512 * 1024  # approximate bytes of history kept
+
+
+Command = namedtuple("Command", "label undo redo cost")
+
+
+class UndoHistory:
+    """
+    Undo/redo as a log of inverse operations. A command keeps only the
+    records it changed, so each step costs O(change); the oldest commands
+    are dropped once their combined size exceeds the budget.
+    """
+
+    def __init__(self, budget=UNDO_BUDGET):
+        self.budget = budget
+        self.size = 0
+        self._undo = deque()
+        self._redo = []
+        self.replaying = False
+
+    @staticmethod
+    def cost(payload):
+        return 200 + len(json.dumps(payload, ensure_ascii=False, default=str))
+
+    def record(self, label, undo, redo, payload=None):
+        if self.replaying:
+            return
+        self._push(Command(label, undo, redo, self.cost(payload)))
+        self._redo.clear()
+
+    def _push(self, command):
+        self._undo.append(command)
+        self.size += command.cost
+        while self.size > self.budget and len(self._undo) > 1:
+            self.size -= self._undo.popleft().cost
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def top(self, redo=False):
+        """The command the next undo (or redo) would replay, or None."""
+        stack = self._redo if redo else self._undo
+        return stack[-1] if stack else None
+
+    def _replay(self, action):
+        self.replaying = True
+        try:
+            action()
+        finally:
+            self.replaying = False
+
+    def undo(self, command=None):
+        """Undoes the newest command; given `command`, only while that one is still the newest."""
+        if not self._undo or (command is not None and self._undo[-1] is not command):
+            return None
+        command = self._undo.pop()
+        self.size -= command.cost
+        self._replay(command.undo)
+        self._redo.append(command)
+        return command
+
+    def redo(self, command=None):
+        if not self._redo or (command is not None and self._redo[-1] is not command):
+            return None
+        command = self._redo.pop()
+        self._replay(command.redo)
+        self._push(command)
+        return command
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self.size = 0
+
+
+# ✅ CHANGE EVENTS
+TASK_ADDED = "task_added"
+TASK_UPDATED = "task_updated"
+TASK_REMOVED = "task_removed"
+SCHEDULE_ADDED = "schedule_added"
+SCHEDULE_REMOVED = "schedule_removed"
+SETTINGS_CHANGED = "settings_changed"
+PROFILE_CHANGED = "profile_changed"
+STREAK_CHANGED = "streak_changed"
+FOCUS_LOGGED = "focus_logged"
+REVIEWS_CHANGED = "reviews_changed"
+DATA_REPLACED = "data_replaced"
+
+# Slice of the store each change touches; None means every slice
+CHANGE_SLICES = {
+    TASK_ADDED: "tasks", TASK_UPDATED: "tasks", TASK_REMOVED: "tasks",
+    SCHEDULE_ADDED: "schedules", SCHEDULE_REMOVED: "schedules",
+    SETTINGS_CHANGED: "settings", PROFILE_CHANGED: "profile",
+    STREAK_CHANGED: "motivation", FOCUS_LOGGED: "focus",
+    REVIEWS_CHANGED: "reviews", DATA_REPLACED: None,
+}
+
+Change = namedtuple("Change", "kind slice payload")
+
+
+class ChangeBus:
+    """
+    Publish/subscribe for store changes. Subscribers name the slices they
+    render and only hear about changes to those.
+    """
+
+    def __init__(self):
+        self._subscribers = []
+
+    def subscribe(self, slices, callback):
+        entry = (frozenset(slices), callback)
+        self._subscribers.append(entry)
+        return entry
+
+    def unsubscribe(self, entry):
+        if entry in self._subscribers:
+            self._subscribers.remove(entry)
+
+    def publish(self, kind, **payload):
+        change = Change(kind, CHANGE_SLICES[kind], payload)
+        for slices, callback in list(self._subscribers):
+            if change.slice is None or change.slice in slices:
+                callback(change)
+
+
+store_events = ChangeBus()
 
-PRODUCTIVITY_TIPS = [
-    "Use the Pomodoro Technique: 25 minutes of focused work, then 5-minute break.",
-    "Prioritize your tasks using the Eisenhower Matrix (Urgent/Important).",
-    "Break large tasks into smaller, manageable chunks.",
-    "Review your notes within 24 hours to improve retention.",
-    "Get enough sleep - it's essential for memory consolidation."
-]
+
+# ✅ PROGRESSIVE BUILD
+class ProgressiveBuilder:
+    """
+    Materializes widgets from item specs a chunk per frame. The first
+    screenful is built immediately, the rest within a per-frame time budget
+    so screen transitions keep animating. Call cancel() when leaving.
+    """
+
+    def __init__(self, specs, factory, add, first_batch=8, budget=0.004, on_done=None):
+        self._specs = iter(specs)
+        self._factory = factory
+        self._add = add
+        self._first_batch = first_batch
+        self._budget = budget
+        self._on_done = on_done
+        self._event = None
+        self.done = False
+
+    def start(self):
+        for _ in range(self._first_batch):
+            if not self._build_next():
+                return self
+        self._event = Clock.schedule_interval(self._step, 0)
+        return self
+
+    def _build_next(self):
+        spec = next(self._specs, None)
+        if spec is None:
+            self._finish()
+            return False
+        self._add(self._factory(spec), spec)
+        return True
+
+    def _step(self, dt):
+        deadline = time.perf_counter() + self._budget
+        while time.perf_counter() < deadline:
+            if not self._build_next():
+                return False
+        return True
+
+    def _finish(self):
+        self.done = True
+        if self._event:
+            self._event.cancel()
+            self._event = None
+        if self._on_done:
+            self._on_done()
+
+    def cancel(self):
+        if self._event:
+            self._event.cancel()
+            self._event = None
+        self._specs = iter(())
+
+    def finish(self):
+        """Builds everything still pending right away."""
+        while self._build_next():
+            pass
 
 
 # Custom Widgets
 class CustomListItem(OneLineAvatarIconListItem):
     icon = StringProperty()
 
+
+class SubjectSuggestions(MDBoxLayout):
+    """Row of catalog subjects completing whatever is typed into a field."""
+    LIMIT = 3
+
+    def update(self, field):
+        self.clear_widgets()
+        if not field.focus or not field.text.strip():
+            return
+        for name in MDApp.get_running_app().get_subjects().complete(field.text, self.LIMIT):
+            if name != field.text:
+                self.add_widget(MDRectangleFlatButton(text=name, on_release=lambda x, n=name: self.pick(field, n)))
+
+    def pick(self, field, name):
+        field.text = name
+        self.clear_widgets()
+
+
+def make_subject_row(catalog, subject_id, totals):
+    """Colored subject name, its counts and a task progress bar."""
+    color = catalog.color(subject_id)
+    row = MDBoxLayout(orientation="vertical", adaptive_height=True, spacing=dp(4))
+    row.add_widget(MDLabel(
+        text=f"[color={color[1:]}][b]{catalog.name(subject_id)}[/b][/color]  "
+             f"{totals['sessions']} sessions • {format_hours(totals['minutes'])} • "
+             f"{totals['done']}/{totals['tasks']} tasks done",
+        markup=True, font_style="Caption", size_hint_y=None, height=dp(20)
+    ))
+    row.add_widget(MDProgressBar(value=totals["progress"], color=get_color_from_hex(color),
+                                 size_hint_y=None, height=dp(4)))
+    return row
+
 class ScheduleCard(MDCard):
     name = StringProperty()
     subject = StringProperty()
@@ -168,6 +3108,7 @@ class TaskCard(MDCard):
     status = StringProperty()
     task_data = ObjectProperty()
     icon = StringProperty()  # ✅ NEW property
+    selected = BooleanProperty(False)
 
     def on_status(self, instance, value):
         self.icon = self.get_status_icon()  # ✅ auto-update icon when status changes
@@ -184,6 +3125,144 @@ class TaskCard(MDCard):
 class StatusMenuItem(OneLineAvatarIconListItem):
     icon = StringProperty()
 
+def lttb(values, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling. Returns (indices, values)
+    keeping the visual shape of the series with `threshold` points.
+    """
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n), y
+
+    picked = np.zeros(threshold, dtype=np.int64)
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = (avg_start + avg_end - 1) / 2
+        avg_y = y[avg_start:avg_end].mean()
+
+        xs = np.arange(int(i * every) + 1, int((i + 1) * every) + 1)
+        area = np.abs((a - avg_x) * (y[xs] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = xs[int(area.argmax())]
+        picked[i + 1] = a
+    picked[-1] = n - 1
+    return picked, y[picked]
+
+
+class ChartWidget(Widget):
+    """
+    Bar, line or heatmap chart drawn with one Mesh/Line per series. The
+    "heatmap" mode lays weeks out as columns, "calendar" as rows like a month
+    view. New data only rewrites vertex buffers; no child widgets are created.
+    """
+    mode = StringProperty("bar")
+    color = ListProperty([0.25, 0.32, 0.71, 1])
+    HEAT_LEVELS = 5
+    BAR_MIN_PX = 3
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._values = np.zeros(0)
+        self._start_weekday = 0
+        self._peak = None
+        with self.canvas:
+            self._color = Color(*self.color)
+            self._mesh = Mesh(mode="triangles")
+            self._line = Line(width=1.2)
+            self._heat = []
+            for level in range(self.HEAT_LEVELS):
+                alpha = 0.12 + 0.88 * level / (self.HEAT_LEVELS - 1)
+                self._heat.append((Color(self.color[0], self.color[1], self.color[2], alpha), Mesh(mode="triangles")))
+        self.bind(pos=self.redraw, size=self.redraw, mode=self.redraw, color=self._update_colors)
+
+    def _update_colors(self, *args):
+        self._color.rgba = self.color
+        for level, (color, _) in enumerate(self._heat):
+            color.rgba = (self.color[0], self.color[1], self.color[2], 0.12 + 0.88 * level / (self.HEAT_LEVELS - 1))
+
+    def set_data(self, values, start_weekday=0, peak=None):
+        """`peak` fixes the value drawn at full intensity (default: the max)."""
+        self._values = np.asarray(values, dtype=float)
+        self._start_weekday = start_weekday
+        self._peak = peak
+        self.redraw()
+
+    @staticmethod
+    def _quads(x0, y0, x1, y1):
+        """Vertices/indices for axis aligned rectangles given as arrays."""
+        n = len(x0)
+        verts = np.zeros((n, 4, 4))
+        verts[:, 0, :2] = np.column_stack([x0, y0])
+        verts[:, 1, :2] = np.column_stack([x1, y0])
+        verts[:, 2, :2] = np.column_stack([x1, y1])
+        verts[:, 3, :2] = np.column_stack([x0, y1])
+        base = (np.arange(n) * 4)[:, None]
+        indices = (base + np.array([0, 1, 2, 2, 3, 0])).ravel()
+        return verts.ravel().tolist(), indices.tolist()
+
+    def _clear(self):
+        self._mesh.vertices, self._mesh.indices = [], []
+        self._line.points = []
+        for _, mesh in self._heat:
+            mesh.vertices, mesh.indices = [], []
+
+    def redraw(self, *args):
+        self._clear()
+        values = self._values
+        if not len(values) or self.width <= 1 or self.height <= 1:
+            return
+        if self.mode in ("heatmap", "calendar"):
+            self._draw_heatmap(values)
+            return
+
+        peak = values.max() or 1
+        if self.mode == "line":
+            idx, ys = lttb(values, max(3, int(self.width)))
+            xs = self.x + idx / max(len(values) - 1, 1) * self.width
+            ys = self.y + ys / peak * self.height
+            self._line.points = np.column_stack([xs, ys]).ravel().tolist()
+            return
+
+        # Bars: merge neighbouring values when there are more bars than pixels allow
+        buckets = max(1, min(len(values), int(self.width // self.BAR_MIN_PX)))
+        if buckets < len(values):
+            edges = np.linspace(0, len(values), buckets + 1).astype(np.int64)
+            values = np.maximum.reduceat(values, edges[:-1])
+            peak = values.max() or 1
+        step = self.width / len(values)
+        x0 = self.x + np.arange(len(values)) * step + step * 0.15
+        x1 = x0 + step * 0.7
+        y0 = np.full(len(values), float(self.y))
+        y1 = self.y + values / peak * self.height
+        self._mesh.vertices, self._mesh.indices = self._quads(x0, y0, x1, y1)
+
+    def _draw_heatmap(self, values):
+        cells = np.arange(len(values)) + self._start_weekday
+        if self.mode == "calendar":
+            weeks = cells.max() // 7 + 1
+            col, row = cells % 7, weeks - 1 - cells // 7
+            size = min(self.width / 7, self.height / weeks)
+            left = self.x + (self.width - 7 * size) / 2
+        else:
+            col, row = cells // 7, 6 - cells % 7
+            size = min(self.width / (col.max() + 1), self.height / 7)
+            left = self.x
+        gap = size * 0.15
+        peak = self._peak or values.max() or 1
+        levels = np.clip((values / peak * (self.HEAT_LEVELS - 1)).round().astype(int), 0, self.HEAT_LEVELS - 1)
+        for level, (_, mesh) in enumerate(self._heat):
+            sel = levels == level
+            if not sel.any():
+                continue
+            x0 = left + col[sel] * size
+            y0 = self.y + row[sel] * size
+            mesh.vertices, mesh.indices = self._quads(x0, y0, x0 + size - gap, y0 + size - gap)
+
+
 class StreakCard(MDCard):
     current_streak = NumericProperty(0)
 
@@ -199,17 +3278,164 @@ class QuoteTab(MDBoxLayout, MDTabsBase):
         super().__init__(**kwargs)
         self.text = "Motivation"  # ✅ Add this line
 
-class MainScreen(Screen):
-    app_name = StringProperty("Study Planner")
+class ReactiveScreen(Screen):
+    """
+    Screen that re-renders only when a store slice it shows has changed, or
+    when its render_key() (the day by default) moved on. Subclasses list
+    their `slices` and implement refresh_screen().
+    """
+    slices = ()
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.dirty = True
+        self.rendered_key = None
+        self._refresh_trigger = Clock.create_trigger(lambda dt: self.refresh_if_needed())
+        store_events.subscribe(self.slices, self.on_store_change)
+
+    def render_key(self):
+        return time_source.now().date()
 
+    def on_store_change(self, change):
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        self.dirty = True
+        # A visible screen catches up on the next frame, once per burst of changes
+        if self.manager and self.manager.current == self.name:
+            self._refresh_trigger()
+
+    def mark_clean(self):
+        """For screens that already patched their widgets in place."""
+        self.dirty = False
+        self._refresh_trigger.cancel()
 
-class ScheduleScreen(Screen):
     def on_pre_enter(self):
+        self.refresh_if_needed()
+
+    def refresh_if_needed(self):
+        """Re-renders when needed; returns True when it did."""
+        # Roll periodic tasks over first, so its TASK_UPDATED lands before the render, not inside it
+        MDApp.get_running_app().check_rollover()
+        key = self.render_key()
+        if self.dirty or key != self.rendered_key:
+            self.dirty = False
+            self.rendered_key = key
+            self.refresh_screen()
+            return True
+        return False
+
+
+class MainScreen(ReactiveScreen):
+    app_name = StringProperty("Study Planner")
+    AGENDA_LIMIT = 5
+    slices = ("tasks",)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def refresh_screen(self):
+        self.load_agenda()
+
+    def load_agenda(self):
+        app = MDApp.get_running_app()
+        agenda = self.ids.agenda_list
+        agenda.clear_widgets()
+
+        buckets = app.get_due_index().buckets(time_source.now().date().toordinal())
+        sections = (
+            ("overdue", "Overdue", "ff3333"),
+            ("today", "Due Today", "ff9800"),
+            ("upcoming", "This Week", "4CAF50"),
+        )
+        for key, title, color in sections:
+            tasks = buckets[key]
+            agenda.add_widget(MDLabel(
+                text=f"[color={color}][b]{title}[/b][/color]  ({len(tasks)})",
+                markup=True, font_style="Subtitle1", size_hint_y=None, height=dp(32)
+            ))
+            for task in tasks[:self.AGENDA_LIMIT]:
+                item = TwoLineListItem(text=task["name"], secondary_text=f"Due {task['due_date']} • {task.get('task_type', '')}")
+                item.bind(on_release=lambda x, t=task: app.show_task_dialog(t))
+                agenda.add_widget(item)
+            if len(tasks) > self.AGENDA_LIMIT:
+                agenda.add_widget(OneLineListItem(
+                    text=f"+ {len(tasks) - self.AGENDA_LIMIT} more",
+                    on_release=lambda x: setattr(self.manager, "current", "tasks_screen")
+                ))
+
+
+class ScheduleScreen(ReactiveScreen):
+    week_offset = NumericProperty(0)
+    subject_filter = None
+    SWIPE_DISTANCE = dp(60)
+    slices = ("schedules", "reviews", "tasks", "settings")
+    # Tasks and settings only move the month workload and the subject summary
+    PARTIAL_SLICES = ("tasks", "settings")
+    workload_stale = False
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._workload_trigger = Clock.create_trigger(lambda dt: self.refresh_workload())
+
+    def on_store_change(self, change):
+        if change.slice not in self.PARTIAL_SLICES:
+            self.mark_dirty()
+            return
+        self.workload_stale = True
+        if self.manager and self.manager.current == self.name:
+            self._workload_trigger()
+
+    def refresh_if_needed(self):
+        if super().refresh_if_needed():
+            return True
+        if self.workload_stale:
+            self.refresh_workload()
+        return False
+
+    def refresh_workload(self):
+        """Partial render for task and settings changes; the week and session cards stay."""
+        if not self.workload_stale:
+            return
+        app = MDApp.get_running_app()
+        selected_date = getattr(self, "selected_date", time_source.now().strftime("%d-%m-%Y"))
+        self.load_month_workload(datetime.strptime(selected_date, "%d-%m-%Y"), app)
+        app.show_subject_summary(self.ids.subject_summary, self.subject_filter)
+
+    def render_key(self):
+        # Done markers depend on the clock: re-render once another session started
+        now = time_source.now()
+        day = MDApp.get_running_app().get_schedule_index().day(now.strftime("%d-%m-%Y"))
+        return now.date(), day.count_started(now.hour * 60 + now.minute) if day else 0
+
+    def refresh_screen(self):
+        self.load_schedules()
+
+    def week_monday(self):
+        today = time_source.now().date()
+        return today.toordinal() - today.weekday() + 7 * self.week_offset
+
+    def change_week(self, step):
+        self.week_offset += step
+        monday = datetime.fromordinal(self.week_monday())
+        today = time_source.now()
+        # Land on today when coming back to the current week, otherwise on Monday
+        target = today if self.week_offset == 0 else monday
+        self.selected_date = target.strftime("%d-%m-%Y")
+        self.ids.schedule_label.text = (
+            "Today's Schedule" if target.date() == today.date()
+            else f"Schedule of {target.strftime('%B %d, %Y, %A')}"
+        )
         self.load_schedules()
 
+    def on_touch_up(self, touch):
+        # ✅ Horizontal swipe on the week card pages between weeks
+        card = self.ids.week_card
+        if card.collide_point(*touch.opos) and abs(touch.x - touch.ox) > self.SWIPE_DISTANCE \
+                and abs(touch.x - touch.ox) > 2 * abs(touch.y - touch.oy):
+            self.change_week(-1 if touch.x > touch.ox else 1)
+            return True
+        return super().on_touch_up(touch)
 
     def load_schedules(self):
         app = MDApp.get_running_app()
@@ -218,35 +3444,60 @@ class ScheduleScreen(Screen):
         self.ids.week_strip.clear_widgets()
 
         # Reset scroll to top
-        self.ids.schedule_scroll.scroll_y = 1
         Animation.cancel_all(self.ids.schedule_scroll, 'scroll_y')
-        Animation(scroll_y=1, duration=0.2, t='out_quad').start(self.ids.schedule_scroll)
+        if app.power.animations and self.ids.schedule_scroll.scroll_y < 1:
+            Animation(scroll_y=1, duration=0.2, t='out_quad').start(self.ids.schedule_scroll)
+        else:
+            self.ids.schedule_scroll.scroll_y = 1
 
-        selected_date = getattr(self, "selected_date", datetime.now().strftime("%d-%m-%Y"))
-        schedules = [s for s in app.get_all_schedules() if s.get("date") == selected_date]
+        selected_date = getattr(self, "selected_date", time_source.now().strftime("%d-%m-%Y"))
 
-        today = datetime.now()
-        start_of_week = today - timedelta(days=today.weekday())
-        end_of_week = start_of_week + timedelta(days=6)
+        today = time_source.now()
+        monday = self.week_monday()
+        week = app.get_week_model(monday)
+        start_of_week, end_of_week = week[0]["date_obj"], week[-1]["date_obj"]
 
+        self.ids.week_title.text = (
+            "This Week" if self.week_offset == 0 else
+            "Next Week" if self.week_offset == 1 else
+            "Last Week" if self.week_offset == -1 else
+            f"{abs(self.week_offset)} Weeks {'Ahead' if self.week_offset > 0 else 'Ago'}"
+        )
         self.ids.week_range.text = f"{start_of_week.strftime('%B %d')} – {end_of_week.strftime('%d, %Y')}"
 
         # Build the week strip
-        for i in range(7):
-            date_obj = start_of_week + timedelta(days=i)
-            date_str = date_obj.strftime('%d-%m-%Y')
-
-            box = self.build_day_box(date_obj, selected_date, today, app)
-            Clock.schedule_once(lambda dt, b=box, d=date_obj: b.bind(on_touch_down=lambda w, t: self.build_day_box(date_obj, selected_date, today, app)), 0.05)
-            box.bind(on_touch_up=lambda widget, touch, d=date_obj: self.on_day_click(widget, touch, d))
+        for day in week:
+            box = self.build_day_box(day, selected_date, today, app)
+            box.bind(on_touch_up=lambda widget, touch, d=day["date_obj"]: self.on_day_click(widget, touch, d))
             self.ids.week_strip.add_widget(box)
 
-        now = datetime.now()
+        # ✅ Warm the neighbouring weeks in the background
+        app.week_cache.prefetch([monday - 7, monday + 7])
 
-        # Sort and display today's schedule only
-        schedules.sort(key=lambda s: datetime.strptime(s["time"], "%H:%M"))
-        
-        for schedule in schedules:
+        self.load_month_workload(datetime.strptime(selected_date, "%d-%m-%Y"), app)
+
+        now = time_source.now()
+
+        # Sessions of the selected day, already sorted by start
+        selected = next((d for d in week if d["date"] == selected_date), None)
+        if selected is not None:
+            schedules = selected["sessions"]
+        else:
+            day_index = app.get_schedule_index().day(selected_date)
+            schedules = list(day_index.items) if day_index else []
+
+        # ✅ Today's list leads with the reviews that are due
+        if selected_date == today.strftime("%d-%m-%Y"):
+            schedules = app.get_due_reviews() + schedules
+
+        if self.subject_filter is not None:
+            stats = app.get_subject_stats()
+            schedules = [s for s in schedules if stats.subject_id(s) == self.subject_filter]
+        app.show_subject_summary(self.ids.subject_summary, self.subject_filter)
+
+        def make_card(schedule):
+            if schedule.get("review"):
+                return self.make_review_card(schedule, app)
             try:
                 schedule_datetime = datetime.strptime(
                     f"{schedule['date']} {schedule['time']}", "%d-%m-%Y %H:%M"
@@ -265,31 +3516,82 @@ class ScheduleScreen(Screen):
                 is_done=is_done  # Set completion status for each schedule individually
             )
             item.bind(on_release=lambda x, s=schedule: app.show_schedule_dialog(s))
-            self.ids.schedule_list.add_widget(item)
+            return item
+
+        self.cancel_build()
+        self.builder = ProgressiveBuilder(
+            schedules, make_card, lambda item, schedule: self.ids.schedule_list.add_widget(item)
+        ).start()
+
+    def open_subject_filter(self, caller):
+        MDApp.get_running_app().open_subject_menu(caller, self.set_subject_filter)
+
+    def set_subject_filter(self, subject_id):
+        self.subject_filter = subject_id
+        self.load_schedules()
+
+    def load_month_workload(self, day, app):
+        self.workload_stale = False
+        first = day.replace(day=1)
+        last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        daily_capacity, _ = app.get_capacity()
+        loads = app.get_workload().daily(first.toordinal(), last.toordinal())
+
+        self.ids.month_title.text = f"Workload • {first.strftime('%B %Y')}"
+        self.ids.month_heatmap.set_data(loads, first.weekday(), peak=daily_capacity)
+
+        over = int((loads > daily_capacity).sum())
+        if not loads.any():
+            self.ids.month_load.text = "Nothing planned this month"
+            return
+        busiest = first + timedelta(days=int(loads.argmax()))
+        self.ids.month_load.text = (
+            f"{over} day{'s' if over != 1 else ''} over capacity • "
+            f"busiest {busiest.strftime('%b %d')} ({format_hours(loads.max())})"
+        )
+
+    def make_review_card(self, review, app):
+        item = ScheduleCard(
+            name=f"Review: {review['subject']}",
+            subject=review['subject'],
+            time=datetime.fromtimestamp(review['due']).strftime("%H:%M"),
+            description=f"From {review['source']}",
+            has_notification=True,
+            schedule_data=review,
+            is_done=False
+        )
+        item.bind(on_release=lambda x: app.show_review_dialog(review))
+        return item
+
+    def cancel_build(self):
+        builder = getattr(self, "builder", None)
+        if builder:
+            builder.cancel()
+        self.builder = None
 
+    def on_leave(self):
+        self.cancel_build()
 
-    def build_day_box(self, date_obj, selected_date, today, app):
-        date_str = date_obj.strftime('%d-%m-%Y')
+
+    def build_day_box(self, day, selected_date, today, app):
+        date_obj, date_str = day["date_obj"], day["date"]
         day_label = date_obj.strftime('%a')
         day_number = date_obj.day
 
         box = MDBoxLayout(orientation="vertical", size_hint_x=None, width=dp(48), spacing="2dp")
         box.radius = [10, 10, 10, 10]
 
-        all_schedules = load_data(use_cache=True).get("schedules", [])
-        daily_schedules = [s for s in all_schedules if s.get("date") == date_str]
-        total = len(daily_schedules)
-        done = 0
+        total = len(day["sessions"])
+        has_conflict = day["conflict"]
 
-        now = datetime.now()
-        for s in daily_schedules:
-            try:
-                t = datetime.strptime(s["time"], "%H:%M").time()
-                full_dt = datetime.combine(date_obj.date(), t)
-                if full_dt < now:
-                    done += 1
-            except:
-                continue
+        # ✅ Started sessions come from a bisect on the sorted start times
+        today_date = today.date()
+        if not total or date_obj.date() > today_date:
+            done = 0
+        elif date_obj.date() < today_date:
+            done = total
+        else:
+            done = bisect.bisect_left(day["starts"], today.hour * 60 + today.minute + 1)
 
         progress = int((done / total) * 100) if total else 0
         label_text = f"{done}/{total}" if total else "0/0"
@@ -306,6 +3608,12 @@ class ScheduleScreen(Screen):
         else:
             box.md_bg_color = (240 / 255, 250 / 255, 1, 1)
 
+        # ✅ Flag double-booked days
+        if has_conflict:
+            box.line_color = (239 / 255, 68 / 255, 68 / 255, 1)
+            box.line_width = dp(1.2)
+            label_text = f"! {label_text}"
+
         # ✅ Add elements to box
         box.add_widget(MDLabel(text=day_label, halign="center", font_style="Caption",
                                theme_text_color="Custom", text_color=(1, 1, 1, 1) if date_obj.date() == today.date() else (0, 0, 0, 1)))
@@ -319,19 +3627,19 @@ class ScheduleScreen(Screen):
 
 
     def on_day_click(self, widget, touch, date_obj):
-        if widget.collide_point(*touch.pos):
+        if widget.collide_point(*touch.pos) and abs(touch.x - touch.ox) < self.SWIPE_DISTANCE:
             date_str = date_obj.strftime('%d-%m-%Y')
             if getattr(self, "selected_date", "") == date_str:
                 return  # Avoid reloading if same date tapped again
 
             self.selected_date = date_str
             self.ids.schedule_label.text = (
-                "Today's Schedule" if date_obj.date() == datetime.now().date()
+                "Today's Schedule" if date_obj.date() == time_source.now().date()
                 else f"Schedule of {date_obj.strftime('%B %d, %Y, %A')}"
             )
 
             # 🟡 Defer actual loading to avoid UI freeze
-            Clock.schedule_once(lambda dt: self.load_schedules(), 0.05)
+            time_source.schedule_once(lambda dt: self.load_schedules(), 0.05)
 
 
 
@@ -343,14 +3651,52 @@ class ScheduleScreen(Screen):
         self.manager.current = "add_schedule_screen"
         self.manager.transition.direction = "left"
 
+    def auto_plan(self):
+        app = MDApp.get_running_app()
+        sessions = app.propose_study_plan()
+
+        if not sessions:
+            dialog = MDDialog(
+                title="Auto Plan",
+                text="Nothing to plan. Add open tasks with a due date and an estimated effort.",
+                buttons=[MDRaisedButton(text="OK", on_release=lambda x: dialog.dismiss())]
+            )
+            dialog.open()
+            return
+
+        total_hours = sum(s["duration"] for s in sessions) / 60
+        preview = "\n".join(f"{s['date']} {s['time']} ({s['duration']} min) - {s['task']}" for s in sessions[:8])
+        if len(sessions) > 8:
+            preview += f"\n... and {len(sessions) - 8} more"
+
+        dialog = MDDialog(
+            title=f"{len(sessions)} sessions ({total_hours:.1f} h)",
+            text=preview,
+            buttons=[
+                MDFlatButton(text="CANCEL", on_release=lambda x: dialog.dismiss()),
+                MDRaisedButton(text="ACCEPT", on_release=lambda x: self.accept_plan(sessions, dialog))
+            ]
+        )
+        dialog.open()
+
+    def accept_plan(self, sessions, dialog):
+        MDApp.get_running_app().add_schedules(sessions)
+        dialog.dismiss()
+
     def set_selected_date(self, date_obj):
         self.selected_date = date_obj.strftime("%d-%m-%Y")
         self.load_schedules()
 
 
-class TasksScreen(Screen):
-    def on_pre_enter(self):
-        self.refresh_screen()
+class TasksScreen(ReactiveScreen):
+    selection_mode = BooleanProperty(False)
+    slices = ("tasks",)
+    subject_filter = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.selected = set()
+        self.cards = {}
 
     def refresh_screen(self):
         self.load_tasks()
@@ -358,13 +3704,18 @@ class TasksScreen(Screen):
     def load_tasks(self):
         app = MDApp.get_running_app()
 
+        self.cancel_build()
         self.ids.daily_tasks.clear_widgets()
         self.ids.weekly_tasks.clear_widgets()
         self.ids.monthly_tasks.clear_widgets()
+        self.cards = {}
 
         tasks = app.get_all_tasks()
+        if self.subject_filter is not None:
+            tasks = app.get_subject_stats().tasks_of(self.subject_filter)
+        app.show_subject_summary(self.ids.subject_summary, self.subject_filter)
 
-        for task in tasks:
+        def make_card(task):
             item = TaskCard(
                 name=task['name'],
                 due_date=task['due_date'],
@@ -373,31 +3724,28 @@ class TasksScreen(Screen):
                 status=task['status'],
                 task_data=task,
                 icon=self.get_icon_for_status(task['status']),
+                selected=task['name'] in self.selected,
             )
-            item.bind(on_release=lambda x, t=task: app.show_task_dialog(t))
+            item.bind(on_release=lambda x, t=task: self.on_card_release(x, t))
+            self.cards.setdefault(task['name'], []).append(item)
+            return item
 
-            self.add_task_to_section(item, task['task_type'])
+        self.builder = ProgressiveBuilder(
+            list(tasks), make_card, lambda item, task: self.add_task_to_section(item, task['task_type']),
+            first_batch=6
+        ).start()
 
     def update_task_lists(self):
-        self.ids.daily_tasks.clear_widgets()
-        self.ids.weekly_tasks.clear_widgets()
-        self.ids.monthly_tasks.clear_widgets()
+        self.load_tasks()
 
-        app = MDApp.get_running_app()
-        tasks = app.get_all_tasks()
+    def cancel_build(self):
+        builder = getattr(self, "builder", None)
+        if builder:
+            builder.cancel()
+        self.builder = None
 
-        for task in tasks:
-            item = TaskCard(
-                name=task['name'],
-                due_date=task['due_date'],
-                description=task['description'],
-                task_type=task['task_type'],
-                status=task['status'],
-                task_data=task,
-                icon=self.get_icon_for_status(task['status']),
-            )
-            item.bind(on_release=lambda x, t=task: app.show_task_dialog(t))
-            self.add_task_to_section(item, task['task_type'])
+    def on_leave(self):
+        self.cancel_build()
 
     def add_task_to_section(self, item, task_type):
         if task_type == "Daily":
@@ -408,7 +3756,115 @@ class TasksScreen(Screen):
             self.ids.monthly_tasks.add_widget(item)
 
     def on_tab_switch(self, instance_tabs, instance_tab, instance_tab_label, tab_text):
-        self.update_task_lists()
+        self.refresh_if_needed()
+
+    def open_subject_filter(self, caller):
+        MDApp.get_running_app().open_subject_menu(caller, self.set_subject_filter)
+
+    def set_subject_filter(self, subject_id):
+        self.subject_filter = subject_id
+        self.load_tasks()
+
+    # ---------------- Multi-select ----------------
+    def on_card_release(self, card, task):
+        if not self.selection_mode:
+            MDApp.get_running_app().show_task_dialog(task)
+            return
+        name = task['name']
+        if name in self.selected:
+            self.selected.discard(name)
+        else:
+            self.selected.add(name)
+        for item in self.cards.get(name, []):
+            item.selected = name in self.selected
+        self.update_toolbar()
+
+    def toggle_selection_mode(self):
+        self.selection_mode = not self.selection_mode
+        if not self.selection_mode:
+            for name in self.selected:
+                for item in self.cards.get(name, []):
+                    item.selected = False
+            self.selected.clear()
+        self.update_toolbar()
+
+    def update_toolbar(self):
+        toolbar = self.ids.toolbar
+        if self.selection_mode:
+            toolbar.title = f"{len(self.selected)} selected"
+            toolbar.left_action_items = [["close", lambda x: self.toggle_selection_mode()]]
+            toolbar.right_action_items = [["dots-vertical", lambda x: self.show_bulk_menu(x)]]
+        else:
+            toolbar.title = "My Tasks"
+            toolbar.left_action_items = [["arrow-left", lambda x: self.go_back()]]
+            toolbar.right_action_items = [
+                ["filter-variant", lambda x: self.open_subject_filter(x)],
+                ["undo-variant", lambda x: MDApp.get_running_app().undo()],
+                ["checkbox-multiple-marked-outline", lambda x: self.toggle_selection_mode()],
+                ["plus", lambda x: self.add_task()],
+            ]
+
+    def show_bulk_menu(self, caller):
+        actions = [
+            ("Mark Done", "check-circle", {"status": "Done"}),
+            ("Mark In Progress", "progress-check", {"status": "In Progress"}),
+            ("Mark Pending", "clock", {"status": "Pending"}),
+            ("Move to Daily", "calendar-today", {"task_type": "Daily"}),
+            ("Move to Weekly", "calendar-week", {"task_type": "Weekly"}),
+            ("Move to Monthly", "calendar-month", {"task_type": "Monthly"}),
+        ]
+        items = [{
+            "text": text,
+            "viewclass": "CustomListItem",
+            "icon": icon,
+            "height": dp(56),
+            "on_release": lambda u=updates: self.apply_bulk(u)
+        } for text, icon, updates in actions]
+        items.append({
+            "text": "Delete",
+            "viewclass": "CustomListItem",
+            "icon": "delete",
+            "height": dp(56),
+            "on_release": lambda: self.apply_bulk(None, delete=True)
+        })
+
+        self.bulk_menu = MDDropdownMenu(caller=caller, items=items, width_mult=4)
+        self.bulk_menu.open()
+
+    def apply_bulk(self, updates, delete=False):
+        self.bulk_menu.dismiss()
+        if not self.selected:
+            return
+        builder = getattr(self, "builder", None)
+        if builder:
+            builder.finish()  # every selected task needs its card before the patching below
+        app = MDApp.get_running_app()
+        affected = app.apply_task_batch(self.selected, updates, delete=delete)
+        if delete and affected:
+            app.show_undo_snackbar(f"Deleted {len(affected)} task{'s' if len(affected) > 1 else ''}")
+
+        # ✅ Patch only the affected cards instead of rebuilding every list
+        for task in affected:
+            name = task['name']
+            for item in self.cards.pop(name, []) if delete else self.cards.get(name, []):
+                if delete:
+                    if item.parent:
+                        item.parent.remove_widget(item)
+                    continue
+                old_type = item.task_type
+                item.task_data = task
+                item.status = task['status']
+                item.icon = self.get_icon_for_status(task['status'])
+                item.task_type = task['task_type']
+                item.selected = False
+                if task['task_type'] != old_type and item.parent:
+                    item.parent.remove_widget(item)
+                    self.add_task_to_section(item, task['task_type'])
+
+        self.selected.clear()
+        self.selection_mode = False
+        self.update_toolbar()
+        self.mark_clean()
 
     def get_icon_for_status(self, status):
         if status == 'Done':
@@ -436,17 +3892,18 @@ class AddScheduleScreen(Screen):
         self.ids.schedule_subject.text = ""
         self.ids.schedule_desc.text = ""
         self.ids.schedule_time.text = ""
+        self.ids.schedule_duration.text = ""
         self.ids.schedule_day.text = ""
         self.ids.notification_toggle.active = True
         self.week_dates = self.get_week_dates()
 
     def get_week_dates(self):
-        today = datetime.now()
-        start_of_week = today - timedelta(days=today.weekday())
-        return [(start_of_week + timedelta(days=i)).strftime("%d-%m-%Y") for i in range(7)]
+        # ✅ Follow the week currently shown on the schedule screen
+        monday = self.manager.get_screen("schedule_screen").week_monday()
+        return [datetime.fromordinal(monday + i).strftime("%d-%m-%Y") for i in range(7)]
 
     def show_day_menu(self):
-        today = datetime.now().date()
+        today = time_source.now().date()
         items = []
 
         for date_str in self.week_dates:
@@ -468,10 +3925,11 @@ class AddScheduleScreen(Screen):
             })
 
         if not items:
+            # A past week has no bookable days left, so offer today instead
             items.append({
-                "text": "Today",
+                "text": f"Today ({today.strftime('%A')})",
                 "viewclass": "OneLineListItem",
-                "on_release": lambda x=self.week_dates[0]: self.set_day(x)
+                "on_release": lambda x=today.strftime("%d-%m-%Y"): self.set_day(x)
             })
 
         self.day_menu = MDDropdownMenu(
@@ -486,7 +3944,7 @@ class AddScheduleScreen(Screen):
 
     def set_day(self, date_str):
         date_obj = datetime.strptime(date_str, "%d-%m-%Y").date()
-        today = datetime.now().date()
+        today = time_source.now().date()
 
         display_text = (
             "Today" if date_obj == today else
@@ -511,6 +3969,7 @@ class AddScheduleScreen(Screen):
         subject = self.ids.schedule_subject.text
         desc = self.ids.schedule_desc.text
         time = self.ids.schedule_time.text
+        duration = self.ids.schedule_duration.text.strip()
         notification = self.ids.notification_toggle.active
 
         if not name or not subject or not time or not hasattr(self, 'selected_date'):
@@ -521,44 +3980,63 @@ class AddScheduleScreen(Screen):
             self.show_error_dialog("Description cannot exceed 150 characters")
             return
 
+        try:
+            duration = int(duration) if duration else DEFAULT_SESSION_MINUTES
+        except ValueError:
+            duration = 0
+        if duration <= 0 or duration > 24 * 60:
+            self.show_error_dialog("Duration must be between 1 and 1440 minutes")
+            return
+
         app = MDApp.get_running_app()
         schedule = {
             "name": name,
-            "subject": subject,
+            "subject": normalize_subject(subject),
             "description": desc,
             "time": time,
+            "duration": duration,
             "notification": notification,
             "date": self.selected_date
         }
-        app.add_schedule(schedule)
 
-        if notification:
-            self.schedule_notification(name, time, self.selected_date)
+        overlaps = app.get_schedule_index().overlaps(self.selected_date, time, duration)
+        if overlaps:
+            self.show_conflict_dialog(schedule, overlaps)
+            return
+
+        self.check_workload(schedule)
+
+    def show_conflict_dialog(self, schedule, overlaps):
+        lines = []
+        for s in overlaps[:5]:
+            start, end = ScheduleIndex.span(s)
+            lines.append(f"{s['name']} ({from_minutes(start)}-{from_minutes(end % DAY_MINUTES)})")
+
+        dialog = MDDialog(
+            title="[color=ff9800]Time Conflict[/color]",
+            text="This overlaps with:\n" + "\n".join(lines),
+            buttons=[
+                MDFlatButton(text="CANCEL", on_release=lambda x: dialog.dismiss()),
+                MDRaisedButton(text="SAVE ANYWAY", on_release=lambda x: (dialog.dismiss(), self.check_workload(schedule)))
+            ]
+        )
+        dialog.open()
+
+    def check_workload(self, schedule):
+        app = MDApp.get_running_app()
+        warnings = app.workload_warnings(schedule["date"], schedule["duration"])
+        if warnings:
+            app.show_workload_dialog(warnings, lambda: self.commit_schedule(schedule))
+            return
+        self.commit_schedule(schedule)
+
+    def commit_schedule(self, schedule):
+        # ✅ The app arms the reminder for us
+        MDApp.get_running_app().add_schedule(schedule)
 
         self.show_success_dialog("Schedule added successfully!")
         self.go_back()
 
-    def schedule_notification(self, name, time_str, date_str):
-        try:
-            notify_time = datetime.combine(
-                datetime.strptime(date_str, "%d-%m-%Y").date(),
-                datetime.strptime(time_str, "%H:%M").time()
-            )
-            now = datetime.now()
-            if notify_time < now:
-                return
-            seconds = (notify_time - now).total_seconds()
-            Clock.schedule_once(lambda dt: self.send_notification(name), seconds)
-        except Exception as e:
-            print(f"Error scheduling notification: {e}")
-
-    def send_notification(self, name):
-        notification.notify(
-            title="Study Planner Reminder",
-            message=f"It's time for: {name}",
-            app_name="Study Planner"
-        )
-
     def show_error_dialog(self, text):
         dialog = MDDialog(
             title="[color=ff3333]Error[/color]",
@@ -598,9 +4076,13 @@ class AddTaskScreen(Screen):
     def refresh_screen(self):
         self.ids.task_name.text = ""
         self.ids.task_desc.text = ""
+        self.ids.task_subject.text = ""
         self.ids.task_date.text = ""
         self.ids.task_type.text = ""
         self.ids.task_status.text = ""
+        self.ids.task_effort.text = ""
+        self.ids.task_priority.text = ""
+        self.ids.task_repeat.active = False
 
     def show_date_picker(self):
         picker = MDDatePicker()
@@ -661,26 +4143,69 @@ class AddTaskScreen(Screen):
         self.ids.task_status.text = text
         self.status_menu.dismiss()
 
+    def show_priority_menu(self):
+        items = [{
+            "text": p,
+            "viewclass": "CustomListItem",
+            "icon": "flag",
+            "height": dp(56),
+            "on_release": lambda x=p: self.set_priority(x)
+        } for p in PRIORITY_RANK]
+
+        self.priority_menu = MDDropdownMenu(
+            caller=self.ids.task_priority,
+            items=items,
+            position="bottom",
+            width_mult=4
+        )
+        self.priority_menu.open()
+
+    def set_priority(self, text):
+        self.ids.task_priority.text = text
+        self.priority_menu.dismiss()
+
     def save_task(self):
         name = self.ids.task_name.text
         desc = self.ids.task_desc.text
         due_date = self.ids.task_date.text
         task_type = self.ids.task_type.text
         status = self.ids.task_status.text
+        effort = self.ids.task_effort.text.strip()
+        priority = self.ids.task_priority.text or "Medium"
+        subject = normalize_subject(self.ids.task_subject.text)
 
         if not name or not desc or not due_date or not task_type or not status:
             self.show_error_dialog("Please fill all required fields")
             return
 
+        try:
+            effort = float(effort) if effort else 1.0
+        except ValueError:
+            self.show_error_dialog("Estimated effort must be a number of hours")
+            return
+
         app = MDApp.get_running_app()
         task = {
             "name": name,
             "description": desc,
             "due_date": due_date,
             "task_type": task_type,
-            "status": status
+            "status": status,
+            "effort": effort,
+            "priority": priority,
+            "subject": subject,
+            "repeat": self.ids.task_repeat.active
         }
-        app.add_task(task)
+
+        warnings = [] if status == "Done" else app.workload_warnings(due_date, task_minutes(task))
+        if warnings:
+            app.show_workload_dialog(warnings, lambda: self.commit_task(task))
+            return
+
+        self.commit_task(task)
+
+    def commit_task(self, task):
+        MDApp.get_running_app().add_task(task)
 
         # Reset inputs
         self.refresh_screen()
@@ -720,21 +4245,19 @@ class AddTaskScreen(Screen):
         self.manager.transition.direction = "right"
 
 
-class ProfileScreen(Screen):
+class ProfileScreen(ReactiveScreen):
     profile_name = StringProperty("")
     profile_title = StringProperty("")
     avatar_path = StringProperty("data/logo/kivy-icon-256.png")
+    slices = ("profile", "settings", "tasks", "focus", "motivation")
 
     def __init__(self, **kw):
         super().__init__(**kw)
         self.load_profile_data()
 
-    def on_pre_enter(self):
-        self.refresh_screen()
-
     def refresh_screen(self):
         app = MDApp.get_running_app()
-        data = load_data()
+        data = load_data(use_cache=True)
 
         profile = data.get("profile", {})
         self.profile_name = profile.get("name", "")
@@ -755,12 +4278,12 @@ class ProfileScreen(Screen):
         if self.ids.get("study_hours_label"):
             self.ids.study_hours_label.text = f"{study_hours:.1f}"
 
-        app.check_streak()
+        # The streak is kept current by the app on start and day change; rendering only reads it
         if self.ids.get("streak_label"):
             self.ids.streak_label.text = f"{app.current_streak} days"
 
     def load_profile_data(self):
-        profile = load_data().get("profile", {})
+        profile = load_section("profile", {})
         self.profile_name = profile.get("name", "")
         self.profile_title = profile.get("title", "")
         self.avatar_path = profile.get("avatar_path", "data/logo/kivy-icon-256.png")
@@ -776,6 +4299,8 @@ class ProfileScreen(Screen):
             data = load_data()
             data.setdefault("profile", {})["avatar_path"] = selected_path
             save_data(data)
+            store_events.publish(PROFILE_CHANGED)
+            self.mark_clean()  # the bound avatar already shows the new image
 
             app = MDApp.get_running_app()
             app.avatar_path = selected_path
@@ -828,10 +4353,130 @@ class ProfileScreen(Screen):
             "avatar_path": self.avatar_path
         }
         save_data(data)
+        store_events.publish(PROFILE_CHANGED)
+        self.mark_clean()
 
         self.edit_dialog.dismiss()
         self.show_success_dialog("Profile updated successfully!")
 
+    def export_data(self):
+        try:
+            path = export_json()
+        except Exception as e:
+            self.show_error_dialog(f"Export failed: {e}")
+            return
+        self.show_success_dialog(f"Data exported to {path}")
+
+    def open_profiles(self):
+        app = MDApp.get_running_app()
+        items = MDList()
+        for profile_id, info in app.profiles.profiles.items():
+            text = info.get("name") or profile_id
+            if profile_id == active_profile():
+                text = f"[b]{text}[/b]  (active)"
+            item = OneLineListItem(text=text)
+            item.bind(on_release=lambda x, p=profile_id: self.select_profile(p))
+            items.add_widget(item)
+
+        scroll = ScrollView(size_hint_y=None, height=dp(240))
+        scroll.add_widget(items)
+
+        self.profiles_dialog = MDDialog(
+            title="Profiles",
+            type="custom",
+            content_cls=scroll,
+            buttons=[
+                MDFlatButton(text="CLOSE", on_release=lambda x: self.profiles_dialog.dismiss()),
+                MDRaisedButton(text="NEW PROFILE", on_release=lambda x: self.new_profile_dialog())
+            ]
+        )
+        self.profiles_dialog.open()
+
+    def select_profile(self, profile_id):
+        self.profiles_dialog.dismiss()
+        MDApp.get_running_app().switch_profile(profile_id)
+
+    def new_profile_dialog(self):
+        self.profiles_dialog.dismiss()
+        name_field = MDTextField(hint_text="Profile name", mode="fill")
+        dialog = MDDialog(
+            title="New Profile",
+            type="custom",
+            content_cls=name_field,
+            buttons=[
+                MDFlatButton(text="CANCEL", on_release=lambda x: dialog.dismiss()),
+                MDRaisedButton(text="CREATE", on_release=lambda x: self.create_profile(name_field.text.strip(), dialog))
+            ]
+        )
+        dialog.open()
+
+    def create_profile(self, name, dialog):
+        if not name:
+            self.show_error_dialog("Please enter a profile name")
+            return
+        dialog.dismiss()
+        MDApp.get_running_app().create_profile(name)
+
+    def open_backups(self):
+        app = MDApp.get_running_app()
+        backups = app.backups.list()
+
+        items = MDList()
+        for backup_id in backups:
+            created = datetime.strptime(backup_id, "%Y%m%d-%H%M%S-%f")
+            item = OneLineListItem(text=created.strftime("%b %d, %Y  %H:%M:%S"))
+            item.bind(on_release=lambda x, b=backup_id, c=created: self.confirm_restore(b, c))
+            items.add_widget(item)
+        if not backups:
+            items.add_widget(OneLineListItem(text="No backups yet"))
+
+        scroll = ScrollView(size_hint_y=None, height=dp(300))
+        scroll.add_widget(items)
+
+        self.backups_dialog = MDDialog(
+            title="Backups",
+            type="custom",
+            content_cls=scroll,
+            buttons=[
+                MDFlatButton(text="CLOSE", on_release=lambda x: self.backups_dialog.dismiss()),
+                MDRaisedButton(text="BACK UP NOW", on_release=lambda x: self.backup_now())
+            ]
+        )
+        self.backups_dialog.open()
+
+    def backup_now(self):
+        app = MDApp.get_running_app()
+        self.backups_dialog.dismiss()
+        try:
+            backup_id = app.backups.backup()
+            app.backups.prune()
+        except Exception as e:
+            self.show_error_dialog(f"Backup failed: {e}")
+            return
+        self.show_success_dialog("Backup created." if backup_id else "Nothing changed since the last backup.")
+
+    def confirm_restore(self, backup_id, created):
+        dialog = MDDialog(
+            title="Restore Backup?",
+            text=f"Replace all current data with the backup from {created.strftime('%b %d, %Y %H:%M')}?",
+            buttons=[
+                MDFlatButton(text="CANCEL", on_release=lambda x: dialog.dismiss()),
+                MDRaisedButton(text="RESTORE", on_release=lambda x: self.restore_backup(backup_id, dialog))
+            ]
+        )
+        dialog.open()
+
+    def restore_backup(self, backup_id, dialog):
+        dialog.dismiss()
+        self.backups_dialog.dismiss()
+        app = MDApp.get_running_app()
+        try:
+            app.restore_backup(backup_id)
+        except Exception as e:
+            self.show_error_dialog(f"Restore failed: {e}")
+            return
+        self.show_success_dialog("Backup restored.")
+
     def open_app_settings(self):
         app = MDApp.get_running_app()
 
@@ -844,11 +4489,25 @@ class ProfileScreen(Screen):
         color_buttons.add_widget(MDRectangleFlatButton(text="Teal", on_release=lambda x: self.set_color("Teal")))
         color_buttons.add_widget(MDRectangleFlatButton(text="Red", on_release=lambda x: self.set_color("Red")))
 
-        content = MDBoxLayout(orientation="vertical", spacing="20dp", size_hint_y=None, height="150dp")
+        api_switch = MDSwitch(active=self.load_settings().get("api_enabled", False))
+        api_switch.bind(active=lambda switch, value: self.set_api_enabled(value))
+        api_row = MDBoxLayout(spacing="10dp", size_hint_y=None, height="40dp")
+        api_row.add_widget(MDLabel(text=f"Local API ({API_HOST}:{API_PORT})", halign="left"))
+        api_row.add_widget(api_switch)
+
+        saver_switch = MDSwitch(active=self.load_settings().get("battery_saver", False))
+        saver_switch.bind(active=lambda switch, value: self.set_battery_saver(value))
+        saver_row = MDBoxLayout(spacing="10dp", size_hint_y=None, height="40dp")
+        saver_row.add_widget(MDLabel(text="Battery Saver", halign="left"))
+        saver_row.add_widget(saver_switch)
+
+        content = MDBoxLayout(orientation="vertical", spacing="20dp", size_hint_y=None, height="270dp")
         content.add_widget(MDLabel(text="Select Theme", halign="left"))
         content.add_widget(theme_buttons)
         content.add_widget(MDLabel(text="Primary Color", halign="left"))
         content.add_widget(color_buttons)
+        content.add_widget(api_row)
+        content.add_widget(saver_row)
 
         self.app_settings_dialog = MDDialog(
             title="App Settings",
@@ -860,6 +4519,62 @@ class ProfileScreen(Screen):
         )
         self.app_settings_dialog.open()
 
+    def open_calendar_settings(self):
+        daily, weekly = MDApp.get_running_app().get_capacity()
+        self.daily_capacity_field = MDTextField(
+            hint_text="Daily capacity (hours)", text=f"{daily / 60:g}", input_filter="float", mode="fill"
+        )
+        self.weekly_capacity_field = MDTextField(
+            hint_text="Weekly capacity (hours)", text=f"{weekly / 60:g}", input_filter="float", mode="fill"
+        )
+
+        content = MDBoxLayout(orientation="vertical", spacing="12dp", size_hint_y=None, height="130dp")
+        content.add_widget(self.daily_capacity_field)
+        content.add_widget(self.weekly_capacity_field)
+
+        self.calendar_dialog = MDDialog(
+            title="Calendar Settings",
+            type="custom",
+            content_cls=content,
+            buttons=[
+                MDFlatButton(text="CANCEL", on_release=lambda x: self.calendar_dialog.dismiss()),
+                MDRaisedButton(text="SAVE", on_release=lambda x: self.save_calendar_settings())
+            ]
+        )
+        self.calendar_dialog.open()
+
+    def save_calendar_settings(self):
+        try:
+            daily = float(self.daily_capacity_field.text)
+            weekly = float(self.weekly_capacity_field.text)
+        except ValueError:
+            self.show_error_dialog("Capacities must be numbers of hours")
+            return
+        if not 0 < daily <= 24 or not 0 < weekly <= 24 * 7:
+            self.show_error_dialog("Capacities must be positive and fit in a day / week")
+            return
+
+        data = load_data()
+        data.setdefault("settings", {}).update({
+            "daily_capacity": int(daily * 60),
+            "weekly_capacity": int(weekly * 60)
+        })
+        save_data(data)
+        store_events.publish(SETTINGS_CHANGED, key="capacity")
+        self.mark_clean()
+        self.calendar_dialog.dismiss()
+
+    def set_battery_saver(self, enabled):
+        data = load_data()
+        data.setdefault("settings", {})["battery_saver"] = enabled
+        save_data(data)
+        store_events.publish(SETTINGS_CHANGED, key="battery_saver")
+        self.mark_clean()
+
+        app = MDApp.get_running_app()
+        app.power.saver = enabled or is_low_end_device()
+        app.power.set_idle(app.power.idle)
+
     def set_theme(self, style):
         app = MDApp.get_running_app()
         app.theme_cls.theme_style = style
@@ -874,6 +4589,19 @@ class ProfileScreen(Screen):
         self.save_settings(primary_color=palette, theme=current_theme,
                            notifications_enabled=self.load_settings().get("notifications_enabled", True))
 
+    def set_api_enabled(self, enabled):
+        data = load_data()
+        data.setdefault("settings", {})["api_enabled"] = enabled
+        save_data(data)
+        store_events.publish(SETTINGS_CHANGED, key="api_enabled")
+        self.mark_clean()
+
+        app = MDApp.get_running_app()
+        if enabled and not app.start_api():
+            self.show_error_dialog(f"Could not start the local API on port {API_PORT}.")
+        elif not enabled:
+            app.stop_api()
+
     def open_notification_settings(self):
         settings = self.load_settings()
         self.notification_switch = MDSwitch()
@@ -911,7 +4639,7 @@ class ProfileScreen(Screen):
             app.cancel_all_notifications()
         else:
             app.reschedule_all_notifications()
-            app.daily_motivation_event = Clock.schedule_once(app.send_daily_motivation, 5)
+            app.daily_motivation_event = time_source.schedule_once(app.send_daily_motivation, 5)
 
     def load_settings(self):
         return load_data().get("settings", {
@@ -922,12 +4650,15 @@ class ProfileScreen(Screen):
 
     def save_settings(self, notifications_enabled=True, theme="Light", primary_color="Indigo"):
         data = load_data()
-        data["settings"] = {
+        data.setdefault("settings", {}).update({
             "notifications_enabled": notifications_enabled,
             "theme": theme,
             "primary_color": primary_color
-        }
+        })
         save_data(data)
+        MDApp.get_running_app().notifier.enabled = notifications_enabled
+        store_events.publish(SETTINGS_CHANGED)
+        self.mark_clean()  # theme and palette were applied directly
 
     def show_error_dialog(self, text):
         app = MDApp.get_running_app()
@@ -950,9 +4681,8 @@ class ProfileScreen(Screen):
         dialog.open()
 
 
-class StatsScreen(Screen):
-    def on_pre_enter(self):
-        self.refresh_screen()
+class StatsScreen(ReactiveScreen):
+    slices = ("tasks", "schedules", "focus", "motivation")  # schedules feed the minutes chart and subject rows
 
     def refresh_screen(self):
         self.update_stats()
@@ -964,21 +4694,108 @@ class StatsScreen(Screen):
         if self.ids.get("streak_widget"):
             self.ids.streak_widget.current_streak = app.current_streak
 
+        # ✅ Real focus time from the pre-aggregated totals
+        if self.ids.get("focus_today"):
+            today = time_source.now().strftime("%d-%m-%Y")
+            self.ids.focus_today.text = (
+                f"{app.focus_log.hours('day', today):.1f} h today • {app.focus_log.hours():.1f} h total"
+            )
+
+        # ✅ Completion analytics (cached per data version)
+        if self.ids.get("analytics_label"):
+            stats = app.analytics.get(load_data(use_cache=True))
+            self.ids.analytics_label.text = self.format_analytics(stats)
+
+            # Charts only rewrite their vertex buffers
+            self.ids.completions_chart.set_data(stats["completions"])
+            self.ids.minutes_chart.set_data(stats["minutes"])
+            self.ids.heatmap_chart.set_data(stats["heatmap"])
+            if self.ids.get("streak_widget"):
+                self.ids.streak_widget.ids.sparkline.set_data(stats["completions"])
+
+        # ✅ Per-subject progress from the incrementally kept aggregates
+        if self.ids.get("subject_rows"):
+            self.ids.subject_rows.clear_widgets()
+            catalog, subject_stats = app.get_subjects(), app.get_subject_stats()
+            for subject_id, totals in subject_stats.rows()[:8]:
+                self.ids.subject_rows.add_widget(make_subject_row(catalog, subject_id, totals))
+            if not subject_stats.rows():
+                self.ids.subject_rows.add_widget(MDLabel(text="No subjects yet", font_style="Caption",
+                                                         theme_text_color="Secondary", size_hint_y=None, height=dp(20)))
+
         # ✅ Update daily quote and tip
         if self.ids.get("daily_quote"):
             self.ids.daily_quote.text = app.daily_quote
         if self.ids.get("daily_tip"):
             self.ids.daily_tip.text = app.daily_tip
 
+    def format_analytics(self, stats):
+        weekdays = "  ".join(
+            f"{day} {int(rate * 100)}%" if rate is not None else f"{day} -"
+            for day, (rate, _) in stats["weekday"].items()
+        )
+        finished = stats["on_time"] + stats["late"]
+        on_time = f"{int(stats['on_time'] / finished * 100)}% on time" if finished else "No completed tasks yet"
+        best = sorted(stats["subject"].items(), key=lambda x: -x[1][0])[:3]
+        subjects = ", ".join(f"{name} {int(rate * 100)}%" for name, (rate, _) in best) or "-"
+        types = ", ".join(f"{name} {int(rate * 100)}%" for name, (rate, _) in stats["type"].items()) or "-"
+        return (
+            f"[b]By weekday[/b]\n{weekdays}\n\n"
+            f"[b]By type[/b]  {types}\n"
+            f"[b]Top subjects[/b]  {subjects}\n\n"
+            f"{on_time} ({stats['on_time']} / {stats['late']} late)\n"
+            f"Tasks done per day: {stats['avg7']:.1f} (7d) • {stats['avg30']:.1f} (30d)\n"
+            f"Study minutes per day (7d): {stats['minutes_avg7']:.0f}"
+        )
+
     def go_back(self):
         self.manager.current = "main_screen"
         self.manager.transition.direction = "right"
 
+
+class InvalidDataHandler(ExceptionHandler):
+    """Shows a save refused by save_data() instead of letting it end the app."""
+
+    def handle_exception(self, inst):
+        if isinstance(inst, InvalidDataError):
+            MDApp.get_running_app().show_data_error(inst)
+            return ExceptionManager.PASS
+        return ExceptionManager.RAISE
+
+
 class StudyPlannerApp(MDApp):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.scheduled_notifications = []
         self.daily_motivation_event = None
+        self.day_change_event = None
+        self.schedule_index = None
+        self.api = None
+        self.reviews = None
+        self.diagnostics = None
+        self.history = UndoHistory()
+        self.power = PowerManager()
+        self.profiles = ProfileIndex()
+        set_active_profile(self.profiles.active)
+        self.backups = BackupStore()
+        self.week_cache = WeekModelCache(
+            build_week_model, lambda monday: week_records(self.get_schedule_index(), monday))
+        self.focus_timer = None
+        self.focus_event = None
+        self.focus_tick_event = None
+        self.focus_dialog = None
+        self.focus_log = FocusLog(totals=load_section("focus_totals"))
+        self.notifier = NotificationDispatcher()
+        self.reminders = None
+        self.reminder_rearm_event = None
+        self.watermark_event = None
+        self.due_index = None
+        self.rollover_checked = None
+        self.analytics = AnalyticsEngine()
+        self.workload = None
+        self.workload_version = None
+        self.subjects = None
+        self.subject_stats = None
 
         # Stats
         self.current_streak = 0
@@ -1002,29 +4819,344 @@ class StudyPlannerApp(MDApp):
         self.theme_cls.theme_style = "Light"
         return Builder.load_file("optimize.kv")
 
+    def on_stop(self):
+        self.save_reminder_queue()
+        self.notifier.stop()
+        self.stop_api()
+        self.backups.flush()
+        if self.diagnostics:
+            self.diagnostics.record("stop")
+
+    def on_pause(self):
+        # ✅ Reminders live on in the persisted queue; drop the Clock events
+        self.get_reminder_queue().last_run = time_source.time()
+        self.save_reminder_queue()
+        if self.watermark_event:
+            self.watermark_event.cancel()
+            self.watermark_event = None
+        self.cancel_all_notifications()
+        if self.day_change_event:
+            self.day_change_event.cancel()
+            self.day_change_event = None
+        if self.focus_timer:
+            self.focus_timer.suspend()
+            self.stop_focus_tick()
+        if self.root:
+            for screen in self.root.screens:
+                if hasattr(screen, "cancel_build"):
+                    screen.cancel_build()
+        self.backups.flush()
+        self.power.stop()
+        return True
+
+    def on_resume(self):
+        self.power.start()
+        if self.focus_timer:
+            self.focus_timer.wake()
+            self.arm_focus_events()
+        missed = self.get_missed_reminders()
+        if missed and self.notifier.enabled:
+            time_source.schedule_once(lambda dt: self.show_missed_reminders(missed), 0.5)
+        self.arm_reminders()
+        self.arm_day_change()
+        if self.notifier.enabled:
+            self.arm_daily_motivation()
+        self.on_day_change_if_needed()
+        self.collect_finished_sessions()
+        # on_pause cancelled the visible screen's progressive build
+        screen = self.root.current_screen if self.root else None
+        if isinstance(screen, ReactiveScreen):
+            screen.mark_dirty()
+
     def on_start(self):
+        ExceptionManager.add_handler(InvalidDataHandler())
         settings = self.load_settings()
         self.theme_cls.theme_style = settings.get("theme", "Light")
         self.theme_cls.primary_palette = settings.get("primary_color", "Indigo")
 
+        self.notifier.enabled = settings.get("notifications_enabled", True)
+        self.notifier.start()
+        self.power.saver = settings.get("battery_saver", False) or is_low_end_device()
+        self.power.start()
+
         if settings.get("notifications_enabled", True):
-            self.daily_motivation_event = Clock.schedule_once(self.send_daily_motivation, 5)
-            for s in self.get_all_schedules():
-                if s.get("notification"):
-                    self.schedule_notification(s["name"], s["time"])
+            self.daily_motivation_event = time_source.schedule_once(self.send_daily_motivation, 5)
+            missed = self.get_missed_reminders()
+            if missed:
+                time_source.schedule_once(lambda dt: self.show_missed_reminders(missed), 1)
+        self.arm_reminders()
+        if settings.get("api_enabled", False):
+            self.start_api()
+        if os.environ.get(DIAGNOSTICS_ENV) == "1" or settings.get("diagnostics", False):
+            self.start_diagnostics()
+        if _recovery_note:
+            time_source.schedule_once(lambda dt: self.show_recovery_note(), 1)
+
+        self.update_streak()
+        time_source.schedule_once(lambda dt: self.clean_old_schedules(), 1)  # ✅ defer heavy task
+        time_source.schedule_once(lambda dt: self.collect_finished_sessions(), 2)
+        self.arm_day_change()
+        _save_hooks.append(lambda: self.backups.request())  # follows profile switches
+        store_events.subscribe(("profile",), self.on_profile_changed)
+        self.backups.request()
+
+    # ---------------- Reviews ----------------
+    def get_review_queue(self):
+        if self.reviews is None:
+            self.reviews = ReviewQueue.from_dict(load_section("reviews", {}))
+        return self.reviews
+
+    def pack_review_queue(self, data):
+        """Puts the review and reminder queues into `data` for the caller's save_data."""
+        if self.reviews is not None:
+            data["reviews"] = self.reviews.to_dict()
+        self.pack_reminder_queue(data)
+
+    def save_review_queue(self):
+        if self.reviews is None:
+            return
+        data = load_data()
+        self.pack_review_queue(data)
+        save_data(data)
+        store_events.publish(REVIEWS_CHANGED)
 
+    def add_review_reminder(self, card):
+        if card is None:
+            return
+        reminders = self.get_reminder_queue()
+        # Keyed by card id; the subject is looked up when the reminder fires
+        name = REVIEW_REMINDER_PREFIX + card["id"]
+        reminders.remove(name)
+        reminders.add(card["due"], name)
+        if card["due"] <= time_source.time() + REMINDER_HORIZON:
+            self.arm_reminder(card["due"], name)
+
+    def reminder_text(self, name):
+        """What a reminder shows: review keys resolve to their card's subject."""
+        if not name.startswith(REVIEW_REMINDER_PREFIX):
+            return name
+        card = self.get_review_queue().cards.get(name[len(REVIEW_REMINDER_PREFIX):])
+        return f"Review: {card['subject']}" if card else "Review"
+
+    def collect_finished_sessions(self, save=True):
+        """
+        Enqueues reviews for schedules that ended since the last scan. Walks
+        only the days in between through the schedule index. Runs from timers
+        and finish_focus_session, never from a render; with save=False the
+        caller persists the queues through pack_review_queue.
+        """
+        reviews = self.get_review_queue()
+        now = time_source.time()
+        since = reviews.last_scan or now - DAY_SECONDS
+        index = self.get_schedule_index()
+
+        added = []
+        first = datetime.fromtimestamp(since).date().toordinal()
+        for ordinal in range(first, datetime.fromtimestamp(now).date().toordinal() + 1):
+            date_str = datetime.fromordinal(ordinal).strftime("%d-%m-%Y")
+            day = index.day(date_str)
+            for schedule in (day.items if day else []):
+                start = schedule_fire_time(schedule)
+                if start is None:
+                    continue
+                end = start + int(schedule.get("duration", DEFAULT_SESSION_MINUTES)) * 60
+                if since < end <= now:
+                    card = reviews.enqueue(f"schedule:{schedule['name']}:{date_str}",
+                                           schedule.get("subject") or "General", schedule["name"], end)
+                    added.append(card)
+
+        # Only new cards are worth a save; a rescan after restart is idempotent
+        reviews.last_scan = now
+        for card in added:
+            self.add_review_reminder(card)
+        if added and save:
+            self.save_review_queue()
+
+    def get_due_reviews(self):
+        end_of_today = datetime.combine(time_source.now().date(), datetime.max.time()).timestamp()
+        return [dict(card, review=True) for card in self.get_review_queue().pop_due(end_of_today)]
+
+    def enqueue_focus_review(self, session):
+        """Adds the session's review card; the caller saves the queues with pack_review_queue."""
+        subject = session["subject"] or session["task"]
+        if not subject:
+            return
+        if session["schedule"]:
+            card_id = f"schedule:{session['schedule']}:{session['date']}"
+        else:
+            card_id = f"focus:{session['start']}:{subject}"
+        card = self.get_review_queue().enqueue(card_id, subject, session["task"] or session["schedule"] or "Focus session",
+                                               time_source.time())
+        self.add_review_reminder(card)
+
+    def grade_review(self, card_id, quality, dialog=None):
+        if dialog:
+            dialog.dismiss()
+        card = self.get_review_queue().grade(card_id, quality, time_source.time())
+        if card is None:
+            self.get_reminder_queue().remove(REVIEW_REMINDER_PREFIX + card_id)
+        self.add_review_reminder(card)
+        self.save_review_queue()
+
+    def show_review_dialog(self, review):
+        dialog = MDDialog(
+            title=f"[b]Review: {review['subject']}[/b]",
+            text=f"From: {review['source']}\nInterval: {review['interval']} day{'s' if review['interval'] != 1 else ''}"
+                 f"\nHow well did you recall it?",
+            buttons=[
+                MDFlatButton(text=label, theme_text_color="Custom", text_color=self.theme_cls.primary_color,
+                             on_release=lambda x, q=quality: self.grade_review(review["id"], q, dialog))
+                for label, quality in REVIEW_GRADES
+            ]
+        )
+        dialog.open()
+
+    # ---------------- Backups ----------------
+    def restore_backup(self, backup_id):
+        """Replaces the store with a backup and drops every derived index."""
+        save_data(self.backups.restore(backup_id))
+        self.focus_log = FocusLog(totals=load_section("focus_totals"))
+        self.schedule_index = None
+        self.week_cache.invalidate()
+        self.due_index = None
+        self.subjects = None
+        self.subject_stats = None
+        self.cancel_all_notifications()
+        self.reminders = None
+        self.reviews = None
+        self.rollover_checked = None
+        self.history.clear()
+        self.arm_reminders()
         self.update_streak()
-        Clock.schedule_once(lambda dt: self.clean_old_schedules(), 1)  # ✅ defer heavy task
+        store_events.publish(DATA_REPLACED)
+
+    # ---------------- Diagnostics ----------------
+    def start_diagnostics(self):
+        self.diagnostics = Diagnostics()
+        self.diagnostics.start()
+        self.root.bind(current=self.on_screen_change)
+        self.diagnostics.record(self.root.current)
+        self.measure_wakeups()
+
+    def measure_wakeups(self):
+        """Logs Clock wakeups per minute for a minute of use, then for a minute idle."""
+        def log(result):
+            self.diagnostics.note("wakeups", **result)
+
+        def idle_minute(result):
+            log(result)
+            self.power.set_idle(True)
+            self.power.measure_wakeups("idle", done=log)
+
+        self.power.measure_wakeups("active", done=idle_minute)
+
+    def on_screen_change(self, manager, name):
+        # Sample once the transition has finished and the new screen is built
+        delay = getattr(manager.transition, "duration", 0.4) + 0.5
+        Clock.schedule_once(lambda dt: self.diagnostics.record(name), delay)
+
+    # ---------------- Local API ----------------
+    def start_api(self):
+        if self.api is None:
+            # Records are flat dicts, so shallow copies detach them from the store
+            self.api = LocalApiServer({
+                "/tasks": (("tasks",), lambda: [dict(t) for t in load_section("tasks", [])]),
+                "/schedules": (("schedules",), lambda: [dict(s) for s in load_section("schedules", [])]),
+                "/stats": (("tasks", "schedules", "motivation", "focus"), self.api_stats),
+            })
+            store_events.subscribe(self.api.slices(), self.api.on_store_change)
+        return self.api.start()
+
+    def stop_api(self):
+        if self.api is not None:
+            self.api.stop()
+
+    def api_stats(self):
+        """Summary served at /stats; built on the UI thread when one of its slices changes."""
+        tasks = load_section("tasks", [])
+        motivation = load_section("motivation", {})
+        done = sum(1 for t in tasks if t.get("status") == "Done")
+        return {
+            "tasks_total": len(tasks),
+            "tasks_done": done,
+            "tasks_pending": len(tasks) - done,
+            "schedules_total": len(load_section("schedules", [])),
+            "current_streak": motivation.get("current_streak", 0),
+            "last_studied": motivation.get("last_studied", ""),
+            "focus_minutes": self.focus_log.totals["total"] // 60,
+            "study_hours": self.study_hours,
+        }
+
+    # ---------------- Profiles ----------------
+    def on_profile_changed(self, change):
+        profile = load_section("profile", {})
+        self.profiles.update(active_profile(), name=profile.get("name") or self.profiles.name(active_profile()),
+                             title=profile.get("title", ""), avatar_path=profile.get("avatar_path", ""))
+
+    def create_profile(self, name):
+        profile_id = self.profiles.add(name)
+        self.switch_profile(profile_id)
+        data = load_data()
+        data.setdefault("profile", {})["name"] = name
+        save_data(data)
+        self.load_profile_data()
+        store_events.publish(PROFILE_CHANGED)
+        return profile_id
+
+    def switch_profile(self, profile_id):
+        """
+        Parks the current profile's reminders in the merged queue, points the
+        store at the other shard and drops every per-profile cache.
+        """
+        if profile_id == active_profile() or profile_id not in self.profiles.profiles:
+            return
+        if self.focus_timer:
+            self.finish_focus_session()
+        self.save_reminder_queue()
+        # Parked under their display text: the other shard's cards cannot be looked up later
+        self.profiles.reminders.replace(active_profile(), [
+            (ts, self.reminder_text(name))
+            for ts, name in self.get_reminder_queue().upcoming(time_source.time(), float("inf"))])
+        self.backups.flush()
+        self.cancel_all_notifications()
+
+        set_active_profile(profile_id)
+        self.profiles.active = profile_id
+        self.profiles.reminders.drop(profile_id)
+        self.profiles.save()
+
+        self.backups = BackupStore()
+        self.focus_log = FocusLog(totals=load_section("focus_totals"))
+        self.schedule_index = None
+        self.week_cache.invalidate()
+        self.due_index = None
+        self.subjects = None
+        self.subject_stats = None
+        self.reminders = None
+        self.reviews = None
+        self.rollover_checked = None
+        self.history.clear()
+
+        settings = self.load_settings()
+        self.theme_cls.theme_style = settings.get("theme", "Light")
+        self.theme_cls.primary_palette = settings.get("primary_color", "Indigo")
+        self.notifier.enabled = settings.get("notifications_enabled", True)
+
+        self.load_profile_data()
+        self.check_streak()
+        self.update_task_stats()
+        self.arm_reminders()
+        store_events.publish(DATA_REPLACED)
 
     # ---------------- Profile ----------------
     def load_profile_data(self):
-        profile = load_data().get("profile", {})
+        profile = load_section("profile", {})
         self.profile_name = profile.get("name", "")
         self.profile_title = profile.get("title", "")
         self.avatar_path = profile.get("avatar_path", "data/logo/kivy-icon-256.png")
 
     def load_settings(self):
-        return load_data().get("settings", {
+        return load_section("settings", {
             "notifications_enabled": True,
             "theme": "Light",
             "primary_color": "Indigo"
@@ -1032,22 +5164,21 @@ class StudyPlannerApp(MDApp):
 
     def save_streak(self, date, streak_count):
         data = load_data()
-        data["motivation"] = {
+        data.setdefault("motivation", {}).update({
             "last_studied": date.strftime("%d-%m-%Y"),
             "current_streak": streak_count
-        }
+        })
         save_data(data)
+        store_events.publish(STREAK_CHANGED, streak=streak_count)
 
     def update_streak(self):
-        today_str = datetime.now().strftime("%d-%m-%Y")
-        data = load_data()
-        if data.get("motivation", {}).get("last_studied") != today_str:
-            self.save_streak(datetime.now(), self.current_streak)
+        today_str = time_source.now().strftime("%d-%m-%Y")
+        if load_section("motivation", {}).get("last_studied") != today_str:
+            self.save_streak(time_source.now(), self.current_streak)
 
     def check_streak(self):
-        data = load_data()
-        streak = data.get("motivation", {"last_studied": "", "current_streak": 0})
-        today = datetime.now().date()
+        streak = load_section("motivation", {"last_studied": "", "current_streak": 0})
+        today = time_source.now().date()
 
         if streak["last_studied"]:
            last_date = datetime.strptime(streak["last_studied"], "%d-%m-%Y").date()
@@ -1068,10 +5199,25 @@ class StudyPlannerApp(MDApp):
     def get_all_schedules(self):
         return sorted(load_data(use_cache=True).get("schedules", []), key=lambda x: x["time"])
 
+    def get_schedule_index(self):
+        if self.schedule_index is None:
+            self.schedule_index = ScheduleIndex(load_data(use_cache=True).get("schedules", []))
+        return self.schedule_index
+
+    def get_week_model(self, monday):
+        return self.week_cache.get_or_build(monday)
+
     def add_schedule(self, schedule):
+        self.add_schedules([schedule])
+
+    def add_schedules(self, new_schedules):
+        today = time_source.now().strftime("%d-%m-%Y")
+        for schedule in new_schedules:
+            schedule.setdefault("created_at", today)
         data = load_data()
+        self.intern_subjects(data, new_schedules)
         schedules = data.get("schedules", [])
-        schedules.append(schedule)
+        schedules.extend(new_schedules)
 
         # ✅ Sort by time ASC within same date
         schedules.sort(key=lambda s: datetime.strptime(s["time"], "%H:%M"))
@@ -1080,60 +5226,326 @@ class StudyPlannerApp(MDApp):
         schedules.sort(key=lambda s: datetime.strptime(s["date"], "%d-%m-%Y"), reverse=True)
 
         data["schedules"] = schedules
+
+        # ✅ The queue rides along in the same save
+        reminders = self.get_reminder_queue()
+        now = time_source.time()
+        to_arm = []
+        for schedule in new_schedules:
+            ts = schedule_fire_time(schedule) if schedule.get("notification") else None
+            if ts is None or ts <= now:
+                continue
+            reminders.add(ts, schedule["name"])
+            if ts <= now + REMINDER_HORIZON:
+                to_arm.append((ts, schedule["name"]))
+        self.pack_reminder_queue(data)
         save_data(data)
 
-        if schedule.get("notification"):
-            self.schedule_notification(schedule["name"], schedule["time"])
+        if self.schedule_index is not None:
+            for schedule in new_schedules:
+                self.schedule_index.add(schedule)
+        if self.subject_stats is not None:
+            for schedule in new_schedules:
+                self.subject_stats.add_schedule(schedule)
+        self.week_cache.invalidate()
+        store_events.publish(SCHEDULE_ADDED, names=[s["name"] for s in new_schedules])
+
+        for ts, name in to_arm:
+            self.arm_reminder(ts, name)
 
 
     def delete_schedule(self, name):
+        """Returns False, recording nothing, when no schedule has that name."""
         data = load_data()
+        removed = [s for s in data.get("schedules", []) if s.get("name") == name]
+        if not removed:
+            return False
         data["schedules"] = [s for s in data.get("schedules", []) if s.get("name") != name]
+        self.get_reminder_queue().remove(name)
+        self.pack_reminder_queue(data)
         save_data(data)
+        self.history.record(f"Deleted '{name}'", lambda: self.add_schedules([dict(s) for s in removed]),
+                            lambda: self.delete_schedule(name), removed)
+
+        if self.schedule_index is not None:
+            self.schedule_index.remove(name)
+        if self.subject_stats is not None:
+            for schedule in removed:
+                self.subject_stats.remove_schedule(schedule)
+        self.week_cache.invalidate()
+        store_events.publish(SCHEDULE_REMOVED, names=[name])
+        self.arm_reminders()
+        return True
 
     def clean_old_schedules(self):
         data = load_data()
         if not data.get("schedules"):
             return
 
-        today = datetime.now()
-        start = today - timedelta(days=today.weekday())
-        week_dates = [(start + timedelta(days=i)).strftime("%d-%m-%Y") for i in range(7)]
+        today = time_source.now()
+        start = (today - timedelta(days=today.weekday())).date()
 
-        data["schedules"] = [s for s in data["schedules"] if s.get("date") in week_dates]
-        save_data(data)
+        # ✅ Keep this week and anything planned ahead, drop older weeks
+        kept = []
+        for s in data["schedules"]:
+            try:
+                if datetime.strptime(s["date"], "%d-%m-%Y").date() >= start:
+                    kept.append(s)
+            except (KeyError, ValueError):
+                continue
+
+        if len(kept) != len(data["schedules"]):
+            data["schedules"] = kept
+            save_data(data)
+            self.schedule_index = None
+            self.week_cache.invalidate()
+            self.subject_stats = None
+            store_events.publish(SCHEDULE_REMOVED, names=None)
+
+    def get_study_windows(self):
+        return self.load_settings().get("study_windows", DEFAULT_STUDY_WINDOWS)
+
+    def propose_study_plan(self):
+        return plan_study_sessions(self.get_all_tasks(), self.get_all_schedules(), self.get_study_windows())
+
+    # ---------------- Subjects ----------------
+    def get_subjects(self):
+        """The subject catalog; the v3 migration seeded it from existing records."""
+        if self.subjects is None:
+            self.subjects = SubjectCatalog(load_section("subjects", []))
+            if needs_store_migration(load_section("schema_version", SCHEMA_VERSION)):
+                # Not saved since v3: seed in the order the migration will, so the ids agree
+                data = load_data(use_cache=True)
+                for record in (data.get("schedules") or []) + (data.get("tasks") or []):
+                    if isinstance(record, dict):
+                        self.subjects.intern(record.get("subject"))
+        return self.subjects
+
+    def intern_subjects(self, data, records):
+        """Gives records the catalog spelling and id of their subject; call before save_data."""
+        catalog = self.get_subjects()
+        known = len(catalog)
+        for record in records:
+            catalog.assign(record)
+        if len(catalog) != known:
+            data["subjects"] = catalog.to_list()
+
+    def get_subject_stats(self):
+        if self.subject_stats is None:
+            tasks = self.get_all_tasks()  # may roll periodic tasks over and reset the stats
+            self.subject_stats = SubjectStats(self.get_subjects(), load_data(use_cache=True).get("schedules", []), tasks)
+        return self.subject_stats
+
+    def open_subject_menu(self, caller, on_select):
+        catalog = self.get_subjects()
+
+        def select(subject_id):
+            self.subject_menu.dismiss()
+            on_select(subject_id)
+
+        items = [{"text": "All subjects", "viewclass": "CustomListItem", "icon": "filter-remove",
+                  "height": dp(56), "on_release": lambda: select(None)}]
+        items.extend({
+            "text": record["name"],
+            "viewclass": "CustomListItem",
+            "icon": "book-outline",
+            "height": dp(56),
+            "on_release": lambda i=subject_id: select(i)
+        } for subject_id, record in sorted(catalog.records.items(), key=lambda r: subject_key(r[1]["name"])))
+        self.subject_menu = MDDropdownMenu(caller=caller, items=items, width_mult=4)
+        self.subject_menu.open()
+
+    def show_subject_summary(self, box, subject_id):
+        box.clear_widgets()
+        if subject_id is not None:
+            box.add_widget(make_subject_row(self.get_subjects(), subject_id, self.get_subject_stats().get(subject_id)))
+
+    # ---------------- Workload ----------------
+    def get_workload(self):
+        tasks = self.get_all_tasks()  # may roll periodic tasks over and save
+        if self.workload is None or self.workload_version != data_version():
+            self.workload = WorkloadModel(load_data(use_cache=True).get("schedules", []), tasks)
+            self.workload_version = data_version()
+        return self.workload
+
+    def get_capacity(self):
+        settings = self.load_settings()
+        return (settings.get("daily_capacity", DEFAULT_DAILY_CAPACITY),
+                settings.get("weekly_capacity", DEFAULT_WEEKLY_CAPACITY))
+
+    def workload_warnings(self, date_str, minutes):
+        ordinal = _ordinal_or_zero(date_str)
+        if not ordinal:
+            return []
+        return self.get_workload().warnings(ordinal, minutes, *self.get_capacity())
+
+    def show_workload_dialog(self, warnings, on_confirm):
+        dialog = MDDialog(
+            title="[color=ff9800]Heavy Workload[/color]",
+            text="This would go over your planned capacity:\n" + "\n".join(warnings),
+            buttons=[
+                MDFlatButton(text="CANCEL", on_release=lambda x: dialog.dismiss()),
+                MDRaisedButton(text="SAVE ANYWAY", on_release=lambda x: (dialog.dismiss(), on_confirm()))
+            ]
+        )
+        dialog.open()
 
     # ---------------- Tasks ----------------
     def get_all_tasks(self):
+        self.check_rollover()
         return load_data(use_cache=True).get("tasks", [])
 
+    def check_rollover(self):
+        """
+        Lazily rolls periodic tasks over the first time data is read on a new day.
+        """
+        today = time_source.now().date()
+        if self.rollover_checked == today:
+            return
+        self.rollover_checked = today
+
+        data = load_data(use_cache=True)
+        if roll_over_tasks(data, today):
+            save_data(data)
+            self.due_index = None
+            self.subject_stats = None
+            self.update_task_stats()
+            store_events.publish(TASK_UPDATED, names=None)
+
+    def get_due_index(self):
+        if self.due_index is None:
+            self.due_index = DueDateIndex(self.get_all_tasks())
+        return self.due_index
+
     def add_task(self, task):
-        task["created_at"] = datetime.now().strftime("%d-%m-%Y")
+        task["created_at"] = time_source.now().strftime("%d-%m-%Y")
+        if task.get("repeat") and task.get("task_type") in PERIODIC_TYPES:
+            task["period"] = period_key(task["task_type"], time_source.now().date())
+        if task.get("status") == "Done":
+            task["completed_at"] = task["created_at"]
         data = load_data()
+        self.intern_subjects(data, [task])
         data.setdefault("tasks", []).append(task)
         save_data(data)
         self.update_task_stats()
-
-        if "stats_screen" in self.root.screen_names:
-            self.root.get_screen("stats_screen").update_stats()
+        if self.due_index is not None:
+            self.due_index.add(task)
+        if self.subject_stats is not None:
+            self.subject_stats.add_task(task)
+        store_events.publish(TASK_ADDED, names=[task["name"]])
+
+    def _apply_task_updates(self, data, task, updates):
+        if self.subject_stats is not None:
+            self.subject_stats.remove_task(task)
+        task.update(updates)
+        if "subject" in updates:
+            self.intern_subjects(data, [task])
+        if updates.get("status") == "Done":
+            task.setdefault("completed_at", time_source.now().strftime("%d-%m-%Y"))
+        elif "status" in updates:
+            task.pop("completed_at", None)
+        if "task_type" in updates or "repeat" in updates:
+            if task.get("repeat") and task.get("task_type") in PERIODIC_TYPES:
+                task["period"] = period_key(task["task_type"], time_source.now().date())
+            else:
+                task.pop("period", None)
+        if self.due_index is not None:
+            self.due_index.update(task.get("name"), task)
+        if self.subject_stats is not None:
+            self.subject_stats.add_task(task)
+
+    def task_positions(self, names):
+        """Copies of the named tasks with their list positions, for undo."""
+        return [[i, dict(t)] for i, t in enumerate(load_section("tasks", [])) if t.get("name") in names]
+
+    def restore_tasks(self, entries):
+        """Puts tasks back as they were: replaced by name, or re-inserted at their position."""
+        data = load_data()
+        tasks = data.setdefault("tasks", [])
+        by_name = {t.get("name"): i for i, t in enumerate(tasks)}
+        inserted = False
+        for position, task in sorted(entries, key=lambda e: e[0]):
+            if task["name"] in by_name:
+                tasks[by_name[task["name"]]] = dict(task)
+            else:
+                tasks.insert(min(position, len(tasks)), dict(task))
+                inserted = True
+        save_data(data)
+        self.due_index = None
+        self.subject_stats = None
+        self.update_task_stats()
+        store_events.publish(TASK_ADDED if inserted else TASK_UPDATED, names=[task["name"] for _, task in entries])
 
     def update_task(self, name, updates):
-        data = load_data()
+        before = self.task_positions({name})
+        data = load_data(use_cache=True)  # cards hold these dicts, so they are edited in place
         for task in data.get("tasks", []):
             if task.get("name") == name:
-                task.update(updates)
+                self._apply_task_updates(data, task, updates)
                 break
         save_data(data)
         self.update_task_stats()
+        self.history.record(f"Updated '{name}'", lambda: self.restore_tasks(before),
+                            lambda: self.update_task(name, updates), before)
+        store_events.publish(TASK_UPDATED, names=[name], updates=updates)
+
+    def apply_task_batch(self, names, updates=None, delete=False):
+        """
+        Applies one update (or a delete) to many tasks with a single save and
+        a single stats refresh. The cached task dicts are edited in place, so
+        cards built from them stay current. Returns the affected task dicts.
+        """
+        names = set(names)
+        before = self.task_positions(names)
+        data = load_data(use_cache=True)
+        tasks = data.get("tasks", [])
+        affected = [t for t in tasks if t.get("name") in names]
+        if not affected:
+            return []
+
+        if delete:
+            data["tasks"] = [t for t in tasks if t.get("name") not in names]
+            if self.due_index is not None:
+                for name in names:
+                    self.due_index.remove(name)
+            if self.subject_stats is not None:
+                for task in affected:
+                    self.subject_stats.remove_task(task)
+        else:
+            for task in affected:
+                self._apply_task_updates(data, task, updates or {})
+
+        save_data(data)
+        self.update_task_stats()
+        self.history.record(f"{'Deleted' if delete else 'Updated'} {len(affected)} tasks",
+                            lambda: self.restore_tasks(before),
+                            lambda: self.apply_task_batch(names, updates, delete), before)
+        store_events.publish(TASK_REMOVED if delete else TASK_UPDATED, names=sorted(names), updates=updates)
+        if updates and updates.get("status") == "Done":
+            self.update_streak()
+        return affected
 
     def delete_task(self, name):
+        """Returns False, recording nothing, when no task has that name."""
+        before = self.task_positions({name})
+        if not before:
+            return False
         data = load_data()
+        if self.subject_stats is not None:
+            for _, task in before:
+                self.subject_stats.remove_task(task)
         data["tasks"] = [t for t in data.get("tasks", []) if t.get("name") != name]
         save_data(data)
+        self.history.record(f"Deleted '{name}'", lambda: self.restore_tasks(before),
+                            lambda: self.delete_task(name), before)
         self.update_task_stats()
+        if self.due_index is not None:
+            self.due_index.remove(name)
+        store_events.publish(TASK_REMOVED, names=[name])
+        return True
 
     def update_task_stats(self):
-        tasks = load_data(use_cache=True).get("tasks", [])
+        tasks = load_section("tasks", [])
         self.total_tasks = len(tasks)
         self.completed_tasks = len([t for t in tasks if t.get("status") == "Done"])
         self.task_completion_percentage = (self.completed_tasks / self.total_tasks) * 100 if self.total_tasks else 0
@@ -1149,74 +5561,379 @@ class StudyPlannerApp(MDApp):
 
     @property
     def study_hours(self):
-        return self.completed_tasks * 0.5
+        return self.focus_log.hours()
+
+    # ---------------- Focus Timer ----------------
+    def open_focus_dialog(self, task="", subject="", schedule="", dialog=None):
+        if dialog:
+            dialog.dismiss()
+        running = self.focus_timer
+        if running and (task or subject or schedule) and \
+                (running.task, running.subject, running.schedule) != (task, subject, schedule):
+            self.confirm_focus_switch(task, subject, schedule)
+            return
+        if self.focus_timer is None:
+            self.focus_timer = FocusTimer(task=task, subject=subject, schedule=schedule)
+
+        self.focus_label = MDLabel(text=self.format_focus_time(), halign="center", font_style="H3",
+                                   size_hint_y=None, height=dp(80))
+        content = MDBoxLayout(orientation="vertical", size_hint_y=None, height=dp(100))
+        content.add_widget(self.focus_label)
+
+        self.focus_dialog = MDDialog(
+            title=f"Focus: {self.focus_timer.task or self.focus_timer.subject or 'Study'}",
+            type="custom",
+            content_cls=content,
+            buttons=[
+                MDFlatButton(text="STOP", on_release=lambda x: self.finish_focus_session()),
+                MDFlatButton(text="HIDE", on_release=lambda x: self.focus_dialog.dismiss()),
+                MDRaisedButton(text="START / PAUSE", on_release=lambda x: self.toggle_focus_timer())
+            ]
+        )
+        self.focus_dialog.bind(on_dismiss=lambda x: self.stop_focus_tick())
+        self.focus_dialog.open()
+        self.arm_focus_events()
+
+    def confirm_focus_switch(self, task, subject, schedule):
+        running = self.focus_timer
+        dialog = MDDialog(
+            title="Focus Session Running",
+            text=f"'{running.task or running.schedule or running.subject or 'Study'}' is still running "
+                 f"({self.format_focus_time()} left).",
+            buttons=[
+                MDFlatButton(text="SHOW RUNNING", on_release=lambda x: self.open_focus_dialog(dialog=dialog)),
+                MDRaisedButton(text="STOP & START NEW", on_release=lambda x: (
+                    self.finish_focus_session(), self.open_focus_dialog(task, subject, schedule, dialog=dialog)))
+            ]
+        )
+        dialog.open()
+
+    def focus_display_step(self):
+        """Seconds between visible changes of the countdown: whole minutes in battery saver."""
+        return 60 if self.power.saver else 1
+
+    def format_focus_time(self):
+        remaining = int(self.focus_timer.remaining()) if self.focus_timer else POMODORO_MINUTES * 60
+        if self.focus_display_step() == 60 and remaining >= 60:
+            return f"{-(-remaining // 60)} min"
+        return f"{remaining // 60:02d}:{remaining % 60:02d}"
+
+    def toggle_focus_timer(self):
+        if self.focus_timer.running:
+            self.focus_timer.pause()
+        else:
+            self.focus_timer.start()
+        self.arm_focus_events()
+
+    def arm_focus_events(self):
+        """
+        One completion event plus a display tick that only runs while the
+        dialog is visible and the timer is running. The tick fires when the
+        shown value changes: every second, or every minute in battery saver.
+        """
+        if self.focus_event:
+            self.focus_event.cancel()
+            self.focus_event = None
+        self.stop_focus_tick()
+
+        timer = self.focus_timer
+        if not timer or not timer.running:
+            if timer and self.focus_dialog:
+                self.focus_label.text = self.format_focus_time()
+            return
+
+        self.focus_event = time_source.schedule_once(lambda dt: self.finish_focus_session(), timer.remaining())
+        self.update_focus_display()
+
+    def stop_focus_tick(self):
+        if self.focus_tick_event:
+            self.focus_tick_event.cancel()
+            self.focus_tick_event = None
+
+    def update_focus_display(self, *args):
+        self.focus_tick_event = None
+        timer = self.focus_timer
+        if not (timer and timer.running and self.focus_dialog and self.focus_dialog.parent):
+            return  # nothing shows the countdown, so nothing ticks
+        self.focus_label.text = self.format_focus_time()
+        step = self.focus_display_step()
+        delay = timer.remaining() % step or step
+        self.focus_tick_event = time_source.schedule_once(self.update_focus_display, delay + 0.01)
+
+    def finish_focus_session(self):
+        timer = self.focus_timer
+        if timer is None:
+            return
+        if self.focus_event:
+            self.focus_event.cancel()
+            self.focus_event = None
+        self.stop_focus_tick()
+
+        session = timer.finish()
+        self.focus_timer = None
+        if self.focus_dialog:
+            self.focus_dialog.dismiss()
+            self.focus_dialog = None
+
+        if session["seconds"] < 60:
+            return
+        self.focus_log.append(session)
+        self.enqueue_focus_review(session)
+        self.collect_finished_sessions(save=False)  # a scheduled session usually ends with the timer
+        data = load_data()
+        data["focus_totals"] = self.focus_log.totals
+        self.pack_review_queue(data)
+        save_data(data)
+        store_events.publish(FOCUS_LOGGED, seconds=session["seconds"])
+        store_events.publish(REVIEWS_CHANGED)
+
+        self.update_streak()
+        if session["seconds"] >= timer.target_seconds:
+            self.notifier.post("Focus Session Complete",
+                               f"{session['task'] or session['subject'] or 'Focus'}: {session['seconds'] // 60} min")
+
+    # ---------------- Day change ----------------
+    def arm_day_change(self):
+        """Runs the daily upkeep just after each midnight while the app stays open."""
+        if self.day_change_event:
+            self.day_change_event.cancel()
+        now = time_source.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        self.day_change_event = time_source.schedule_once(self.on_day_change, (midnight - now).total_seconds() + 1)
+
+    def on_day_change_if_needed(self):
+        """Catches up on the upkeep a midnight spent in the background skipped."""
+        if self.rollover_checked is not None and self.rollover_checked != time_source.now().date():
+            self.on_day_change()
+
+    def on_day_change(self, *args):
+        self.day_change_event = None
+        self.check_rollover()
+        self.check_streak()
+        self.clean_old_schedules()
+        self.collect_finished_sessions()
+        self.arm_daily_motivation()
+        self.arm_day_change()
+
+    def arm_daily_motivation(self):
+        """Schedules today's motivation at the configured time (or now if that passed)."""
+        if self.daily_motivation_event:
+            self.daily_motivation_event.cancel()
+        at = load_section("motivation", {}).get("time", "09:00")
+        now = time_source.now()
+        try:
+            when = datetime.combine(now.date(), datetime.strptime(at, "%H:%M").time())
+        except ValueError:
+            when = now
+        self.daily_motivation_event = time_source.schedule_once(
+            self.send_daily_motivation, max(0, (when - now).total_seconds()))
 
     # ---------------- Notifications ----------------
     def send_daily_motivation(self, dt):
-        if not self.load_settings().get("notifications_enabled", True):
+        if not self.notifier.enabled:
             return
 
         data = load_data()
-        today = datetime.now().strftime("%d-%m-%Y")
+        today = time_source.now().strftime("%d-%m-%Y")
         if data.get("motivation", {}).get("last_sent_date") == today:
             return
 
-        notification.notify(
-            title="Daily Study Motivation",
-            message=self.daily_quote,
-            app_name="Study Planner"
-        )
+        self.notifier.post("Daily Study Motivation", self.daily_quote)
 
         data.setdefault("motivation", {})["last_sent_date"] = today
         save_data(data)
 
-    def schedule_notification(self, name, time_str):
-        if not self.load_settings().get("notifications_enabled", True):
+    def get_reminder_queue(self):
+        if self.reminders is None:
+            stored = load_section("reminders")
+            if stored is None:
+                # ✅ First run with the queue: seed it from existing schedules
+                self.reminders = ReminderQueue.from_schedules(self.get_all_schedules(), time_source.time())
+            else:
+                self.reminders = ReminderQueue.from_dict(stored)
+        return self.reminders
+
+    def get_missed_reminders(self):
+        """
+        Reminders missed since the last run, including inactive profiles' ones,
+        which arm_reminders() would otherwise prune unreported.
+        """
+        reminders = self.get_reminder_queue()
+        now = time_source.time()
+        missed = list(reminders.missed(now))
+        for ts, profile_id, name in self.profiles.reminders.missed(reminders.last_run, now):
+            missed.append([ts, f"{self.profiles.name(profile_id)}: {name}"])
+        return sorted(missed)
+
+    def pack_reminder_queue(self, data):
+        """Puts the queue into `data`, so the caller's save_data writes both at once."""
+        if self.reminders is not None:
+            data["reminders"] = self.reminders.to_dict()
+
+    def save_reminder_queue(self):
+        if self.reminders is None:
             return
+        data = load_data()
+        self.pack_reminder_queue(data)
+        save_data(data)
 
-        try:
-            now = datetime.now()
-            target_time = datetime.strptime(time_str, "%H:%M").time()
-            notify_at = datetime.combine(now.date(), target_time)
+    def request_watermark_save(self):
+        """Persists last_run shortly, so a crash does not replay delivered reminders as missed."""
+        if self.watermark_event is None:
+            self.watermark_event = time_source.schedule_once(self.flush_reminder_watermark,
+                                                             REMINDER_WATERMARK_DELAY)
+
+    def flush_reminder_watermark(self, *args):
+        self.watermark_event = None
+        self.save_reminder_queue()
+
+    def arm_reminders(self, *args):
+        """
+        Arms Clock events only for reminders within the horizon, then
+        re-arms when the horizon runs out. Past entries are pruned.
+        """
+        for event in self.scheduled_notifications:
+            if event:
+                event.cancel()
+        self.scheduled_notifications.clear()
+        if self.reminder_rearm_event:
+            self.reminder_rearm_event.cancel()
+            self.reminder_rearm_event = None
+
+        reminders = self.get_reminder_queue()
+        now = time_source.time()
+        reminders.last_run = now
+        reminders.prune(now)
+        self.request_watermark_save()
+        if not self.notifier.enabled:
+            return
 
-            if notify_at < now:
-                notify_at += timedelta(days=1)
+        for ts, name in reminders.upcoming(now):
+            self.arm_reminder(ts, name)
 
-            seconds = (notify_at - now).total_seconds()
-            event = Clock.schedule_once(lambda dt: self.send_notification(name), seconds)
-            self.scheduled_notifications.append(event)
-        except Exception as e:
-            print(f"[ERROR] Failed to schedule: {e}")
+        # ✅ Inactive profiles still get their reminders, named after the profile
+        merged = self.profiles.reminders
+        merged.prune(now)
+        for ts, profile_id, name in merged.upcoming(now):
+            self.arm_reminder(ts, f"{self.profiles.name(profile_id)}: {name}")
+        self.reminder_rearm_event = time_source.schedule_once(self.arm_reminders, REMINDER_HORIZON)
+
+    def arm_reminder(self, ts, name):
+        if not self.notifier.enabled:
+            return
+        event = time_source.schedule_once(lambda dt: self.fire_reminder(ts, name), max(0, ts - time_source.time()))
+        # Drop events that already fired so the list stays bounded
+        self.scheduled_notifications = [e for e in self.scheduled_notifications if e.is_triggered]
+        self.scheduled_notifications.append(event)
+
+    def fire_reminder(self, ts, name):
+        reminders = self.get_reminder_queue()
+        reminders.last_run = max(reminders.last_run, ts)
+        self.request_watermark_save()
+        self.send_notification(name)
+
+    def show_missed_reminders(self, missed):
+        lines = []
+        for ts, name in missed[-6:]:
+            lines.append(f"{datetime.fromtimestamp(ts).strftime('%d-%m %H:%M')}  {self.reminder_text(name)}")
+        if len(missed) > 6:
+            lines.insert(0, f"... and {len(missed) - 6} earlier")
+
+        dialog = MDDialog(
+            title=f"{len(missed)} Missed Reminder{'s' if len(missed) > 1 else ''}",
+            text="\n".join(lines),
+            buttons=[MDRaisedButton(text="OK", on_release=lambda x: dialog.dismiss())]
+        )
+        dialog.open()
 
     def send_notification(self, name):
-        if self.load_settings().get("notifications_enabled", True):
-            notification.notify(
-                title="Study Reminder",
-                message=f"It's time for: {name}",
-                app_name="Study Planner"
-            )
+        self.notifier.remind(self.reminder_text(name))
 
     def cancel_all_notifications(self):
         for event in self.scheduled_notifications:
             if event:
                 event.cancel()
         self.scheduled_notifications.clear()
+        if self.reminder_rearm_event:
+            self.reminder_rearm_event.cancel()
+            self.reminder_rearm_event = None
 
         if self.daily_motivation_event:
             self.daily_motivation_event.cancel()
             self.daily_motivation_event = None
 
     def reschedule_all_notifications(self):
-        for schedule in self.get_all_schedules():
-            if schedule.get("notification"):
-                self.schedule_notification(schedule["name"], schedule["time"])
+        self.arm_reminders()
+
+    def show_data_error(self, error):
+        """A refused save: the store still holds the last good data, so screens re-render from it."""
+        self.schedule_index = None
+        self.week_cache.invalidate()
+        self.due_index = None
+        self.subject_stats = None
+        store_events.publish(DATA_REPLACED)
+        dialog = MDDialog(
+            title="Not Saved",
+            text=f"The change was not saved because it would damage your data ({error}).",
+            buttons=[MDRaisedButton(text="OK", on_release=lambda x: dialog.dismiss())]
+        )
+        dialog.open()
+
+    def show_recovery_note(self):
+        global _recovery_note
+        dialog = MDDialog(
+            title="Data Recovered",
+            text=_recovery_note,
+            buttons=[MDRaisedButton(text="OK", on_release=lambda x: dialog.dismiss())]
+        )
+        _recovery_note = None
+        dialog.open()
+
+    # ---------------- Undo ----------------
+    def undo(self, *args, command=None):
+        command = self.history.undo(command)
+        if command:
+            self.show_undo_snackbar(f"Undone: {command.label}", action="REDO")
+
+    def redo(self, *args, command=None):
+        command = self.history.redo(command)
+        if command:
+            self.show_undo_snackbar(f"Redone: {command.label}")
+
+    def show_undo_snackbar(self, text, action="UNDO"):
+        # Bound to the command announced here: after a newer change the button does nothing
+        command = self.history.top(redo=action == "REDO")
+        if command is None:
+            return
+        callback = self.undo if action == "UNDO" else self.redo
+
+        def run(*args):
+            bar.dismiss()
+            callback(command=command)
+
+        if MDSnackbar is not None:
+            bar = MDSnackbar(
+                MDLabel(text=text, theme_text_color="Custom", text_color=(1, 1, 1, 1)),
+                MDSnackbarActionButton(text=action, theme_text_color="Custom",
+                                       text_color=self.theme_cls.primary_light, on_release=run),
+                y=dp(24), pos_hint={"center_x": 0.5}, size_hint_x=0.9,
+            )
+        else:
+            bar = Snackbar(text=text, snackbar_x="10dp", snackbar_y="10dp",
+                           size_hint_x=(Window.width - dp(20)) / Window.width,
+                           buttons=[MDFlatButton(text=action, theme_text_color="Custom",
+                                                 text_color=self.theme_cls.primary_light, on_release=run)])
+        bar.open()
 
     # ---------------- Dialogs ----------------
     def show_schedule_dialog(self, schedule):
         dialog = MDDialog(
             title=f"[b]{schedule['name']}[/b] - {schedule['subject']}",
-            text=f"Time: {schedule['time']}\nDescription: {schedule['description']}\nDate: {schedule['date']}\nNotification: {'On' if schedule['notification'] else 'Off'}",
+            text=f"Time: {schedule['time']} ({schedule.get('duration', DEFAULT_SESSION_MINUTES)} min)\nDescription: {schedule['description']}\nDate: {schedule['date']}\nNotification: {'On' if schedule['notification'] else 'Off'}",
             buttons=[
+                MDFlatButton(text="Focus", theme_text_color="Custom",text_color=self.theme_cls.primary_color,
+                             on_release=lambda x: self.open_focus_dialog(subject=schedule['subject'], schedule=schedule['name'],
+                                                                         task=schedule.get('task', ''), dialog=dialog)),
                 MDFlatButton(text="Delete", theme_text_color="Custom",text_color=self.theme_cls.primary_color,
                              on_release=lambda x: self.delete_schedule_dialog(schedule, dialog)),
                 MDRaisedButton(text="Close", on_release=lambda x: dialog.dismiss())
@@ -1225,15 +5942,18 @@ class StudyPlannerApp(MDApp):
         dialog.open()
 
     def delete_schedule_dialog(self, schedule, dialog):
-        self.delete_schedule(schedule["name"])
         dialog.dismiss()
-        self.root.get_screen("schedule_screen").load_schedules()
+        if self.delete_schedule(schedule["name"]):
+            self.show_undo_snackbar(f"Deleted '{schedule['name']}'")
 
     def show_task_dialog(self, task):
         dialog = MDDialog(
             title=f"[b]{task['name']}[/b]",
             text=f"Description: {task['description']}\nDue: {task['due_date']}\nType: {task['task_type']}\nStatus: {task['status']}",
             buttons=[
+                MDFlatButton(text="Focus", theme_text_color="Custom",text_color=self.theme_cls.primary_color,
+                             on_release=lambda x: self.open_focus_dialog(task=task['name'], subject=task.get('subject', ''),
+                                                                         dialog=dialog)),
                 MDFlatButton(text="Edit", theme_text_color="Custom",text_color=self.theme_cls.primary_color,
                              on_release=lambda x: self.edit_task_dialog(task, dialog)),
                 MDFlatButton(text="Delete", theme_text_color="Custom",text_color=self.theme_cls.primary_color,
@@ -1248,21 +5968,22 @@ class StudyPlannerApp(MDApp):
         self.show_edit_task_screen(task)
 
     def delete_task_dialog(self, task, dialog):
-        self.delete_task(task["name"])
         dialog.dismiss()
-        self.root.get_screen("tasks_screen").load_tasks()
+        if self.delete_task(task["name"]):
+            self.show_undo_snackbar(f"Deleted '{task['name']}'")
 
     def show_edit_task_screen(self, task):
         pass  # Reserved for future
     
     def delete_task_dialog(self, task, dialog):
-        self.delete_task(task['name'])
         dialog.dismiss()
-        tasks_screen = self.root.get_screen("tasks_screen")
-        tasks_screen.load_tasks()
+        if self.delete_task(task['name']):
+            self.show_undo_snackbar(f"Deleted '{task['name']}'")
     
     def task_status_changed(self, list_item, active):
         task = list_item.task_data
+        if active == (task.get("status") == "Done"):
+            return  # checkbox only caught up with data already saved (e.g. bulk edit)
         new_status = "Done" if active else "In Progress"
         self.update_task(task['name'], {"status": new_status})
 
@@ -1274,10 +5995,9 @@ class StudyPlannerApp(MDApp):
         if active:
             self.update_streak()
 
-        # Optional: update stats
-        if "stats_screen" in self.root.screen_names:
-            stats_screen = self.root.get_screen("stats_screen")
-            stats_screen.update_stats()
+        # The card is already up to date; other screens refresh on their next visit
+        if self.root.current == "tasks_screen":
+            self.root.get_screen("tasks_screen").mark_clean()
 
 if __name__ == "__main__":
     StudyPlannerApp().run()
@@ -0,0 +1,23 @@
+import os
+import sys
+
+# Kivy must not parse pytest's arguments or write log files
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_FILELOG", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Points the data store at an empty temporary folder."""
+    monkeypatch.setattr(main, "APP_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "PROFILES_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setattr(main, "PROFILE_INDEX_FILE", str(tmp_path / "profiles.json"))
+    main.set_active_profile(main.DEFAULT_PROFILE)
+    yield tmp_path
+    main.set_active_profile(main.DEFAULT_PROFILE)
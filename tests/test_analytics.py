@@ -0,0 +1,18 @@
+from datetime import date
+
+import main
+
+
+def test_cached_result_expires_at_midnight(monkeypatch):
+    engine = main.AnalyticsEngine()
+    calls = []
+    monkeypatch.setattr(engine, "compute", lambda data, today: calls.append(today) or {"today": today})
+    monkeypatch.setattr(main, "time_source", main.VirtualTimeSource(main.datetime(2026, 10, 19, 23, 59)))
+
+    assert engine.get({})["today"] == date(2026, 10, 19)
+    engine.get({})
+    assert len(calls) == 1
+
+    main.time_source.advance(120)
+    assert engine.get({})["today"] == date(2026, 10, 20)
+    assert len(calls) == 2
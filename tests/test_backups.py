@@ -0,0 +1,80 @@
+import os
+from datetime import datetime, timedelta
+
+import main
+
+
+def sample_data():
+    return {
+        "schema_version": main.SCHEMA_VERSION,
+        "tasks": [
+            {"name": "Essay", "due_date": "20-10-2026", "status": "Pending"},
+            {"name": "Lab", "due_date": "03-11-2026", "status": "Done"},
+            {"name": "Notes", "due_date": "21-10-2026", "status": "Pending"},
+        ],
+        "schedules": [{"name": "S1", "date": "20-10-2026", "time": "10:00"}],
+        "profile": {"name": "Ada"},
+    }
+
+
+def chunk_count(store):
+    folder = os.path.join(store.root, "chunks")
+    return sum(len(files) for _, _, files in os.walk(folder))
+
+
+def test_backup_round_trip(store):
+    backups = main.BackupStore(str(store / "backups"))
+    backup_id = backups.backup(sample_data(), now=datetime(2026, 10, 19, 8))
+    assert backups.list() == [backup_id]
+    assert backups.restore(backup_id) == sample_data()
+
+
+def test_identical_content_is_stored_once(store):
+    backups = main.BackupStore(str(store / "backups"))
+    data = sample_data()
+    backups.backup(data, now=datetime(2026, 10, 19, 8))
+    chunks = chunk_count(backups)
+    assert backups.backup(data, now=datetime(2026, 10, 19, 9)) is None
+
+    data["tasks"][1]["status"] = "Pending"  # only the November group changes
+    assert backups.backup(data, now=datetime(2026, 10, 19, 10))
+    assert chunk_count(backups) == chunks + 1
+
+
+def test_prune_keeps_the_retention_limits(store):
+    backups = main.BackupStore(str(store / "backups"))
+    start = datetime(2026, 10, 1, 8)
+    data = sample_data()
+    for day in range(10):
+        for hour in (0, 6):
+            data["profile"]["name"] = f"Ada {day}-{hour}"
+            backups.backup(data, now=start + timedelta(days=day, hours=hour))
+    backups.prune({"last": 3, "daily": 4, "weekly": 0, "monthly": 0})
+    kept = backups.list()
+    # the newest three, plus the newest backup of each of the four newest days
+    assert kept == ["20261010-140000-000000", "20261010-080000-000000", "20261009-140000-000000",
+                    "20261008-140000-000000", "20261007-140000-000000"]
+    assert backups.restore(kept[-1])["profile"]["name"] == "Ada 6-6"
+
+
+def test_garbage_collection_removes_orphaned_chunks_only(store):
+    backups = main.BackupStore(str(store / "backups"))
+    backup_id = backups.backup(sample_data(), now=datetime(2026, 10, 19, 8))
+    orphan = backups._put_chunk({"left": "over"})
+    assert backups.collect_garbage() == 1
+    assert not os.path.exists(backups._chunk_path(orphan))
+    assert backups.restore(backup_id) == sample_data()
+
+
+def test_damaged_store_is_quarantined_then_restored(store, monkeypatch):
+    monkeypatch.setattr(main, "_recovery_note", None)
+    main.save_data(sample_data())
+    main.BackupStore().backup(sample_data(), now=datetime(2026, 10, 19, 8))
+    with open(main.profile_path("snapshot"), "wb") as f:
+        f.write(b"not a snapshot")
+    main.set_active_profile(main.DEFAULT_PROFILE)
+
+    data = main.load_data()
+    assert [t["name"] for t in data["tasks"]] == ["Essay", "Lab", "Notes"]
+    assert any(name.startswith("study_buddy.snap.corrupt-") for name in os.listdir(store))
+    assert "restored from the backup of Oct 19, 2026" in main._recovery_note
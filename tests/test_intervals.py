@@ -0,0 +1,93 @@
+import random
+
+import main
+
+
+def naive_overlaps(spans, start, end):
+    return [item for s, e, item in spans if s < end and e > start]
+
+
+def naive_pairs(spans):
+    return sum(1 for i, (s1, e1, _) in enumerate(spans) for s2, e2, _ in spans[i + 1:] if s1 < e2 and s2 < e1)
+
+
+def test_overlapping_matches_brute_force():
+    rng = random.Random(7)
+    day, spans = main.DayIntervals(), []
+    for n in range(300):
+        start = rng.randrange(0, main.DAY_MINUTES)
+        end = min(main.DAY_MINUTES, start + rng.randrange(1, 240))
+        item = {"name": f"s{n}"}
+        day.add(start, end, item)
+        spans.append((start, end, item))
+        if n % 25 == 0:
+            q_start = rng.randrange(0, main.DAY_MINUTES)
+            q_end = q_start + rng.randrange(1, 120)
+            got = sorted(i["name"] for i in day.overlapping(q_start, q_end))
+            assert got == sorted(i["name"] for i in naive_overlaps(spans, q_start, q_end))
+    assert day.conflicts == naive_pairs(spans)
+
+
+def test_one_long_session_does_not_hide_or_invent_matches():
+    day = main.DayIntervals()
+    day.add(0, 1000, {"name": "long"})
+    for minute in range(10, 900, 10):
+        day.add(minute, minute + 5, {"name": f"short {minute}"})
+    assert [i["name"] for i in day.overlapping(996, 1010)] == ["long"]
+    assert [i["name"] for i in day.overlapping(1000, 1010)] == []
+
+
+def test_conflict_count_follows_removals():
+    day = main.DayIntervals()
+    day.add(600, 660, {"name": "a"})
+    day.add(630, 690, {"name": "b"})
+    day.add(700, 760, {"name": "c"})
+    assert day.has_conflict()
+    day.remove("b")
+    assert not day.has_conflict() and day.conflicts == 0
+    assert len(day) == 2
+
+
+def test_sessions_crossing_midnight_block_the_next_morning():
+    index = main.ScheduleIndex([
+        {"name": "Late", "date": "19-10-2026", "time": "23:00", "duration": 120},
+    ])
+    assert [s["name"] for s in index.overlaps("20-10-2026", "00:30", 30)] == ["Late"]
+    assert index.overlaps("20-10-2026", "01:00", 30) == []
+    assert [s["name"] for s in index.overlaps("19-10-2026", "23:30", 10)] == ["Late"]
+    # a spill-over is not listed among the next day's own sessions
+    assert index.day("20-10-2026").items == []
+
+    index.add({"name": "Early", "date": "20-10-2026", "time": "00:15", "duration": 30})
+    assert "20-10-2026" in index.conflict_days
+    index.remove("Late")
+    assert "20-10-2026" not in index.conflict_days
+
+
+def test_query_crossing_midnight_sees_both_days():
+    index = main.ScheduleIndex([{"name": "Morning", "date": "20-10-2026", "time": "00:20", "duration": 30}])
+    assert [s["name"] for s in index.overlaps("19-10-2026", "23:50", 60)] == ["Morning"]
+
+
+def test_mixed_inserts_and_removals_match_brute_force():
+    rng = random.Random(11)
+    day, spans = main.DayIntervals(), []
+    for n in range(600):
+        if spans and rng.random() < 0.4:
+            name = rng.choice(spans)[2]["name"]
+            day.remove(name)
+            spans = [span for span in spans if span[2]["name"] != name]
+        else:
+            start = rng.randrange(0, main.DAY_MINUTES, 15)
+            end = min(main.DAY_MINUTES, start + rng.randrange(15, 180))
+            item = {"name": f"s{n}"}
+            day.add(start, end, item)
+            spans.append((start, end, item))
+        q_start = rng.randrange(0, main.DAY_MINUTES)
+        q_end = q_start + rng.randrange(1, 120)
+        got = sorted(i["name"] for i in day.overlapping(q_start, q_end))
+        assert got == sorted(i["name"] for i in naive_overlaps(spans, q_start, q_end))
+        assert day.count_started(q_start) == sum(1 for s, _, _ in spans if s < q_start)
+        assert day.conflicts == naive_pairs(spans)
+    assert len(day) == len(spans)
+    assert day.starts == sorted(s for s, _, _ in spans)
@@ -0,0 +1,70 @@
+import http.client
+import json
+import socket
+
+import main
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind((main.API_HOST, 0))
+        return s.getsockname()[1]
+
+
+def get(port, path, host=None, etag=None):
+    conn = http.client.HTTPConnection(main.API_HOST, port, timeout=5)
+    headers = {"Host": host or f"localhost:{port}"}
+    if etag:
+        headers["If-None-Match"] = etag
+    conn.request("GET", path, headers=headers)
+    response = conn.getresponse()
+    return response.status, response.getheader("ETag"), response.read()
+
+
+def test_serves_published_copies_only():
+    live = {"count": 1}
+    api = main.LocalApiServer({"/stats": (("tasks",), lambda: dict(live))}, port=free_port())
+    assert api.start()
+    try:
+        status, etag, body = get(api.port, "/stats")
+        assert status == 200 and json.loads(body) == {"count": 1}
+
+        # Unpublished changes stay invisible to the server thread
+        live["count"] = 2
+        assert get(api.port, "/stats", etag=etag)[0] == 304
+
+        api.on_store_change(main.Change(main.TASK_UPDATED, "tasks", {}))
+        status, _, body = get(api.port, "/stats", etag=etag)
+        assert status == 200 and json.loads(body) == {"count": 2}
+    finally:
+        api.stop()
+
+
+def test_only_routes_of_the_changed_slice_are_copied():
+    copies = []
+    api = main.LocalApiServer({
+        "/tasks": (("tasks",), lambda: copies.append("tasks") or []),
+        "/schedules": (("schedules",), lambda: copies.append("schedules") or []),
+    }, port=free_port())
+    assert api.start()
+    try:
+        _, etag, _ = get(api.port, "/tasks")
+        del copies[:]
+        api.on_store_change(main.Change(main.SCHEDULE_ADDED, "schedules", {}))
+        api.on_store_change(main.Change(main.SETTINGS_CHANGED, "settings", {}))
+        assert copies == ["schedules"]
+        assert get(api.port, "/tasks", etag=etag)[0] == 304
+        api.on_store_change(main.Change(main.DATA_REPLACED, None, {}))
+        assert sorted(copies) == ["schedules", "schedules", "tasks"]
+    finally:
+        api.stop()
+
+
+def test_rejects_foreign_host_header():
+    api = main.LocalApiServer({"/stats": ((), dict)}, port=free_port())
+    assert api.start()
+    try:
+        assert get(api.port, "/stats", host="evil.example")[0] == 403
+        assert get(api.port, "/stats", host=f"{main.API_HOST}:{api.port}")[0] == 200
+    finally:
+        api.stop()
@@ -0,0 +1,93 @@
+import json
+import os
+
+import pytest
+
+import main
+
+
+def write_json(store, data):
+    with open(main.profile_path("data"), "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def test_old_records_get_defaults(store):
+    data = main.upgrade_data({
+        "schema_version": 1,
+        "tasks": [{"name": "Essay"}],
+        "schedules": [{"name": "S1", "date": "20-10-2026"}],
+        "settings": {},
+    })
+    assert data["tasks"][0]["status"] == "Pending"
+    assert data["tasks"][0]["effort"] == 1.0
+    assert data["schedules"][0]["created_at"] == "20-10-2026"
+    assert data["schedules"][0]["duration"] == main.DEFAULT_SESSION_MINUTES
+    assert data["settings"]["theme"] == "Light"
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_opening_an_old_file_does_not_rewrite_it(store, version):
+    main.write_snapshot({"schema_version": version, "tasks": [{"name": "Essay", "subject": "Math"}]},
+                        main.profile_path("snapshot"))
+    path = main.profile_path("snapshot")
+    os.utime(path, (1_000_000_000, 1_000_000_000))
+    with open(path, "rb") as f:
+        before = f.read()
+
+    assert main.load_section("tasks")[0]["name"] == "Essay"
+    assert main.load_data()["schema_version"] == version  # upgraded in memory, not yet saved
+    assert os.stat(path).st_mtime == 1_000_000_000
+    with open(path, "rb") as f:
+        assert f.read() == before
+
+
+def test_the_first_save_runs_the_store_wide_step(store):
+    write_json(store, {"schema_version": 1, "tasks": [{"name": "Essay", "subject": "Math"}]})
+    data = main.load_data()
+    assert "subject_id" not in data["tasks"][0]
+    main.save_data(data)
+
+    main.set_active_profile(main.DEFAULT_PROFILE)
+    data = main.load_data()
+    assert data["schema_version"] == main.SCHEMA_VERSION
+    assert data["tasks"][0]["subject_id"] == 1
+    assert data["subjects"][0]["name"] == "Math"
+
+
+def test_subject_ids_agree_before_and_after_the_first_save(store):
+    write_json(store, {"schema_version": 2, "schedules": [{"name": "S1", "subject": "Physics"}],
+                       "tasks": [{"name": "Essay", "subject": "Math"}]})
+    app = main.StudyPlannerApp()
+    before = app.get_subjects().to_list()
+    app.add_task({"name": "Lab", "description": "", "due_date": "20-10-2026", "task_type": "Daily",
+                  "status": "Pending", "effort": 1, "priority": "Medium", "subject": "Chemistry"})
+    assert main.load_section("subjects")[:2] == before
+    assert [t["subject_id"] for t in main.load_section("tasks")] == [2, 3]
+
+
+def test_damaged_file_is_quarantined(store):
+    with open(main.profile_path("snapshot"), "wb") as f:
+        f.write(b"not a snapshot")
+    data = main.load_data()
+    assert data["tasks"] == []
+    assert any(name.startswith("study_buddy.snap.corrupt-") for name in os.listdir(store))
+
+
+def test_os_errors_are_raised_not_quarantined(store, monkeypatch):
+    main.save_data(main._default_data())
+    main.set_active_profile(main.DEFAULT_PROFILE)
+
+    def locked(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(main, "_read_snapshot", locked)
+    with pytest.raises(PermissionError):
+        main.load_data()
+    assert os.path.exists(main.profile_path("snapshot"))
+
+
+def test_invalid_data_is_refused(store):
+    main.save_data(main._default_data())
+    with pytest.raises(main.InvalidDataError):
+        main.save_data({"tasks": [{"name": 1}]})
+    assert main.load_data()["tasks"] == []
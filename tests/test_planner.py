@@ -0,0 +1,31 @@
+from datetime import datetime
+
+import main
+
+NOW = datetime(2026, 10, 19, 8, 0)
+
+
+def task(name, effort, due="21-10-2026", **fields):
+    return dict({"name": name, "due_date": due, "status": "Pending", "effort": effort}, **fields)
+
+
+def planned_minutes(sessions, name):
+    return sum(s["duration"] for s in sessions if s["task"] == name)
+
+
+def test_effort_is_packed_into_free_windows():
+    sessions = main.plan_study_sessions([task("Essay", 2.5)], [], [["16:00", "21:00"]], now=NOW)
+    assert planned_minutes(sessions, "Essay") == 150
+    assert all("16:00" <= s["time"] < "21:00" for s in sessions)
+
+
+def test_zero_effort_plans_nothing_and_missing_effort_plans_an_hour():
+    sessions = main.plan_study_sessions([task("Done soon", 0), task("Unknown", None)], [], now=NOW)
+    assert planned_minutes(sessions, "Done soon") == 0
+    assert planned_minutes(sessions, "Unknown") == 60
+
+
+def test_existing_sessions_are_not_double_booked():
+    busy = [{"name": "Class", "date": "19-10-2026", "time": "16:00", "duration": 300}]
+    sessions = main.plan_study_sessions([task("Essay", 1, due="19-10-2026")], busy, [["16:00", "21:00"]], now=NOW)
+    assert sessions == []
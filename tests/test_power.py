@@ -0,0 +1,25 @@
+import main
+
+
+def test_pausing_keeps_the_frame_rate_capped(monkeypatch):
+    caps = []
+    monkeypatch.setattr(main, "set_frame_cap", caps.append)
+    power = main.PowerManager(saver=True)
+    power.start()
+    assert caps[-1] == main.ACTIVE_FPS
+    power.stop()
+    assert caps[-1] == main.SAVER_IDLE_FPS and power.idle
+    power.on_input()  # a stray event after stop must not lift the cap
+    assert caps[-1] == main.SAVER_IDLE_FPS
+    power.start()
+    assert caps[-1] == main.ACTIVE_FPS
+
+
+def test_low_end_means_little_memory_not_few_cores(monkeypatch):
+    monkeypatch.setattr(main, "platform", "linux")
+    monkeypatch.setattr(main.os, "cpu_count", lambda: 2)
+    pages = {"SC_PAGE_SIZE": 4096, "SC_PHYS_PAGES": 8 * 1024 ** 3 // 4096}
+    monkeypatch.setattr(main.os, "sysconf", lambda name: pages[name])
+    assert not main.is_low_end_device()
+    pages["SC_PHYS_PAGES"] = 1024 ** 3 // 4096
+    assert main.is_low_end_device()
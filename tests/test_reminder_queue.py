@@ -0,0 +1,52 @@
+import main
+
+
+def test_entries_stay_sorted_by_fire_time():
+    queue = main.ReminderQueue([(300, "c"), (100, "a")])
+    queue.add(200, "b")
+    queue.add(100, "a2")
+    assert queue.entries == [[100, "a"], [100, "a2"], [200, "b"], [300, "c"]]
+    assert queue.times == [100, 100, 200, 300]
+
+
+def test_missed_is_the_range_since_the_last_run():
+    queue = main.ReminderQueue([(100, "a"), (200, "b"), (300, "c"), (400, "d")], last_run=100)
+    assert queue.missed(300) == [[200, "b"], [300, "c"]]
+    queue.last_run = 300
+    assert queue.missed(350) == []
+
+
+def test_upcoming_respects_the_horizon():
+    queue = main.ReminderQueue([(100, "a"), (200, "b"), (100 + main.REMINDER_HORIZON + 1, "far")])
+    assert queue.upcoming(50) == [[100, "a"], [200, "b"]]
+    assert queue.upcoming(150) == [[200, "b"], [100 + main.REMINDER_HORIZON + 1, "far"]]
+
+
+def test_prune_and_remove_keep_times_in_step():
+    queue = main.ReminderQueue([(100, "a"), (200, "b"), (300, "a"), (400, "c")])
+    queue.prune(200)
+    assert queue.entries == [[200, "b"], [300, "a"], [400, "c"]]
+    queue.remove("a")
+    assert queue.entries == [[200, "b"], [400, "c"]]
+    assert queue.times == [200, 400]
+
+
+def test_round_trip_and_seeding_from_schedules():
+    schedules = [
+        {"name": "On", "date": "20-10-2026", "time": "10:00", "notification": True},
+        {"name": "Off", "date": "20-10-2026", "time": "11:00", "notification": False},
+        {"name": "Broken", "date": "", "time": "", "notification": True},
+    ]
+    queue = main.ReminderQueue.from_schedules(schedules, last_run=5)
+    assert [name for _, name in queue.entries] == ["On"]
+    copy = main.ReminderQueue.from_dict(queue.to_dict())
+    assert copy.entries == queue.entries and copy.last_run == 5
+
+
+def test_merged_queue_reports_missed_before_pruning():
+    merged = main.MergedReminderQueue([(100, "a", "x"), (200, "b", "y"), (300, "a", "z")])
+    assert merged.missed(100, 250) == [[200, "b", "y"]]
+    merged.drop("a")
+    assert merged.missed(0, 400) == [[200, "b", "y"]]
+    merged.prune(250)
+    assert merged.missed(0, 400) == []
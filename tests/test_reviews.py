@@ -0,0 +1,41 @@
+import main
+
+
+def test_pop_due_returns_only_cards_due_by_then():
+    reviews = main.ReviewQueue()
+    reviews.enqueue("a", "Math", "S1", 0)
+    reviews.enqueue("b", "Physics", "S2", main.DAY_SECONDS)
+    assert [card["id"] for card in reviews.pop_due(main.DAY_SECONDS)] == ["a"]
+    assert [card["id"] for card in reviews.pop_due(2 * main.DAY_SECONDS)] == ["a", "b"]
+
+
+def test_regrade_leaves_no_stale_due_entry():
+    reviews = main.ReviewQueue()
+    reviews.enqueue("a", "Math", "S1", 0)
+    reviews.pop_due(main.DAY_SECONDS)
+    card = reviews.grade("a", 4, main.DAY_SECONDS)
+    assert reviews.due == []
+    assert reviews.pop_due(card["due"] - 1) == []
+    assert [c["id"] for c in reviews.pop_due(card["due"])] == ["a"]
+
+
+def test_well_known_cards_are_retired():
+    reviews = main.ReviewQueue()
+    reviews.enqueue("a", "Math", "S1", 0)
+    now = 0
+    card = reviews.cards["a"]
+    while card is not None:
+        now = card["due"]
+        reviews.pop_due(now)
+        card = reviews.grade("a", 5, now)
+    assert "a" not in reviews.cards
+    assert reviews.subjects["Math"]["interval"] >= main.REVIEW_RETIRE_DAYS
+    assert reviews.pop_due(now + 365 * main.DAY_SECONDS) == []
+
+
+def test_round_trips_through_a_dict():
+    reviews = main.ReviewQueue()
+    reviews.enqueue("a", "Math", "S1", 0)
+    restored = main.ReviewQueue.from_dict(reviews.to_dict())
+    assert restored.cards == reviews.cards
+    assert [c["id"] for c in restored.pop_due(main.DAY_SECONDS)] == ["a"]
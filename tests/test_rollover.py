@@ -0,0 +1,45 @@
+from datetime import date
+
+import main
+
+
+def day(text):
+    return date(*map(int, reversed(text.split("-"))))
+
+
+def test_period_end_of_each_type():
+    assert main.period_end("Daily", day("29-02-2028").toordinal()) == day("29-02-2028")
+    assert main.period_end("Weekly", main.period_key("Weekly", day("21-10-2026"))) == day("25-10-2026")
+    assert main.period_end("Monthly", main.period_key("Monthly", day("10-02-2028"))) == day("29-02-2028")
+    assert main.period_end("Monthly", main.period_key("Monthly", day("10-02-2027"))) == day("28-02-2027")
+    assert main.period_end("Monthly", main.period_key("Monthly", day("31-12-2026"))) == day("31-12-2026")
+
+
+def test_shift_due_date_clamps_to_month_end():
+    assert main.shift_due_date("Monthly", day("31-01-2027"), 1) == day("28-02-2027")
+    assert main.shift_due_date("Monthly", day("31-01-2028"), 1) == day("29-02-2028")
+    assert main.shift_due_date("Monthly", day("29-02-2028"), 12) == day("28-02-2029")
+    assert main.shift_due_date("Monthly", day("15-11-2026"), 3) == day("15-02-2027")
+
+
+def test_shift_due_date_by_days_and_weeks():
+    assert main.shift_due_date("Daily", day("28-02-2028"), 1) == day("29-02-2028")
+    assert main.shift_due_date("Weekly", day("28-12-2026"), 1) == day("04-01-2027")
+
+
+def test_weekly_rollover_moves_by_whole_weeks():
+    data = {"tasks": [{"name": "Quiz", "task_type": "Weekly", "repeat": True, "status": "Done",
+                       "due_date": "23-10-2026", "created_at": "19-10-2026"}]}
+    assert main.roll_over_tasks(data, day("04-11-2026"))
+    task = data["tasks"][0]
+    assert task["due_date"] == "06-11-2026"
+    assert task["status"] == "Pending"
+    assert data["task_history"][0]["period_end"] == "25-10-2026"
+
+
+def test_one_off_tasks_are_left_alone():
+    data = {"tasks": [{"name": "Essay", "task_type": "Daily", "status": "Pending",
+                       "due_date": "19-10-2026", "created_at": "19-10-2026"}]}
+    main.roll_over_tasks(data, day("22-10-2026"))
+    assert data["tasks"][0]["due_date"] == "19-10-2026"
+    assert data.get("task_history") == []
@@ -0,0 +1,85 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+
+START = datetime(2026, 10, 19, 8)  # a Monday
+
+
+@pytest.fixture
+def app(store):
+    return main.StudyPlannerApp()
+
+
+def schedule(name, day, time="10:00", notification=True):
+    return {"name": name, "subject": "Math", "time": time, "date": (START + timedelta(days=day)).strftime("%d-%m-%Y"),
+            "description": "", "notification": notification, "duration": 60}
+
+
+def test_reminders_fire_on_their_days(app):
+    with main.SimulationHarness(app, START) as sim:
+        for day in range(3):
+            app.add_schedule(schedule(f"S{day}", day))
+        sim.run(days=3)
+    fired = [(when.date(), message) for when, title, message in sim.sent
+             if title == "Study Reminder" and message.startswith("S")]
+    assert fired == [((START + timedelta(days=day)).date(), f"S{day}") for day in range(3)]
+
+
+def test_finished_sessions_become_reviews(app):
+    with main.SimulationHarness(app, START) as sim:
+        app.add_schedule(schedule("S0", 0))
+        sim.run(days=2)
+    assert "Review: Math" in [message for _, title, message in sim.sent if title == "Study Reminder"]
+
+
+def test_rendering_due_reviews_does_not_save(app, monkeypatch):
+    with main.SimulationHarness(app, START) as sim:
+        app.add_schedule(schedule("S0", 0, notification=False))
+        sim.run(hours=4)
+        saves = []
+        save_data = main.save_data
+        monkeypatch.setattr(main, "save_data", lambda data: saves.append(data) or save_data(data))
+        app.get_due_reviews()
+        assert saves == []
+
+
+def test_daily_tasks_roll_over_at_midnight(app):
+    with main.SimulationHarness(app, START) as sim:
+        app.add_task({"name": "Flashcards", "description": "", "due_date": START.strftime("%d-%m-%Y"),
+                      "task_type": "Daily", "repeat": True, "status": "Done", "effort": 1, "priority": "Medium", "subject": "Math"})
+        sim.run(days=1)
+        task = main.load_section("tasks")[0]
+        assert task["status"] == "Pending"
+        assert task["due_date"] == (START + timedelta(days=1)).strftime("%d-%m-%Y")
+
+
+def test_old_weeks_are_cleaned_up(app):
+    with main.SimulationHarness(app, START) as sim:
+        app.add_schedule(schedule("S0", 0, notification=False))
+        app.add_schedule(schedule("S14", 14, notification=False))
+        sim.run(days=8)
+        assert [s["name"] for s in main.load_section("schedules")] == ["S14"]
+
+
+def test_the_simulated_store_stays_in_memory(app):
+    with main.SimulationHarness(app, START) as sim:
+        app.add_schedule(schedule("S0", 0))
+        sim.run(days=2)
+        assert [s["name"] for s in main.load_section("schedules")] == ["S0"]
+        main.set_active_profile(main.DEFAULT_PROFILE)
+        assert [s["name"] for s in main.load_data()["schedules"]] == ["S0"]
+        assert not os.path.exists(main.profile_path("snapshot"))
+
+
+def test_the_real_store_is_left_alone(app, store):
+    before = sorted(os.listdir(store))
+    with main.SimulationHarness(app, START) as sim:
+        root = sim.root
+        app.add_schedule(schedule("S0", 0))
+        sim.run(days=2)
+    assert sorted(os.listdir(store)) == before
+    assert not os.path.exists(root)
+    assert main.load_section("schedules", []) == []
@@ -0,0 +1,75 @@
+import json
+
+import main
+
+
+def sample_data():
+    return {
+        "schema_version": main.SCHEMA_VERSION,
+        "tasks": [
+            {"name": "Essay", "due_date": "20-10-2026", "status": "Pending", "effort": 1.5, "done": False},
+            {"name": "Lab", "due_date": "21-10-2026", "status": "Done", "effort": 2.0, "done": True},
+            {"name": "Notes", "due_date": "not a date", "tags": ["a", "b"], "extra": None},
+        ],
+        "schedules": [],
+        "profile": {"name": "Ada", "title": "Student"},
+        "settings": {"theme": "Dark"},
+    }
+
+
+def test_snapshot_round_trip(store):
+    path = str(store / "data.snap")
+    main.write_snapshot(sample_data(), path)
+    with main.SnapshotReader(path) as reader:
+        assert reader.read_all() == sample_data()
+
+
+def test_dates_are_stored_as_ordinals_only_when_they_round_trip(store):
+    path = str(store / "data.snap")
+    data = {"tasks": [{"due_date": "20-10-2026"}, {"due_date": "31-02-2026"}, {"due_date": "1-1-2026"}]}
+    main.write_snapshot(data, path)
+    with main.SnapshotReader(path) as reader:
+        assert reader.section("tasks") == data["tasks"]
+
+
+def test_sections_decode_independently(store, monkeypatch):
+    main.write_snapshot(sample_data(), main.profile_path("snapshot"))
+    monkeypatch.setattr(main.SnapshotReader, "read_all", lambda self: (_ for _ in ()).throw(AssertionError))
+    assert main.load_section("profile") == {"name": "Ada", "title": "Student"}
+    assert main.load_section("missing", "fallback") == "fallback"
+
+
+def test_load_data_fills_the_cache(store, monkeypatch):
+    main.write_snapshot(sample_data(), main.profile_path("snapshot"))
+    data = main.load_data()
+    assert data["profile"]["name"] == "Ada"
+    monkeypatch.setattr(main, "_read_snapshot", lambda path: (_ for _ in ()).throw(AssertionError))
+    assert main.load_data(use_cache=True) is data
+    assert main.load_section("settings") == {"theme": "Dark"}
+
+
+def test_snapshot_is_smaller_than_pretty_json(store):
+    data = {"tasks": [{"name": f"Task {i}", "due_date": "20-10-2026", "status": "Pending",
+                       "task_type": "Daily", "effort": 1.0} for i in range(500)]}
+    path = str(store / "data.snap")
+    main.write_snapshot(data, path)
+    assert (store / "data.snap").stat().st_size < len(json.dumps(data, indent=4))
+
+
+def test_saving_supersedes_the_other_format(store, monkeypatch):
+    legacy = main.profile_path("data")
+    with open(legacy, "w", encoding="utf-8") as f:
+        json.dump(sample_data(), f)
+    data = main.load_data()
+    data["profile"]["name"] = "Grace"
+    main.save_data(data)
+    assert not (store / "study_buddy.json").exists()
+    assert (store / "study_buddy.json.superseded").exists()
+
+    # Switching back to JSON reads the newer snapshot rather than a stale file
+    monkeypatch.setattr(main, "USE_BINARY_SNAPSHOT", False)
+    main.set_active_profile(main.DEFAULT_PROFILE)
+    assert main.load_data()["profile"]["name"] == "Grace"
+    main.save_data(main.load_data(use_cache=True))
+    assert (store / "study_buddy.json").exists()
+    assert not (store / "study_buddy.snap").exists()
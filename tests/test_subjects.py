@@ -0,0 +1,59 @@
+import main
+
+
+def test_spellings_share_one_id():
+    catalog = main.SubjectCatalog()
+    math = catalog.intern("  Linear   Algebra ")
+    assert catalog.intern("linear algebra") == math
+    assert catalog.name(math) == "Linear Algebra"
+    assert catalog.intern("") is None
+    assert catalog.lookup("LINEAR ALGEBRA") == math
+
+
+def test_completion_is_by_prefix_alphabetically():
+    catalog = main.SubjectCatalog()
+    for name in ("Physics", "Philosophy", "Math", "photography"):
+        catalog.intern(name)
+    assert catalog.complete("ph") == ["Philosophy", "photography", "Physics"]
+    assert catalog.complete("ph", limit=1) == ["Philosophy"]
+    assert catalog.complete("x") == []
+
+
+def test_catalog_round_trips_with_stable_colors():
+    catalog = main.SubjectCatalog()
+    catalog.intern("Math")
+    catalog.intern("History")
+    restored = main.SubjectCatalog(catalog.to_list())
+    assert restored.to_list() == catalog.to_list()
+    assert restored.intern("Biology") == 3
+
+
+def test_migration_seeds_the_catalog_and_ids():
+    data = main.upgrade_data({
+        "schema_version": 2,
+        "schedules": [{"name": "S1", "subject": " math "}],
+        "tasks": [{"name": "T1", "subject": "MATH"}, {"name": "T2", "subject": "Physics"}, {"name": "T3"}],
+    })
+    assert [s["name"] for s in data["subjects"]] == ["math", "Physics"]
+    assert data["schedules"][0]["subject_id"] == data["tasks"][0]["subject_id"] == 1
+    assert data["tasks"][0]["subject"] == "math"
+    assert data["tasks"][1]["subject_id"] == 2
+    assert "subject_id" not in data["tasks"][2] and data["tasks"][2]["subject"] == ""
+
+
+def test_stats_index_records_per_subject():
+    catalog = main.SubjectCatalog()
+    task = {"name": "T1", "subject": "Math", "status": "Done"}
+    catalog.assign(task)
+    schedule = {"name": "S1", "subject": "Math", "date": "20-10-2026", "time": "10:00", "duration": 45}
+    catalog.assign(schedule)
+    stats = main.SubjectStats(catalog, [schedule], [task])
+    assert stats.get(1) == {"sessions": 1, "minutes": 45, "tasks": 1, "done": 1, "progress": 100.0}
+    assert stats.tasks_of(1) == [task]
+
+    stats.remove_task(task)
+    stats.remove_schedule(schedule)
+    assert stats.tasks_of(1) == []
+    assert stats.rows() == []
+    # Review cards have no id, only the subject name
+    assert stats.subject_id({"subject": "math", "review": True}) == 1
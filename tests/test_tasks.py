@@ -0,0 +1,50 @@
+import pytest
+
+import main
+
+
+@pytest.fixture
+def app(store):
+    app = main.StudyPlannerApp()
+    for name, status in (("Essay", "Pending"), ("Lab", "Pending"), ("Quiz", "Done")):
+        app.add_task({"name": name, "description": "", "due_date": "20-10-2026", "task_type": "Daily",
+                      "status": status, "effort": 1, "priority": "Medium", "subject": "Math"})
+    return app
+
+
+def names():
+    return [t["name"] for t in main.load_section("tasks")]
+
+
+def test_bulk_status_edits_the_cached_dicts(app):
+    tasks = app.get_all_tasks()
+    affected = app.apply_task_batch({"Essay", "Lab"}, {"status": "Done"})
+    assert [t["name"] for t in affected] == ["Essay", "Lab"]
+    assert app.get_all_tasks() is tasks
+    assert [t["status"] for t in tasks] == ["Done", "Done", "Done"]
+    assert app.completed_tasks == 3
+
+
+def test_bulk_delete_and_undo(app):
+    app.apply_task_batch({"Essay", "Quiz"}, delete=True)
+    assert names() == ["Lab"]
+    assert app.total_tasks == 1
+    app.undo()
+    assert names() == ["Essay", "Lab", "Quiz"]
+
+
+def test_partial_selection_touches_only_existing_selected_tasks(app):
+    affected = app.apply_task_batch({"Lab", "Missing"}, {"task_type": "Weekly"})
+    assert [t["name"] for t in affected] == ["Lab"]
+    assert [t["task_type"] for t in main.load_section("tasks")] == ["Daily", "Weekly", "Daily"]
+    assert app.apply_task_batch({"Missing"}, delete=True) == []
+    assert names() == ["Essay", "Lab", "Quiz"]
+
+
+def test_finish_builds_whatever_is_pending():
+    built = []
+    builder = main.ProgressiveBuilder(range(5), lambda spec: spec, lambda item, spec: built.append(item),
+                                      first_batch=2).start()
+    assert built == [0, 1]
+    builder.finish()
+    assert built == [0, 1, 2, 3, 4] and builder.done
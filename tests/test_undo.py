@@ -0,0 +1,53 @@
+import main
+
+
+def history_of(log, budget=main.UNDO_BUDGET):
+    history = main.UndoHistory(budget)
+    for label in ("a", "b", "c"):
+        history.record(label, lambda l=label: log.append(f"undo {l}"), lambda l=label: log.append(f"redo {l}"), label)
+    return history
+
+
+def test_undo_and_redo_run_newest_first():
+    log = []
+    history = history_of(log)
+    assert history.undo().label == "c"
+    assert history.undo().label == "b"
+    assert history.redo().label == "b"
+    assert log == ["undo c", "undo b", "redo b"]
+
+    history.record("d", lambda: None, lambda: None)
+    assert not history.can_redo()
+    assert [history.undo().label, history.undo().label] == ["d", "b"]
+
+
+def test_a_bound_command_is_skipped_once_it_is_not_newest():
+    log = []
+    history = history_of(log)
+    announced = history.top()
+    history.record("later", lambda: log.append("undo later"), lambda: None)
+    assert history.undo(announced) is None
+    assert log == []
+    assert history.undo().label == "later"
+    assert history.undo(announced) is announced
+    assert history.redo(history.top(redo=True)) is announced
+
+
+def test_budget_drops_oldest_commands_on_record_and_redo():
+    history = history_of([], budget=3 * 210)
+    cost = history.top().cost
+    history.record("d", lambda: None, lambda: None, "d")
+    assert history.size == 3 * cost and history.size <= history.budget
+
+    history.undo()
+    history.budget = 2 * cost
+    history.redo()
+    assert history.size == 2 * cost
+    assert [history.undo().label, history.undo().label, history.undo()] == ["d", "c", None]
+
+
+def test_deleting_nothing_records_nothing(store):
+    app = main.StudyPlannerApp()
+    assert app.delete_schedule("missing") is False
+    assert app.delete_task("missing") is False
+    assert not app.history.can_undo()
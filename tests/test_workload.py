@@ -0,0 +1,45 @@
+from datetime import date
+
+import main
+
+MONDAY = date(2026, 10, 19).toordinal()
+
+
+def day(offset):
+    return date.fromordinal(MONDAY + offset).strftime("%d-%m-%Y")
+
+
+def test_minutes_sum_sessions_and_open_task_effort():
+    model = main.WorkloadModel(
+        [{"name": "S1", "date": day(0), "time": "10:00", "duration": 90},
+         {"name": "S2", "date": day(2), "time": "09:00", "duration": 30}],
+        [{"name": "T1", "due_date": day(0), "effort": 2, "status": "Pending"},
+         {"name": "T2", "due_date": day(1), "effort": 1, "status": "Done"}],
+    )
+    assert model.minutes(MONDAY, MONDAY) == 90 + 120
+    assert model.minutes(MONDAY + 1, MONDAY + 1) == 0
+    assert model.minutes(MONDAY, MONDAY + 6) == 240
+    assert list(model.daily(MONDAY, MONDAY + 2)) == [210, 0, 30]
+    assert model.task_count(MONDAY, MONDAY + 6) == 1
+
+
+def test_explicit_zero_effort_adds_nothing():
+    model = main.WorkloadModel((), [{"name": "T", "due_date": day(0), "effort": 0},
+                                    {"name": "U", "due_date": day(0)}])
+    assert model.minutes(MONDAY, MONDAY) == 60
+    assert model.task_count(MONDAY, MONDAY) == 2
+
+
+def test_ranges_outside_the_data_are_empty():
+    model = main.WorkloadModel([{"name": "S", "date": day(3), "time": "08:00", "duration": 60}])
+    assert model.minutes(MONDAY - 30, MONDAY) == 0
+    assert model.minutes(MONDAY + 10, MONDAY + 40) == 0
+    assert main.WorkloadModel().minutes(MONDAY, MONDAY + 6) == 0
+
+
+def test_warnings_name_the_day_and_week_over_capacity():
+    model = main.WorkloadModel([{"name": "S", "date": day(1), "time": "08:00", "duration": 300}])
+    assert model.warnings(MONDAY + 1, 30, 360, 1000) == []
+    found = model.warnings(MONDAY + 1, 90, 360, 360)
+    assert len(found) == 2
+    assert found[0].startswith("Tue, Oct 20") and found[1].startswith("Week of Oct 19")